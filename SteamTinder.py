@@ -6,7 +6,28 @@ import os
 import atexit
 import sqlite3
 import getpass
+import uuid
+import threading
+import time
+import asyncio
+import argparse
+import urllib.error
+import urllib.parse
+import urllib.request
+import re
+import html
+import webbrowser
+import random
+import tempfile
+import gzip
+import itertools
+import math
+import contextlib
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
+from statistics import NormalDist
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
@@ -15,6 +36,7 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import sys
 
 # Configuration constants
@@ -25,159 +47,3625 @@ DEFAULT_CONFIG = {
     "always_on_top": False
 }
 
+# Release date formats seen in Steam store data, most specific first
+RELEASE_DATE_FORMATS = [
+    ("%d %b, %Y", "day"), ("%b %d, %Y", "day"), ("%d %B, %Y", "day"), ("%B %d, %Y", "day"),
+    ("%Y-%m-%d", "day"), ("%d %b %Y", "day"), ("%b %d %Y", "day"), ("%d.%m.%Y", "day"),
+    ("%m/%d/%Y", "day"), ("%d/%m/%Y", "day"), ("%b %Y", "month"), ("%B %Y", "month"),
+    ("%Y-%m", "month"), ("%Y", "year"),
+]
+COMPANY_SUFFIXES = {"inc", "inc.", "llc", "l.l.c.", "ltd", "ltd.", "co", "co.", "co. ltd", "co., ltd.",
+                    "corp", "corp.", "gmbh", "s.a.", "s.l.", "b.v.", "pty ltd", "s.r.o.", "ab", "oy", "plc", "srl"}
+YEAR_PATTERN = re.compile(r"\b(19[7-9]\d|20\d\d)\b")
+STEAM_APP_ID_PATTERN = re.compile(r"/app/(\d+)")
+STEAM_APPDETAILS_URL = "https://store.steampowered.com/api/appdetails"
+NORMALIZE_CHUNK_SIZE = 5000
+CATALOG_READ_SIZE = 1 << 16
+PROCESS_POOL_MIN_ROWS = 50000
+GRID_PAGE_SIZES = (4, 12)
+
+@lru_cache(maxsize=65536)
+def parse_release_date(value):
+    """Parse a free-form release date into (sortable ISO string, year)
+
+    The ISO string is as precise as the input: 2020-11-12, 2020-11 or 2020.
+    Unparseable values such as "Coming soon" give (None, None).
+    """
+    value = (value or "").strip()
+    if not value:
+        return None, None
+    for date_format, precision in RELEASE_DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+        if precision == "day":
+            return parsed.strftime("%Y-%m-%d"), parsed.year
+        if precision == "month":
+            return parsed.strftime("%Y-%m"), parsed.year
+        return parsed.strftime("%Y"), parsed.year
+        
+    # Quarters, "Early 2021", "Spring 2020" and similar only tell us the year
+    match = YEAR_PATTERN.search(value)
+    if match:
+        return match.group(1), int(match.group(1))
+    return None, None
+
+def split_developers(value):
+    """Split a developer list such as "Valve, Hidden Path Entertainment" into names
+
+    Company suffixes that follow a comma ("Foo, Inc.") stay attached to their name.
+    """
+    names = []
+    for part in re.split(r"[,;|]", value or ""):
+        part = part.strip()
+        if not part:
+            continue
+        if names and part.lower() in COMPANY_SUFFIXES:
+            names[-1] = f"{names[-1]}, {part}"
+        else:
+            names.append(part)
+            
+    unique_names = []
+    seen = set()
+    for name in names:
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            unique_names.append(name)
+    return unique_names
+
+def normalize_game_chunk(rows):
+    """Add parsed release date and developer names to (key, developers, release_date) tuples
+
+    Runs in worker processes for large imports, so it must stay a plain top-level function.
+    """
+    normalized = []
+    for key, developers, release_date in rows:
+        release_date_iso, release_year = parse_release_date(release_date)
+        normalized.append((key, release_date_iso, release_year, split_developers(developers)))
+    return normalized
+
+def iter_normalized_chunks(rows, processes=None, chunk_size=NORMALIZE_CHUNK_SIZE):
+    """Yield (raw_chunk, normalized_chunk) pairs, parsing in a process pool when processes > 1
+
+    Only a few chunks are in flight at a time, so arbitrarily large inputs stream through.
+    """
+    def raw_chunks():
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+            
+    if not processes or processes <= 1:
+        for chunk in raw_chunks():
+            yield chunk, normalize_game_chunk(chunk)
+        return
+        
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = []
+        for chunk in raw_chunks():
+            pending.append((chunk, pool.submit(normalize_game_chunk, chunk)))
+            if len(pending) >= processes * 2:
+                raw_chunk, future = pending.pop(0)
+                yield raw_chunk, future.result()
+        for raw_chunk, future in pending:
+            yield raw_chunk, future.result()
+
+class JsonStreamReader:
+    """Reads JSON values one at a time from a large document without loading all of it
+
+    The containers on the way to the records are walked token by token, and each value
+    is decoded on its own with json.JSONDecoder.raw_decode. The buffer only holds text
+    that has not been consumed yet; offset counts the characters dropped before it.
+    """
+    def __init__(self, stream, read_size=CATALOG_READ_SIZE):
+        self.stream = stream
+        self.read_size = read_size
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        
+    def fill(self):
+        """Append the next chunk of the stream; False at the end of the stream"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.read_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+        
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at the end)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+                
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found or 'end of file'!r}")
+        self.pos += 1
+        
+    def read_value(self):
+        """Decode and consume the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.cut_off(e) and self.fill():
+                    continue  # The value continues in the next chunk
+                raise ValueError(f"Invalid JSON at character {self.offset + e.pos}: {e.msg}") from None
+            if end == len(self.buffer) and isinstance(value, (int, float)) and self.fill():
+                continue  # A number cut off at the chunk boundary
+            self.pos = end
+            return value
+            
+    def cut_off(self, error):
+        """True if a decode error may only mean the value runs past the end of the buffer
+
+        Errors are reported where the bad token starts, so a string, literal or escape
+        cut at the chunk boundary fails before the end; anything followed by a delimiter
+        is really malformed.
+        """
+        if error.pos >= len(self.buffer) or error.msg.startswith("Unterminated string"):
+            return True
+        return not any(char in ' \t\r\n,:[]{}"' for char in self.buffer[error.pos:])
+        
+    def iter_container(self):
+        """Step through the array or object that starts here
+
+        Yields the index (arrays) or key (objects) of each member with the reader
+        positioned at its value, which the caller must consume before the next step.
+        """
+        opening = self.peek()
+        closing = {"[": "]", "{": "}"}.get(opening)
+        if not closing:
+            raise ValueError(f"Expected a JSON array or object, found {opening or 'end of file'!r}")
+        self.pos += 1
+        index = 0
+        while True:
+            if self.peek() == closing:
+                self.pos += 1
+                return
+            if index:
+                self.expect(",")
+            if opening == "{":
+                key = self.read_value()
+                self.expect(":")
+            else:
+                key = index
+            yield key
+            index += 1
+
+def iter_catalog_records(path, records_path=""):
+    """Stream app records from a catalog dump: JSON Lines, or one large JSON document
+
+    In a JSON document the records are the members of the array or object at
+    records_path, a dotted key path such as "applist.apps" (GetAppList); the default
+    is the top level. Members of an object keyed by app id, as in appdetails dumps,
+    get that key as their "appid". .gz files are decompressed on the fly.
+    """
+    compressed = path.endswith(".gz")
+    opener = gzip.open if compressed else open
+    with opener(path, "rt", encoding="utf-8") as stream:
+        if (path[:-3] if compressed else path).endswith((".jsonl", ".ndjson")):
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+            return
+            
+        reader = JsonStreamReader(stream)
+        for key in [key for key in (records_path or "").split(".") if key]:
+            for member_key in reader.iter_container():
+                if str(member_key) == key:
+                    break
+                reader.read_value()  # Skip a sibling of the path
+            else:
+                raise ValueError(f"'{key}' of records path '{records_path}' not found in {path}")
+                
+        keyed = reader.peek() == "{"
+        for member_key in reader.iter_container():
+            record = reader.read_value()
+            if keyed and isinstance(record, dict):
+                record.setdefault("appid", member_key)
+            yield record
+
+def catalog_game_info(record):
+    """Pull app id, name, type, developers, release date and tags out of a catalog record
+
+    Understands appdetails records ({"success": ..., "data": {...}}), flat store or
+    SteamSpy style records and GetAppList entries. Returns None for records without
+    an app id or name.
+    """
+    if not isinstance(record, dict):
+        return None
+    if isinstance(record.get("data"), dict):
+        data = dict(record["data"])
+        data.setdefault("appid", record.get("appid"))
+        record = data
+    appid = record.get("steam_appid", record.get("appid"))
+    name = str(record.get("name") or "").strip()
+    if appid in (None, "") or not name:
+        return None
+        
+    release_date = record.get("release_date") or ""
+    if isinstance(release_date, dict):
+        release_date = release_date.get("date") or ""
+    developers = record.get("developers") or record.get("developer") or ""
+    if isinstance(developers, list):
+        developers = ", ".join(str(developer) for developer in developers)
+        
+    tags = set()
+    for field in ("tags", "genres", "categories", "genre"):
+        value = record.get(field)
+        if isinstance(value, dict):
+            tags.update(value)  # SteamSpy: {"Indie": 1234, ...}
+        elif isinstance(value, list):
+            tags.update(item.get("description", "") if isinstance(item, dict) else str(item) for item in value)
+        elif isinstance(value, str):
+            tags.update(value.split(","))
+    return {
+        "appid": str(appid),
+        "name": name,
+        "type": str(record.get("type") or "").lower(),
+        "developers": developers,
+        "release_date": str(release_date),
+        "tags": {tag.strip().lower() for tag in tags if tag.strip()},
+    }
+
+def filter_catalog_games(records, types=None, year_from=None, year_to=None, tags=None, stats=None):
+    """Yield CSV-style game rows for the catalog records that pass the filters
+
+    types and tags match case-insensitively, and a game needs at least one of the
+    tags. Games whose type or release year is unknown fail a filter on it. stats, if
+    given, is a dict in which the records read and kept are counted.
+    """
+    types = {value.lower() for value in types or []}
+    tags = {value.lower() for value in tags or []}
+    stats = stats if stats is not None else {}
+    stats.setdefault("read", 0)
+    stats.setdefault("kept", 0)
+    for record in records:
+        stats["read"] += 1
+        info = catalog_game_info(record)
+        if info is None:
+            continue
+        if types and info["type"] not in types:
+            continue
+        if tags and not tags & info["tags"]:
+            continue
+        if year_from is not None or year_to is not None:
+            _, release_year = parse_release_date(info["release_date"])
+            if (release_year is None or (year_from is not None and release_year < year_from)
+                    or (year_to is not None and release_year > year_to)):
+                continue
+        stats["kept"] += 1
+        yield {
+            'name': info["name"],
+            'developers': info["developers"],
+            'release_date': info["release_date"],
+            'steam_page_url': f"https://store.steampowered.com/app/{info['appid']}/",
+        }
+
+class GameFilter:
+    """Builder for swipe-queue predicates that compile to indexed SQL
+
+    Example: GameFilter().released_between(2023, 2024).excluding_rejected_developers()
+    Filtering runs inside SQLite; candidates are never materialized in Python.
+    """
+    ORDERS = ("random", "id", "release")
+
+    def __init__(self):
+        self.batch_names = []
+        self.year_from = None
+        self.year_to = None
+        self.developer_names = []
+        self.skip_rejected_developers = False
+        self.skip_decided = True
+        self.order = "random"
+
+    def batches(self, *batch_names):
+        self.batch_names.extend(batch_names)
+        return self
+
+    def released_between(self, year_from=None, year_to=None):
+        self.year_from = int(year_from) if year_from not in (None, "") else None
+        self.year_to = int(year_to) if year_to not in (None, "") else None
+        return self
+
+    def by_developers(self, *developer_names):
+        self.developer_names.extend(developer_names)
+        return self
+
+    def excluding_rejected_developers(self, enabled=True):
+        """Skip developers the user has only ever voted no on"""
+        self.skip_rejected_developers = enabled
+        return self
+
+    def including_decided(self, enabled=True):
+        """Also queue games the team has already decided under the batch's decision rule"""
+        self.skip_decided = not enabled
+        return self
+
+    def ordered(self, order):
+        if order not in self.ORDERS:
+            raise ValueError(f"Unknown queue order: {order}")
+        self.order = order
+        return self
+
+    def is_empty(self):
+        return not (self.batch_names or self.year_from is not None or self.year_to is not None
+                    or self.developer_names or self.skip_rejected_developers)
+
+    def describe(self):
+        parts = []
+        if self.batch_names:
+            parts.append("batches " + ", ".join(self.batch_names))
+        if self.year_from is not None or self.year_to is not None:
+            parts.append(f"released {self.year_from or '...'}-{self.year_to or '...'}")
+        if self.developer_names:
+            parts.append("by " + ", ".join(self.developer_names))
+        if self.skip_rejected_developers:
+            parts.append("no rejected developers")
+        if not self.skip_decided:
+            parts.append("including decided games")
+        return "; ".join(parts) or "all games"
+
+    def to_dict(self):
+        return {
+            "batch_names": list(self.batch_names),
+            "year_from": self.year_from,
+            "year_to": self.year_to,
+            "developer_names": list(self.developer_names),
+            "skip_rejected_developers": self.skip_rejected_developers,
+            "skip_decided": self.skip_decided,
+            "order": self.order,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        game_filter = cls()
+        game_filter.batches(*data.get("batch_names", []))
+        game_filter.released_between(data.get("year_from"), data.get("year_to"))
+        game_filter.by_developers(*data.get("developer_names", []))
+        game_filter.excluding_rejected_developers(data.get("skip_rejected_developers", False))
+        game_filter.including_decided(not data.get("skip_decided", True))
+        game_filter.ordered(data.get("order", "random"))
+        return game_filter
+
+    def compile(self, user_name, alias="g"):
+        """Return (sql_conditions, params) for the filter, to be ANDed into a WHERE clause"""
+        conditions = []
+        params = []
+        if self.skip_decided:
+            conditions.append(f"{alias}.decided = 0")
+        if self.batch_names:
+            placeholders = ", ".join("?" for _ in self.batch_names)
+            conditions.append(f"{alias}.batch_name IN ({placeholders})")
+            params.extend(self.batch_names)
+        if self.year_from is not None:
+            conditions.append(f"{alias}.release_year >= ?")
+            params.append(self.year_from)
+        if self.year_to is not None:
+            conditions.append(f"{alias}.release_year <= ?")
+            params.append(self.year_to)
+        if self.developer_names:
+            placeholders = ", ".join("?" for _ in self.developer_names)
+            conditions.append(f'''{alias}.id IN (
+                SELECT gd.game_id FROM game_developers gd
+                JOIN developers d ON d.id = gd.developer_id
+                WHERE d.name IN ({placeholders})
+            )''')
+            params.extend(self.developer_names)
+        if self.skip_rejected_developers:
+            # Uncorrelated subquery: SQLite builds the rejected set once per query
+            conditions.append(f'''NOT EXISTS (
+                SELECT 1 FROM game_developers gd
+                WHERE gd.game_id = {alias}.id AND gd.developer_id IN (
+                    SELECT gd2.developer_id FROM votes v
+                    JOIN game_developers gd2 ON gd2.game_id = v.game_id
+                    WHERE v.user_name = ?
+                    GROUP BY gd2.developer_id
+                    HAVING MAX(v.vote) = 0
+                )
+            )''')
+            params.append(user_name)
+        return " AND ".join(conditions), params
+
+class SnapshotRestarted(Exception):
+    """Raised from the backup progress callback to stop a step-wise copy that keeps restarting"""
+
 class DatabaseManager:
-    def __init__(self, db_path):
+    is_remote = False
+    SCHEMA_VERSION = 4
+    SEARCH_RANK_CANDIDATES = 2000
+    has_fts = False
+    # A game's decision under its batch's decision_rules row: 1 accepted, -1 rejected, 0 open.
+    # A majority of a team of n is n // 2 + 1 votes; the lower of that and the quorum applies.
+    DECISION_SQL = '''COALESCE((
+        SELECT CASE
+            WHEN {game}.yes_votes >= MIN(COALESCE(r.yes_quorum, r.majority_of / 2 + 1),
+                                         COALESCE(r.majority_of / 2 + 1, r.yes_quorum)) THEN 1
+            WHEN {game}.no_votes >= MIN(COALESCE(r.no_quorum, r.majority_of / 2 + 1),
+                                        COALESCE(r.majority_of / 2 + 1, r.no_quorum)) THEN -1
+            ELSE 0 END
+        FROM decision_rules r WHERE r.batch_name = {game}.batch_name
+    ), 0)'''
+    
+    # Set operations and vote filters for derive_batch
+    BATCH_OPERATIONS = ("union", "intersection", "difference")
+    VOTE_FILTERS = ("yes", "no", "unvoted", "accepted")
+
+    def __init__(self, db_path, timeout=5.0, journal_mode=None):
+        """timeout is how long a connection waits on a locked database before failing;
+        journal_mode (e.g. "wal") is set on the database file when given."""
         self.db_path = db_path
+        self.timeout = timeout
+        if journal_mode:
+            with self.get_connection() as conn:
+                conn.execute(f"PRAGMA journal_mode = {journal_mode}")
         self.initialize_database()
         self.migrate_database()  # Run migrations to add any missing columns
 
-    def get_connection(self):
-        return sqlite3.connect(self.db_path)
+    def get_connection(self):
+        return sqlite3.connect(self.db_path, timeout=self.timeout)
+
+    def initialize_database(self, conn=None):
+        """Create all tables, indexes and triggers (on a given connection if provided)"""
+        own_connection = conn is None
+        if own_connection:
+            conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            
+            # Only takes effect on a new, empty database; existing files are converted
+            # on request with enable_incremental_vacuum()
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            
+            # Create games table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS games (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    developers TEXT,
+                    release_date TEXT,
+                    steam_page_url TEXT NOT NULL,
+                    batch_name TEXT NOT NULL,
+                    release_date_iso TEXT,
+                    release_year INTEGER,
+                    UNIQUE(steam_page_url, batch_name)
+                )
+            ''')
+            
+            # Columns added after the first release; back-filled by migrate_database
+            cursor.execute("PRAGMA table_info(games)")
+            game_columns = [row[1] for row in cursor.fetchall()]
+            for column, column_type in (("release_date_iso", "TEXT"), ("release_year", "INTEGER"),
+                                        ("yes_votes", "INTEGER NOT NULL DEFAULT 0"),
+                                        ("no_votes", "INTEGER NOT NULL DEFAULT 0"),
+                                        ("decided", "INTEGER NOT NULL DEFAULT 0")):
+                if column not in game_columns:
+                    cursor.execute(f"ALTER TABLE games ADD COLUMN {column} {column_type}")
+            
+            # Normalized developer relation
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS developers (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL UNIQUE COLLATE NOCASE
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS game_developers (
+                    game_id INTEGER NOT NULL,
+                    developer_id INTEGER NOT NULL,
+                    PRIMARY KEY (game_id, developer_id)
+                ) WITHOUT ROWID
+            ''')
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_game_developers_developer ON game_developers (developer_id, game_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_release ON games (release_year, release_date_iso)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_decided ON games (decided, batch_name, id)")
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_games_delete_developers AFTER DELETE ON games
+                BEGIN
+                    DELETE FROM game_developers WHERE game_id = OLD.id;
+                END
+            ''')
+            
+            # Create votes table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS votes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    game_id INTEGER NOT NULL,
+                    user_name TEXT NOT NULL,
+                    vote BOOLEAN NOT NULL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    exported BOOLEAN DEFAULT 0,
+                    FOREIGN KEY (game_id) REFERENCES games(id),
+                    UNIQUE(game_id, user_name)
+                )
+            ''')
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_votes_user ON votes (user_name, vote, game_id)")
+            
+            # Append-only vote history; votes above is the current state derived from it
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS vote_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    game_id INTEGER NOT NULL,
+                    user_name TEXT NOT NULL,
+                    vote BOOLEAN NOT NULL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Swipe timing (unix times), recorded from the swipe loop; older events have none
+            cursor.execute("PRAGMA table_info(vote_events)")
+            event_columns = [row[1] for row in cursor.fetchall()]
+            for column in ("shown_at", "page_ready_at", "voted_at"):
+                if column not in event_columns:
+                    cursor.execute(f"ALTER TABLE vote_events ADD COLUMN {column} REAL")
+
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_vote_events_user ON vote_events (user_name, seq)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_vote_events_game ON vote_events (game_id, user_name, seq)")
+            # Covers the swipe statistics, so a time range never touches the table itself
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_vote_events_voted_at
+                ON vote_events (voted_at, user_name, game_id, shown_at, page_ready_at)
+            ''')
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_vote_events_apply AFTER INSERT ON vote_events
+                BEGIN
+                    INSERT INTO votes (game_id, user_name, vote, timestamp, exported)
+                    VALUES (NEW.game_id, NEW.user_name, NEW.vote, NEW.timestamp, 0)
+                    ON CONFLICT(game_id, user_name) DO UPDATE SET
+                        vote = excluded.vote,
+                        timestamp = excluded.timestamp;
+                END
+            ''')
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_vote_events_append_only BEFORE UPDATE ON vote_events
+                BEGIN
+                    SELECT RAISE(ABORT, 'vote_events is append-only');
+                END
+            ''')
+            
+            # Short-lived claims on queued games so parallel sessions never get the same game
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS queue_reservations (
+                    game_id INTEGER NOT NULL,
+                    user_name TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    lease_expires REAL NOT NULL,
+                    PRIMARY KEY (game_id, user_name)
+                ) WITHOUT ROWID
+            ''')
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_reservations_session ON queue_reservations (session_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_reservations_expiry ON queue_reservations (lease_expires)")
+            
+            # Per-consumer export positions in the event log
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS export_watermarks (
+                    consumer TEXT PRIMARY KEY,
+                    last_seq INTEGER NOT NULL DEFAULT 0,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Create progress table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS progress (
+                    user_name TEXT NOT NULL,
+                    batch_name TEXT NOT NULL,
+                    current_index INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (user_name, batch_name)
+                )
+            ''')
+
+            # Sessions over several batches at once (see start_merged_session); last_game_id
+            # is the furthest game voted on, kept for reference only
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS merged_progress (
+                    user_name TEXT NOT NULL,
+                    session_key TEXT NOT NULL,
+                    batch_names TEXT NOT NULL,
+                    last_game_id INTEGER NOT NULL DEFAULT 0,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_name, session_key)
+                ) WITHOUT ROWID
+            ''')
+
+            # Create batch catalog tables
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS batches (
+                    batch_name TEXT PRIMARY KEY,
+                    game_count INTEGER NOT NULL DEFAULT 0,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS batch_user_stats (
+                    batch_name TEXT NOT NULL,
+                    user_name TEXT NOT NULL,
+                    voted_count INTEGER NOT NULL DEFAULT 0,
+                    yes_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (batch_name, user_name)
+                )
+            ''')
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_batch ON games (batch_name, id)")
+            
+            # Shared record of background maintenance so only one client runs each task
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS maintenance_log (
+                    task TEXT PRIMARY KEY,
+                    last_run REAL NOT NULL DEFAULT 0,
+                    duration REAL,
+                    result TEXT
+                )
+            ''')
+            
+            # Keep the batch catalog current as games and votes change
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_games_insert_catalog AFTER INSERT ON games
+                BEGIN
+                    INSERT INTO batches (batch_name, game_count) VALUES (NEW.batch_name, 1)
+                    ON CONFLICT(batch_name) DO UPDATE SET game_count = game_count + 1;
+                END
+            ''')
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_games_delete_catalog AFTER DELETE ON games
+                BEGIN
+                    UPDATE batches SET game_count = game_count - 1
+                    WHERE batch_name = OLD.batch_name;
+                END
+            ''')
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_votes_insert_catalog AFTER INSERT ON votes
+                BEGIN
+                    INSERT INTO batch_user_stats (batch_name, user_name, voted_count, yes_count)
+                    SELECT batch_name, NEW.user_name, 1, CASE WHEN NEW.vote THEN 1 ELSE 0 END
+                    FROM games WHERE id = NEW.game_id
+                    ON CONFLICT(batch_name, user_name) DO UPDATE SET
+                        voted_count = voted_count + 1,
+                        yes_count = yes_count + excluded.yes_count;
+                END
+            ''')
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_votes_update_catalog AFTER UPDATE OF vote ON votes
+                BEGIN
+                    UPDATE batch_user_stats
+                    SET yes_count = yes_count
+                        + (CASE WHEN NEW.vote THEN 1 ELSE 0 END)
+                        - (CASE WHEN OLD.vote THEN 1 ELSE 0 END)
+                    WHERE user_name = NEW.user_name
+                      AND batch_name = (SELECT batch_name FROM games WHERE id = NEW.game_id);
+                END
+            ''')
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_votes_delete_catalog AFTER DELETE ON votes
+                BEGIN
+                    UPDATE batch_user_stats
+                    SET voted_count = voted_count - 1,
+                        yes_count = yes_count - (CASE WHEN OLD.vote THEN 1 ELSE 0 END)
+                    WHERE user_name = OLD.user_name
+                      AND batch_name = (SELECT batch_name FROM games WHERE id = OLD.game_id);
+                END
+            ''')
+            
+            # Team decisions: per-game vote tallies, and the decided flag under the batch's rule
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS decision_rules (
+                    batch_name TEXT PRIMARY KEY,
+                    yes_quorum INTEGER,
+                    no_quorum INTEGER,
+                    majority_of INTEGER
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_votes_insert_tally AFTER INSERT ON votes
+                BEGIN
+                    UPDATE games
+                    SET yes_votes = yes_votes + (CASE WHEN NEW.vote THEN 1 ELSE 0 END),
+                        no_votes = no_votes + (CASE WHEN NEW.vote THEN 0 ELSE 1 END)
+                    WHERE id = NEW.game_id;
+                END
+            ''')
+
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_votes_update_tally AFTER UPDATE OF vote ON votes
+                WHEN OLD.vote IS NOT NEW.vote
+                BEGIN
+                    UPDATE games
+                    SET yes_votes = yes_votes + (CASE WHEN NEW.vote THEN 1 ELSE -1 END),
+                        no_votes = no_votes + (CASE WHEN NEW.vote THEN -1 ELSE 1 END)
+                    WHERE id = NEW.game_id;
+                END
+            ''')
+
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_votes_delete_tally AFTER DELETE ON votes
+                BEGIN
+                    UPDATE games
+                    SET yes_votes = yes_votes - (CASE WHEN OLD.vote THEN 1 ELSE 0 END),
+                        no_votes = no_votes - (CASE WHEN OLD.vote THEN 0 ELSE 1 END)
+                    WHERE id = OLD.game_id;
+                END
+            ''')
+
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_games_decide AFTER UPDATE OF yes_votes, no_votes ON games
+                BEGIN
+                    UPDATE games SET decided = {self.DECISION_SQL.format(game="NEW")}
+                    WHERE id = NEW.id;
+                END
+            ''')
+
+            self.has_fts = self.create_search_index(cursor)
+
+            conn.commit()
+        finally:
+            if own_connection:
+                conn.close()
+
+    def create_search_index(self, cursor):
+        """Create the FTS5 index over game names and developers, kept in sync by triggers
+
+        Returns False when this SQLite build has no FTS5; search then falls back to LIKE.
+        """
+        try:
+            # External content: the index stores only tokens, the text stays in games
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS games_fts USING fts5(
+                    name, developers,
+                    content='games', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search not available: {e}")
+            return False
+            
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_games_fts_insert AFTER INSERT ON games
+            BEGIN
+                INSERT INTO games_fts (rowid, name, developers) VALUES (NEW.id, NEW.name, NEW.developers);
+            END
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_games_fts_delete AFTER DELETE ON games
+            BEGIN
+                INSERT INTO games_fts (games_fts, rowid, name, developers)
+                VALUES ('delete', OLD.id, OLD.name, OLD.developers);
+            END
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_games_fts_update AFTER UPDATE OF name, developers ON games
+            BEGIN
+                INSERT INTO games_fts (games_fts, rowid, name, developers)
+                VALUES ('delete', OLD.id, OLD.name, OLD.developers);
+                INSERT INTO games_fts (rowid, name, developers) VALUES (NEW.id, NEW.name, NEW.developers);
+            END
+        ''')
+        return True
+
+    def migrate_database(self):
+        """Perform any needed database migrations for schema updates"""
+        print("Running database migrations...")
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Check if exported column exists in votes table
+            cursor.execute("PRAGMA table_info(votes)")
+            columns = [row[1] for row in cursor.fetchall()]
+            print(f"Current columns in votes table: {columns}")
+            
+            # Add exported column if it doesn't exist
+            if 'exported' not in columns:
+                try:
+                    # For SQLite 3.20.0 and later:
+                    cursor.execute("""
+                        ALTER TABLE votes ADD COLUMN exported BOOLEAN DEFAULT 0
+                    """)
+                    print("Added 'exported' column to votes table")
+                    
+                    # Initialize all existing votes as not exported
+                    cursor.execute("UPDATE votes SET exported = 0")
+                    print(f"Updated {cursor.rowcount} existing votes to exported=0")
+                    
+                    conn.commit()
+                    
+                    # Verify the column was added
+                    cursor.execute("PRAGMA table_info(votes)")
+                    updated_columns = [row[1] for row in cursor.fetchall()]
+                    print(f"Updated columns in votes table: {updated_columns}")
+                    
+                except sqlite3.OperationalError as e:
+                    print(f"Migration error: {e}")
+                    
+                    # Alternative approach for older SQLite versions
+                    try:
+                        print("Trying alternative migration approach...")
+                        
+                        # Create new table with the desired schema
+                        cursor.execute('''
+                            CREATE TABLE votes_new (
+                                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                game_id INTEGER NOT NULL,
+                                user_name TEXT NOT NULL,
+                                vote BOOLEAN NOT NULL,
+                                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                                exported BOOLEAN DEFAULT 0,
+                                FOREIGN KEY (game_id) REFERENCES games(id),
+                                UNIQUE(game_id, user_name)
+                            )
+                        ''')
+                        
+                        # Copy data from old table to new table
+                        cursor.execute('''
+                            INSERT INTO votes_new (id, game_id, user_name, vote, timestamp)
+                            SELECT id, game_id, user_name, vote, timestamp FROM votes
+                        ''')
+                        
+                        # Drop old table and rename new table
+                        cursor.execute('DROP TABLE votes')
+                        cursor.execute('ALTER TABLE votes_new RENAME TO votes')
+                        
+                        print("Successfully migrated votes table using alternative approach")
+                        conn.commit()
+                    except sqlite3.Error as e2:
+                        print(f"Alternative migration failed: {e2}")
+                        conn.rollback()
+
+            # Backfill the batch catalog for databases created before it existed
+            cursor.execute("SELECT COUNT(*) FROM batches")
+            catalog_count = cursor.fetchone()[0]
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM games)")
+            has_games = cursor.fetchone()[0]
+            if catalog_count == 0 and has_games:
+                self.rebuild_batch_catalog(conn)
+                print("Built batch catalog from existing games and votes")
+                
+            cursor.execute("PRAGMA user_version")
+            schema_version = cursor.fetchone()[0]
+            if schema_version < 1 and has_games:
+                normalized_count = self.normalize_existing_games(conn)
+                print(f"Normalized release dates and developers for {normalized_count} games")
+            if schema_version < 2:
+                event_count = self.backfill_vote_events(conn)
+                if event_count:
+                    print(f"Seeded vote event log with {event_count} existing votes")
+            if schema_version < 3 and has_games and self.has_fts:
+                cursor.execute("INSERT INTO games_fts (games_fts) VALUES ('rebuild')")
+                print("Built full-text search index for existing games")
+            if schema_version < 4 and has_games:
+                # trg_games_decide sets the decided flags from the new tallies
+                cursor.execute('''
+                    UPDATE games SET
+                        yes_votes = (SELECT COUNT(*) FROM votes v WHERE v.game_id = games.id AND v.vote),
+                        no_votes = (SELECT COUNT(*) FROM votes v WHERE v.game_id = games.id AND NOT v.vote)
+                ''')
+                print("Counted team votes for existing games")
+            if schema_version < self.SCHEMA_VERSION:
+                cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+                conn.commit()
+
+    def backfill_vote_events(self, conn):
+        """Seed the event log from the votes table of a database created before it existed
+
+        Already exported votes are logged first, so each user's "Export New Yes Votes"
+        watermark can be placed right after them and nothing is exported twice.
+        """
+        cursor = conn.cursor()
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM vote_events)")
+        if cursor.fetchone()[0]:
+            return 0
+        cursor.execute('''
+            INSERT INTO vote_events (game_id, user_name, vote, timestamp)
+            SELECT game_id, user_name, vote, timestamp FROM votes
+            ORDER BY COALESCE(exported, 0) DESC, timestamp, id
+        ''')
+        event_count = cursor.rowcount
+        cursor.execute('''
+            INSERT OR REPLACE INTO export_watermarks (consumer, last_seq)
+            SELECT 'yes_export:' || e.user_name, MAX(e.seq)
+            FROM vote_events e
+            JOIN votes v ON v.game_id = e.game_id AND v.user_name = e.user_name
+            WHERE v.exported = 1
+            GROUP BY e.user_name
+        ''')
+        conn.commit()
+        return event_count
+
+    def rebuild_batch_catalog(self, conn=None):
+        """Recompute the batch catalog and per-user statistics from scratch"""
+        own_connection = conn is None
+        if own_connection:
+            conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM batches")
+            cursor.execute("DELETE FROM batch_user_stats")
+            cursor.execute('''
+                INSERT INTO batches (batch_name, game_count)
+                SELECT batch_name, COUNT(*) FROM games GROUP BY batch_name
+            ''')
+            cursor.execute('''
+                INSERT INTO batch_user_stats (batch_name, user_name, voted_count, yes_count)
+                SELECT g.batch_name, v.user_name, COUNT(*), SUM(CASE WHEN v.vote THEN 1 ELSE 0 END)
+                FROM votes v
+                JOIN games g ON g.id = v.game_id
+                GROUP BY g.batch_name, v.user_name
+            ''')
+            conn.commit()
+        finally:
+            if own_connection:
+                conn.close()
+
+    def get_catalog_totals(self, conn):
+        """Return (vote_count, game_count) using the batch catalog instead of table scans"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT COALESCE(SUM(voted_count), 0) FROM batch_user_stats")
+        vote_count = cursor.fetchone()[0]
+        cursor.execute("SELECT COALESCE(SUM(game_count), 0) FROM batches")
+        game_count = cursor.fetchone()[0]
+        return vote_count, game_count
+
+    def archive_batch(self, batch_name, archive_path):
+        """Copy a batch with its votes and progress into a separate SQLite archive file"""
+        # Let the archive get the full schema (and its own catalog triggers) first
+        DatabaseManager(archive_path)
+        
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+            game_count = self._copy_batch_games(cursor, "archive", batch_name)
+            
+            # Copy the vote history; the archive derives its current votes from it
+            cursor.execute('''
+                INSERT INTO archive.vote_events (game_id, user_name, vote, timestamp,
+                                                 shown_at, page_ready_at, voted_at)
+                SELECT ag.id, e.user_name, e.vote, e.timestamp, e.shown_at, e.page_ready_at, e.voted_at
+                FROM main.games g
+                JOIN main.vote_events e ON e.game_id = g.id
+                JOIN archive.games ag
+                    ON ag.steam_page_url = g.steam_page_url AND ag.batch_name = g.batch_name
+                WHERE g.batch_name = ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM archive.vote_events ae
+                      WHERE ae.game_id = ag.id AND ae.user_name = e.user_name
+                        AND ae.timestamp IS e.timestamp AND ae.vote = e.vote
+                  )
+                ORDER BY e.seq
+            ''', (batch_name,))
+            
+            cursor.execute('''
+                SELECT COUNT(*) FROM main.votes v
+                JOIN main.games g ON g.id = v.game_id
+                WHERE g.batch_name = ?
+            ''', (batch_name,))
+            vote_count = cursor.fetchone()[0]
+            
+            cursor.execute('''
+                INSERT OR REPLACE INTO archive.progress (user_name, batch_name, current_index)
+                SELECT user_name, batch_name, current_index
+                FROM main.progress WHERE batch_name = ?
+            ''', (batch_name,))
+            
+            conn.commit()
+            cursor.execute("DETACH DATABASE archive")
+            print(f"Archived batch {batch_name} to {archive_path}: {game_count} games, {vote_count} votes")
+            return vote_count, game_count
+        finally:
+            conn.close()
+
+    def _copy_batch_games(self, cursor, target, batch_name):
+        """Copy a batch's games and developer links into an attached database; returns the game count
+
+        Game ids are reassigned by the target, so rows are matched by URL and batch.
+        """
+        cursor.execute(f'''
+            INSERT OR IGNORE INTO {target}.games
+            (name, developers, release_date, steam_page_url, batch_name, release_date_iso, release_year)
+            SELECT name, developers, release_date, steam_page_url, batch_name, release_date_iso, release_year
+            FROM main.games WHERE batch_name = ?
+            ORDER BY id
+        ''', (batch_name,))
+        game_count = cursor.rowcount
+        
+        cursor.execute(f'''
+            INSERT OR IGNORE INTO {target}.developers (name)
+            SELECT DISTINCT d.name
+            FROM main.games g
+            JOIN main.game_developers gd ON gd.game_id = g.id
+            JOIN main.developers d ON d.id = gd.developer_id
+            WHERE g.batch_name = ?
+        ''', (batch_name,))
+        
+        cursor.execute(f'''
+            INSERT OR IGNORE INTO {target}.game_developers (game_id, developer_id)
+            SELECT tg.id, td.id
+            FROM main.games g
+            JOIN main.game_developers gd ON gd.game_id = g.id
+            JOIN main.developers d ON d.id = gd.developer_id
+            JOIN {target}.games tg
+                ON tg.steam_page_url = g.steam_page_url AND tg.batch_name = g.batch_name
+            JOIN {target}.developers td ON td.name = d.name
+            WHERE g.batch_name = ?
+        ''', (batch_name,))
+        return game_count
+
+    def export_swipe_pack(self, pack_path, batch_names, user_name, preview_cache_dir=None):
+        """Write batches and one user's votes to a pack file for offline swiping (see merge_swipe_pack)
+
+        Returns (game_count, vote_count, preview_count).
+        """
+        if os.path.exists(pack_path):
+            raise ValueError(f"Swipe pack {pack_path} already exists")
+        # A pack is an ordinary database, opened and swiped like any other
+        DatabaseManager(pack_path)
+        
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("ATTACH DATABASE ? AS pack", (pack_path,))
+            cursor.executescript('''
+                CREATE TABLE pack.pack_info (
+                    user_name TEXT NOT NULL,
+                    source TEXT,
+                    batch_names TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    merged_at DATETIME
+                );
+                CREATE TABLE pack.pack_previews (
+                    app_id TEXT PRIMARY KEY,
+                    details TEXT NOT NULL
+                ) WITHOUT ROWID;
+            ''')
+            cursor.execute("INSERT INTO pack.pack_info (user_name, source, batch_names) VALUES (?, ?, ?)",
+                           (user_name, os.path.abspath(self.db_path), json.dumps(list(batch_names))))
+            
+            game_count = 0
+            for batch_name in batch_names:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO pack.decision_rules (batch_name, yes_quorum, no_quorum, majority_of)
+                    SELECT batch_name, yes_quorum, no_quorum, majority_of
+                    FROM main.decision_rules WHERE batch_name = ?
+                ''', (batch_name,))
+                game_count += self._copy_batch_games(cursor, "pack", batch_name)
+                
+                # Only this user's history; the pack derives its current votes from it
+                cursor.execute('''
+                    INSERT INTO pack.vote_events (game_id, user_name, vote, timestamp,
+                                                  shown_at, page_ready_at, voted_at)
+                    SELECT pg.id, e.user_name, e.vote, e.timestamp, e.shown_at, e.page_ready_at, e.voted_at
+                    FROM main.games g
+                    JOIN main.vote_events e ON e.game_id = g.id AND e.user_name = ?
+                    JOIN pack.games pg
+                        ON pg.steam_page_url = g.steam_page_url AND pg.batch_name = g.batch_name
+                    WHERE g.batch_name = ?
+                    ORDER BY e.seq
+                ''', (user_name, batch_name))
+                
+                # The team's tallies replace the single user's; trg_games_decide sets decided,
+                # so games the team has decided stay out of the pack's queue
+                cursor.execute('''
+                    UPDATE pack.games SET (yes_votes, no_votes) = (
+                        SELECT g.yes_votes, g.no_votes FROM main.games g
+                        WHERE g.steam_page_url = pack.games.steam_page_url AND g.batch_name = pack.games.batch_name
+                    )
+                    WHERE batch_name = ?
+                ''', (batch_name,))
+            
+            cursor.execute("SELECT COUNT(*) FROM pack.votes")
+            vote_count = cursor.fetchone()[0]
+            
+            # Cached store previews let the pack be swiped without a network
+            previews = []
+            if preview_cache_dir:
+                cursor.execute("SELECT steam_page_url FROM pack.games")
+                for (url,) in cursor.fetchall():
+                    match = STEAM_APP_ID_PATTERN.search(url or "")
+                    cache_path = match and os.path.join(preview_cache_dir, f"{match.group(1)}.json")
+                    if cache_path and os.path.exists(cache_path):
+                        with open(cache_path, 'r', encoding='utf-8') as f:
+                            previews.append((match.group(1), f.read()))
+                cursor.executemany("INSERT OR IGNORE INTO pack.pack_previews (app_id, details) VALUES (?, ?)",
+                                   previews)
+            
+            conn.commit()
+            cursor.execute("DETACH DATABASE pack")
+            print(f"Exported swipe pack {pack_path}: {game_count} games, {vote_count} votes, "
+                  f"{len(previews)} previews")
+            return game_count, vote_count, len(previews)
+        finally:
+            conn.close()
+
+    def get_pack_info(self):
+        """Return the pack_info of a swipe pack as a dict, or None for a regular database"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pack_info'")
+            if not cursor.fetchone():
+                return None
+            cursor.execute("SELECT user_name, source, batch_names, created_at, merged_at FROM pack_info")
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return {"user_name": row[0], "source": row[1], "batch_names": json.loads(row[2]),
+                    "created_at": row[3], "merged_at": row[4]}
+
+    def unpack_pack_previews(self, cache_dir):
+        """Write a pack's store previews into a preview cache directory, keeping existing files"""
+        os.makedirs(cache_dir, exist_ok=True)
+        written = 0
+        with self.get_connection() as conn:
+            for app_id, details in conn.execute("SELECT app_id, details FROM pack_previews"):
+                cache_path = os.path.join(cache_dir, f"{app_id}.json")
+                if not os.path.exists(cache_path):
+                    with open(cache_path, 'w', encoding='utf-8') as f:
+                        f.write(details)
+                    written += 1
+        return written
+
+    def merge_swipe_pack(self, pack_path):
+        """Bring the votes cast in a swipe pack back into this database in one transaction
+
+        Returns a dict with merged, unchanged and unmatched (game no longer here) counts.
+        """
+        if not os.path.exists(pack_path):
+            raise ValueError(f"Swipe pack {pack_path} not found")
+        
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("ATTACH DATABASE ? AS pack", (pack_path,))
+            cursor.execute("SELECT 1 FROM pack.sqlite_master WHERE type = 'table' AND name = 'pack_info'")
+            if not cursor.fetchone():
+                raise ValueError(f"{pack_path} is not a swipe pack")
+            cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            try:
+                # Each pack vote with its latest event (for the timing) and the matching local
+                # state; games match by URL and batch. The later timestamp wins and a tie keeps
+                # the local vote, so merging the same pack twice changes nothing
+                cursor.execute('''
+                    CREATE TEMP TABLE pack_merge AS
+                    SELECT g.id AS game_id, pv.user_name, pe.vote, pe.timestamp,
+                           pe.shown_at, pe.page_ready_at, pe.voted_at, pe.seq,
+                           (g.id IS NULL) AS unmatched,
+                           (g.id IS NOT NULL AND (mv.game_id IS NULL OR pe.timestamp > mv.timestamp)) AS wins
+                    FROM pack.votes pv
+                    JOIN pack.games pg ON pg.id = pv.game_id
+                    JOIN pack.vote_events pe ON pe.seq = (
+                        SELECT MAX(seq) FROM pack.vote_events
+                        WHERE game_id = pv.game_id AND user_name = pv.user_name
+                    )
+                    LEFT JOIN main.games g
+                        ON g.steam_page_url = pg.steam_page_url AND g.batch_name = pg.batch_name
+                    LEFT JOIN main.votes mv ON mv.game_id = g.id AND mv.user_name = pv.user_name
+                ''')
+                # Winning votes keep their original timestamps and timing
+                cursor.execute('''
+                    INSERT INTO main.vote_events (game_id, user_name, vote, timestamp,
+                                                  shown_at, page_ready_at, voted_at)
+                    SELECT game_id, user_name, vote, timestamp, shown_at, page_ready_at, voted_at
+                    FROM pack_merge WHERE wins
+                    ORDER BY timestamp, seq
+                ''')
+                cursor.execute("SELECT COALESCE(SUM(wins), 0), COALESCE(SUM(unmatched), 0), COUNT(*) FROM pack_merge")
+                merged, unmatched, total = cursor.fetchone()
+                cursor.execute("DROP TABLE pack_merge")
+                cursor.execute("UPDATE pack.pack_info SET merged_at = CURRENT_TIMESTAMP")
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            cursor.execute("DETACH DATABASE pack")
+            print(f"Merged swipe pack {pack_path}: {merged} of {total} votes")
+            return {"merged": merged, "unchanged": total - merged - unmatched, "unmatched": unmatched}
+        finally:
+            conn.close()
+
+    def derive_batch(self, new_batch, operation, batch_names, vote_filter=None, user_name=None):
+        """Create a batch from a set operation on other batches, entirely inside SQLite
+
+        Returns the number of games in the new batch.
+        """
+        batch_names = list(dict.fromkeys(batch_names))
+        if operation not in self.BATCH_OPERATIONS:
+            raise ValueError(f"Unknown batch operation: {operation}")
+        if vote_filter and vote_filter not in self.VOTE_FILTERS:
+            raise ValueError(f"Unknown vote filter: {vote_filter}")
+        if not batch_names or (operation != "union" and len(batch_names) < 2):
+            raise ValueError(f"{operation.capitalize()} needs at least {1 if operation == 'union' else 2} batches")
+        if not new_batch or new_batch in batch_names:
+            raise ValueError("Please choose a new name for the derived batch")
+            
+        def placeholders(names):
+            return ", ".join("?" for _ in names)
+        # Games are identified by their store URL
+        first, others = batch_names[0], batch_names[1:]
+        if operation == "union":
+            # One row per URL: the copy with the lowest id
+            conditions = [f"g.batch_name IN ({placeholders(batch_names)})",
+                          f'''g.id = (SELECT MIN(s.id) FROM games s
+                                    WHERE s.steam_page_url = g.steam_page_url
+                                      AND s.batch_name IN ({placeholders(batch_names)}))''']
+            params = batch_names + batch_names
+            scope = batch_names
+        elif operation == "intersection":
+            # In the first batch and in all of the others
+            conditions = ["g.batch_name = ?",
+                          f'''(SELECT COUNT(*) FROM games s
+                               WHERE s.steam_page_url = g.steam_page_url
+                                 AND s.batch_name IN ({placeholders(others)})) = ?''']
+            params = [first] + others + [len(others)]
+            scope = batch_names
+        else:
+            # In the first batch and in none of the others
+            conditions = ["g.batch_name = ?",
+                          f'''NOT EXISTS (SELECT 1 FROM games s
+                                          WHERE s.steam_page_url = g.steam_page_url
+                                            AND s.batch_name IN ({placeholders(others)}))''']
+            params = [first] + others
+            scope = [first]
+            
+        if vote_filter:
+            # A yes or no vote (by user_name, or by anyone), none, or the team's acceptance
+            # on any copy of the game in the operand batches (the first batch for a difference)
+            copies = f"c.steam_page_url = g.steam_page_url AND c.batch_name IN ({placeholders(scope)})"
+            if vote_filter == "accepted":
+                conditions.append(f"EXISTS (SELECT 1 FROM games c WHERE {copies} AND c.decided = 1)")
+                params += scope
+            else:
+                vote_condition = {"yes": " AND v.vote = 1", "no": " AND v.vote = 0", "unvoted": ""}[vote_filter]
+                if user_name:
+                    vote_condition += " AND v.user_name = ?"
+                conditions.append(f'''{"NOT " if vote_filter == "unvoted" else ""}EXISTS (
+                    SELECT 1 FROM games c JOIN votes v ON v.game_id = c.id
+                    WHERE {copies}{vote_condition})''')
+                params += scope + ([user_name] if user_name else [])
+                
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            try:
+                cursor.execute("SELECT 1 FROM games WHERE batch_name = ? LIMIT 1", (new_batch,))
+                if cursor.fetchone():
+                    raise ValueError(f"Batch {new_batch} already exists")
+                for batch_name in batch_names:
+                    cursor.execute("SELECT 1 FROM games WHERE batch_name = ? LIMIT 1", (batch_name,))
+                    if not cursor.fetchone():
+                        raise ValueError(f"Batch {batch_name} not found")
+                        
+                # Votes stay with the original games, so the new batch starts unvoted
+                cursor.execute(f'''
+                    INSERT INTO games
+                    (name, developers, release_date, steam_page_url, batch_name, release_date_iso, release_year)
+                    SELECT g.name, g.developers, g.release_date, g.steam_page_url, ?, g.release_date_iso, g.release_year
+                    FROM games g
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY g.id
+                ''', [new_batch] + params)
+                game_count = cursor.rowcount
+                
+                # Developer links come from the source copies with the same developers text
+                cursor.execute(f'''
+                    INSERT OR IGNORE INTO game_developers (game_id, developer_id)
+                    SELECT n.id, gd.developer_id
+                    FROM games n
+                    JOIN games s ON s.steam_page_url = n.steam_page_url AND s.developers IS n.developers
+                                AND s.batch_name IN ({placeholders(batch_names)})
+                    JOIN game_developers gd ON gd.game_id = s.id
+                    WHERE n.batch_name = ?
+                ''', batch_names + [new_batch])
+                conn.commit()
+            except (sqlite3.Error, ValueError):
+                conn.rollback()
+                raise
+            print(f"Derived batch {new_batch} ({operation} of {', '.join(batch_names)}"
+                  f"{f', {vote_filter}' if vote_filter else ''}): {game_count} games")
+            return game_count
+        finally:
+            conn.close()
+
+    def purge_batch(self, batch_name):
+        """Delete a single batch, its votes and its progress in one short transaction"""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            # IMMEDIATE (not EXCLUSIVE) so other sessions can keep reading while we purge
+            cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            try:
+                cursor.execute('''
+                    DELETE FROM votes
+                    WHERE game_id IN (SELECT id FROM games WHERE batch_name = ?)
+                ''', (batch_name,))
+                vote_count = cursor.rowcount
+                
+                cursor.execute('''
+                    DELETE FROM vote_events
+                    WHERE game_id IN (SELECT id FROM games WHERE batch_name = ?)
+                ''', (batch_name,))
+                
+                cursor.execute('''
+                    DELETE FROM queue_reservations
+                    WHERE game_id IN (SELECT id FROM games WHERE batch_name = ?)
+                ''', (batch_name,))
+                
+                cursor.execute("DELETE FROM games WHERE batch_name = ?", (batch_name,))
+                game_count = cursor.rowcount
+                
+                cursor.execute("DELETE FROM progress WHERE batch_name = ?", (batch_name,))
+                cursor.execute('''
+                    DELETE FROM merged_progress
+                    WHERE ? IN (SELECT value FROM json_each(merged_progress.batch_names))
+                ''', (batch_name,))
+                cursor.execute("DELETE FROM batch_user_stats WHERE batch_name = ?", (batch_name,))
+                cursor.execute("DELETE FROM decision_rules WHERE batch_name = ?", (batch_name,))
+                cursor.execute("DELETE FROM batches WHERE batch_name = ?", (batch_name,))
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            print(f"Purged batch {batch_name}: {game_count} games, {vote_count} votes")
+            return vote_count, game_count
+        finally:
+            conn.close()
+
+    def reset_database(self):
+        """Replace the whole database with a fresh, empty one
+
+        Instead of deleting row by row, an empty database is built in memory and copied
+        over the file with the SQLite backup API. This is one short write, leaves the
+        file at its minimal size and works while other sessions have the file open. If
+        another connection holds a write lock the whole time, sqlite3.OperationalError
+        ("database is locked") is raised and the file is left as it was.
+        """
+        target = self.get_connection()
+        fresh = sqlite3.connect(":memory:")
+        try:
+            vote_count, game_count = self.get_catalog_totals(target)
+            
+            # The backup cannot change the page size of a WAL database, so match it
+            page_size = target.execute("PRAGMA page_size").fetchone()[0]
+            fresh.execute(f"PRAGMA page_size = {int(page_size)}")
+            self.initialize_database(fresh)
+            # initialize_database only stamps the version when migrating an older file
+            fresh.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            
+            # The backup API retries a locked destination forever; give up after the
+            # connection timeout like any other write would
+            deadline = time.monotonic() + self.timeout
+            
+            def give_up_when_locked(status, remaining, total):
+                if status in (5, 6) and time.monotonic() > deadline:  # SQLITE_BUSY, SQLITE_LOCKED
+                    raise sqlite3.OperationalError("database is locked")
+            
+            try:
+                fresh.backup(target, progress=give_up_when_locked)
+            except sqlite3.OperationalError as e:
+                if is_lock_error(str(e)):
+                    print(f"Reset database: the file is locked by another connection ({e})")
+                raise
+            print(f"Reset database: {vote_count} votes, {game_count} games")
+            return vote_count, game_count
+        finally:
+            fresh.close()
+            target.close()
+
+    def get_storage_report(self):
+        """Return size and fragmentation figures for the database file"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            page_size = cursor.execute("PRAGMA page_size").fetchone()[0]
+            page_count = cursor.execute("PRAGMA page_count").fetchone()[0]
+            freelist_count = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+            auto_vacuum = cursor.execute("PRAGMA auto_vacuum").fetchone()[0]
+            
+            report = {
+                "file_size": os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0,
+                "page_size": page_size,
+                "page_count": page_count,
+                "freelist_count": freelist_count,
+                "free_bytes": freelist_count * page_size,
+                "fragmentation": freelist_count / page_count if page_count else 0.0,
+                "auto_vacuum": {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}.get(auto_vacuum, str(auto_vacuum)),
+                "tables": {},
+                "maintenance": {},
+            }
+            
+            # Per-table sizes need the dbstat virtual table, which not every build has
+            try:
+                cursor.execute('''
+                    SELECT name, SUM(pgsize) FROM dbstat
+                    GROUP BY name ORDER BY SUM(pgsize) DESC
+                ''')
+                report["tables"] = dict(cursor.fetchall())
+            except sqlite3.OperationalError:
+                pass
+                
+            cursor.execute("SELECT task, last_run, duration, result FROM maintenance_log")
+            for task, last_run, duration, result in cursor.fetchall():
+                report["maintenance"][task] = {"last_run": last_run, "duration": duration, "result": result}
+                
+            return report
+
+    def enable_incremental_vacuum(self):
+        """Switch an existing database to incremental auto_vacuum (rewrites the file once)"""
+        conn = self.get_connection()
+        try:
+            conn.isolation_level = None  # VACUUM cannot run inside a transaction
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            print("Converted database to incremental auto_vacuum")
+        finally:
+            conn.close()
+
+    def default_snapshot_dir(self):
+        return os.path.join(os.path.dirname(os.path.abspath(self.db_path)), "snapshots")
+
+    def create_snapshot(self, snapshot_dir=None, keep=10, pages_per_step=256, step_pause=0.005, max_restarts=3):
+        """Copy the live database to a timestamped snapshot file; returns its path
+
+        Uses the SQLite online backup API pages_per_step pages at a time, pausing
+        between steps, so voters are only ever held up for one short step. A write
+        from another connection makes SQLite restart the copy; after max_restarts of
+        those (steady voting on a big file) the copy is finished in a single step
+        instead, which holds the read lock for one copy of the file. The copy is
+        written under a temporary name, checked, then renamed, and only the newest
+        keep snapshots are retained (keep=None keeps all).
+        """
+        snapshot_dir = snapshot_dir or self.default_snapshot_dir()
+        os.makedirs(snapshot_dir, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(self.db_path))[0]
+        snapshot_path = os.path.join(snapshot_dir, f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db")
+        suffix = 1
+        while os.path.exists(snapshot_path):
+            suffix += 1
+            snapshot_path = os.path.join(snapshot_dir, f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{suffix}.db")
+        partial_path = snapshot_path + ".partial"
+        
+        restarts = [0]
+        last_remaining = [None]
+        
+        def pause_between_steps(status, remaining, total):
+            if last_remaining[0] is not None and remaining > last_remaining[0]:
+                restarts[0] += 1
+                if restarts[0] > max_restarts:
+                    raise SnapshotRestarted()
+            last_remaining[0] = remaining
+            time.sleep(step_pause)
+        
+        started = time.monotonic()
+        source = self.get_connection()
+        target = sqlite3.connect(partial_path)
+        try:
+            try:
+                source.backup(target, pages=pages_per_step, progress=pause_between_steps)
+            except SnapshotRestarted:
+                print(f"Snapshot restarted {restarts[0]} times by concurrent writes; finishing in one step")
+                source.backup(target)
+            check = target.execute("PRAGMA quick_check").fetchone()[0]
+            if check != "ok":
+                raise sqlite3.DatabaseError(f"Snapshot failed quick_check: {check}")
+        except BaseException:
+            target.close()
+            os.remove(partial_path)
+            raise
+        finally:
+            source.close()
+        target.close()
+        os.replace(partial_path, snapshot_path)
+        print(f"Created snapshot {snapshot_path} in {time.monotonic() - started:.1f}s")
+        
+        if keep is not None:
+            self.prune_snapshots(snapshot_dir, keep)
+        return snapshot_path
+
+    def create_snapshot_in_background(self, callback=None, **options):
+        """Run create_snapshot on a separate thread; callback(path, error) when done"""
+        def worker():
+            try:
+                path, error = self.create_snapshot(**options), None
+            except (sqlite3.Error, OSError) as e:
+                print(f"Snapshot failed: {e}")
+                path, error = None, e
+            if callback:
+                callback(path, error)
+        threading.Thread(target=worker, name="db-snapshot", daemon=True).start()
+
+    def list_snapshots(self, snapshot_dir=None):
+        """Snapshots of this database, newest first, as dicts with path, size and created"""
+        snapshot_dir = snapshot_dir or self.default_snapshot_dir()
+        if not os.path.isdir(snapshot_dir):
+            return []
+        stem = os.path.splitext(os.path.basename(self.db_path))[0]
+        snapshots = []
+        for path in Path(snapshot_dir).glob(f"{stem}_*.db"):
+            stat = path.stat()
+            snapshots.append({"path": str(path), "size": stat.st_size,
+                              "created": datetime.fromtimestamp(stat.st_mtime)})
+        return sorted(snapshots, key=lambda snapshot: snapshot["created"], reverse=True)
+
+    def prune_snapshots(self, snapshot_dir=None, keep=10):
+        """Delete all but the newest keep snapshots; returns the removed paths"""
+        removed = []
+        for snapshot in self.list_snapshots(snapshot_dir)[keep:]:
+            os.remove(snapshot["path"])
+            removed.append(snapshot["path"])
+        if removed:
+            print(f"Removed {len(removed)} old snapshots")
+        return removed
+
+    def restore_snapshot(self, snapshot_path):
+        """Replace the database contents with a snapshot (backup API, like reset_database)"""
+        source = sqlite3.connect(f"file:{Path(snapshot_path).absolute().as_posix()}?mode=ro", uri=True)
+        target = self.get_connection()
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        # Snapshots of an older schema version are brought up to date
+        self.initialize_database()
+        self.migrate_database()
+        print(f"Restored database from snapshot {snapshot_path}")
+
+    def import_games(self, rows, batch_name, processes=None):
+        """Insert games from CSV-style dicts into a batch; returns (imported, duplicates)
+
+        Release dates and developer lists are parsed into release_date_iso, release_year
+        and the developers / game_developers relation on the way in, chunk by chunk,
+        using a process pool when processes > 1.
+        """
+        keyed_rows = (
+            ((row['steam_page_url'], row['name']), row['developers'], row['release_date'])
+            for row in rows
+        )
+        imported_count = 0
+        total_count = 0
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for raw_chunk, normalized_chunk in iter_normalized_chunks(keyed_rows, processes):
+                params = [
+                    (name, developers, release_date, steam_page_url, batch_name, release_date_iso, release_year)
+                    for ((steam_page_url, name), developers, release_date), (_, release_date_iso, release_year, _)
+                    in zip(raw_chunk, normalized_chunk)
+                ]
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO games
+                    (name, developers, release_date, steam_page_url, batch_name, release_date_iso, release_year)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', params)
+                imported_count += cursor.rowcount
+                total_count += len(params)
+                
+                developer_links = [
+                    (steam_page_url, developer)
+                    for (steam_page_url, _), _, _, developer_names in normalized_chunk
+                    for developer in developer_names
+                ]
+                self._link_developers_by_url(cursor, batch_name, developer_links)
+            conn.commit()
+        return imported_count, total_count - imported_count
+
+    def _link_developers_by_url(self, cursor, batch_name, developer_links):
+        """Fill developers / game_developers from (steam_page_url, developer) pairs set-wise"""
+        if not developer_links:
+            return
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS developer_staging (game_key TEXT, developer TEXT)")
+        cursor.execute("DELETE FROM developer_staging")
+        cursor.executemany("INSERT INTO developer_staging VALUES (?, ?)", developer_links)
+        cursor.execute("INSERT OR IGNORE INTO developers (name) SELECT DISTINCT developer FROM developer_staging")
+        cursor.execute('''
+            INSERT OR IGNORE INTO game_developers (game_id, developer_id)
+            SELECT g.id, d.id
+            FROM developer_staging s
+            JOIN games g ON g.steam_page_url = s.game_key AND g.batch_name = ?
+            JOIN developers d ON d.name = s.developer
+        ''', (batch_name,))
+
+    def normalize_existing_games(self, conn, processes=None):
+        """Back-fill normalized release dates and developers for games imported earlier"""
+        cursor = conn.cursor()
+        read_cursor = conn.cursor()
+        read_cursor.execute("SELECT id, developers, release_date FROM games ORDER BY id")
+        
+        normalized_count = 0
+        for _, normalized_chunk in iter_normalized_chunks(read_cursor, processes):
+            # Materialize before writing so the open read cursor is not disturbed
+            cursor.executemany(
+                "UPDATE games SET release_date_iso = ?, release_year = ? WHERE id = ?",
+                [(release_date_iso, release_year, game_id)
+                 for game_id, release_date_iso, release_year, _ in normalized_chunk]
+            )
+            developer_links = [
+                (game_id, developer)
+                for game_id, _, _, developer_names in normalized_chunk
+                for developer in developer_names
+            ]
+            if developer_links:
+                cursor.executemany("INSERT OR IGNORE INTO developers (name) VALUES (?)",
+                                   [(developer,) for _, developer in developer_links])
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO game_developers (game_id, developer_id)
+                    SELECT ?, id FROM developers WHERE name = ?
+                ''', developer_links)
+            normalized_count += len(normalized_chunk)
+        conn.commit()
+        return normalized_count
+
+    def _select_unvoted_games(self, cursor, user_name, count, game_filter=None, after=None):
+        """Run the unvoted-queue query on a cursor and return the games as dicts
+
+        game_filter (a GameFilter) restricts and orders the queue. For ordered queues,
+        after is the last game already queued, so refills continue from there.
+        Games under an active reservation lease for this user are skipped.
+        """
+        game_filter = game_filter or GameFilter()
+        conditions = ['''NOT EXISTS (
+                    SELECT 1 FROM votes v 
+                    WHERE v.game_id = g.id AND v.user_name = ?
+                )''', '''NOT EXISTS (
+                    SELECT 1 FROM queue_reservations r
+                    WHERE r.game_id = g.id AND r.user_name = ? AND r.lease_expires > ?
+                )''']
+        params = [user_name, user_name, time.time()]
+        
+        filter_sql, filter_params = game_filter.compile(user_name)
+        if filter_sql:
+            conditions.append(filter_sql)
+            params.extend(filter_params)
+            
+        if game_filter.order == "id":
+            if after:
+                conditions.append("g.id > ?")
+                params.append(after['id'])
+            order_by = "g.id"
+        elif game_filter.order == "release":
+            # Games without a parsed date sort last; keyset on (date, id) for refills
+            if after:
+                conditions.append("(COALESCE(g.release_date_iso, '9999'), g.id) > (?, ?)")
+                params.extend([after.get('release_date_iso') or '9999', after['id']])
+            order_by = "COALESCE(g.release_date_iso, '9999'), g.id"
+        else:
+            order_by = "RANDOM()"
+            
+        params.append(int(count))
+        cursor.execute(f'''
+            SELECT g.* FROM games g
+            WHERE {" AND ".join(conditions)}
+            ORDER BY {order_by}
+            LIMIT ?
+        ''', params)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def fetch_unvoted_games(self, user_name, count, game_filter=None, after=None):
+        """Return up to count games the user has not voted on, without reserving them"""
+        with self.get_connection() as conn:
+            return self._select_unvoted_games(conn.cursor(), user_name, count, game_filter, after)
+
+    def claim_unvoted_games(self, user_name, session_id, count, game_filter=None, after=None,
+                            lease_seconds=900):
+        """Reserve up to count unvoted games for one swipe session and return them
+
+        Selection and reservation happen in one IMMEDIATE transaction, so parallel
+        sessions of the same user never receive the same game while its lease is
+        active. Claiming also renews the leases the session already holds.
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            try:
+                now = time.time()
+                lease_expires = now + lease_seconds
+                cursor.execute("DELETE FROM queue_reservations WHERE lease_expires <= ?", (now,))
+                cursor.execute("UPDATE queue_reservations SET lease_expires = ? WHERE session_id = ?",
+                               (lease_expires, session_id))
+                
+                games = self._select_unvoted_games(cursor, user_name, count, game_filter, after)
+                cursor.executemany('''
+                    INSERT INTO queue_reservations (game_id, user_name, session_id, lease_expires)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(game_id, user_name) DO UPDATE SET
+                        session_id = excluded.session_id,
+                        lease_expires = excluded.lease_expires
+                ''', [(game['id'], user_name, session_id, lease_expires) for game in games])
+                conn.commit()
+                return games
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        finally:
+            conn.close()
+
+    def reserve_games(self, user_name, session_id, game_ids, lease_seconds=900, conn=None):
+        """Reserve specific games for a session; returns the ids it now holds
+
+        Games the user has voted on, that the team has decided, or that another
+        session holds an active lease on, are skipped. SessionCache picks candidates
+        from its in-memory copy and only needs the shared database for this step.
+        """
+        own_connection = conn is None
+        if own_connection:
+            conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            try:
+                now = time.time()
+                lease_expires = now + lease_seconds
+                cursor.execute("DELETE FROM queue_reservations WHERE lease_expires <= ?", (now,))
+                cursor.execute("UPDATE queue_reservations SET lease_expires = ? WHERE session_id = ?",
+                               (lease_expires, session_id))
+                
+                reserved = []
+                for game_id in game_ids:
+                    # Any remaining reservation is active, so only our own may be taken over
+                    cursor.execute('''
+                        INSERT INTO queue_reservations (game_id, user_name, session_id, lease_expires)
+                        SELECT ?, ?, ?, ?
+                        WHERE NOT EXISTS (SELECT 1 FROM votes WHERE game_id = ? AND user_name = ?)
+                          AND NOT EXISTS (SELECT 1 FROM games WHERE id = ? AND decided != 0)
+                        ON CONFLICT(game_id, user_name) DO UPDATE SET lease_expires = excluded.lease_expires
+                        WHERE session_id = excluded.session_id
+                    ''', (game_id, user_name, session_id, lease_expires, game_id, user_name, game_id))
+                    if cursor.rowcount:
+                        reserved.append(game_id)
+                conn.commit()
+                return reserved
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        finally:
+            if own_connection:
+                conn.close()
+
+    def release_reservations(self, session_id, conn=None):
+        """Give back every game a session still holds (when it ends)"""
+        own_connection = conn is None
+        if own_connection:
+            conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM queue_reservations WHERE session_id = ?", (session_id,))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            if own_connection:
+                conn.close()
+
+    def search_games(self, text, user_name, limit=50):
+        """Find games by name or developer, prefix-matching every word typed
+
+        Returns game dicts with the user's current vote (None when not voted on) and
+        the team's decided flag.
+        Results are ranked by relevance only when there are at most
+        SEARCH_RANK_CANDIDATES matches; ranking every match of a short or very
+        common prefix would not stay fast on big tables.
+        """
+        words = re.findall(r"\w+", text or "")
+        if not words:
+            return []
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if self.has_fts:
+                match = " ".join(f'"{word}"*' for word in words)
+                cursor.execute('''
+                    SELECT COUNT(*) FROM (SELECT rowid FROM games_fts WHERE games_fts MATCH ? LIMIT ?)
+                ''', (match, self.SEARCH_RANK_CANDIDATES + 1))
+                order = "ORDER BY rank" if cursor.fetchone()[0] <= self.SEARCH_RANK_CANDIDATES else ""
+                cursor.execute(f'''
+                    SELECT g.id, g.name, g.developers, g.release_date, g.steam_page_url, g.batch_name,
+                           g.release_date_iso, g.decided, v.vote
+                    FROM (SELECT rowid, rank FROM games_fts WHERE games_fts MATCH ? {order} LIMIT ?) f
+                    JOIN games g ON g.id = f.rowid
+                    LEFT JOIN votes v ON v.game_id = g.id AND v.user_name = ?
+                    ORDER BY f.rank
+                ''', (match, int(limit), user_name))
+            else:
+                conditions = " AND ".join(["(g.name LIKE ? OR g.developers LIKE ?)"] * len(words))
+                params = [f"%{word}%" for word in words for _ in range(2)]
+                cursor.execute(f'''
+                    SELECT g.id, g.name, g.developers, g.release_date, g.steam_page_url, g.batch_name,
+                           g.release_date_iso, g.decided, v.vote
+                    FROM games g
+                    LEFT JOIN votes v ON v.game_id = g.id AND v.user_name = ?
+                    WHERE {conditions}
+                    LIMIT ?
+                ''', [user_name] + params + [int(limit)])
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def get_swipe_stats(self, since=None, dwell_cap=300):
+        """Swipe throughput, dwell times and page-ready latency from timed vote events
+
+        since is a unix time (None for all time). Dwell is the time from a game being
+        shown to its vote; for votes per hour a dwell is capped at dwell_cap seconds so
+        a coffee break does not count as swiping time. Returns a dict of row lists:
+        users, batches, histogram, by_page_latency and hourly.
+        """
+        since = since or 0
+        timed = '''
+            WITH timed AS (
+                SELECT e.user_name, g.batch_name, e.voted_at,
+                       e.voted_at - e.shown_at AS dwell,
+                       e.page_ready_at - e.shown_at AS page_ready
+                FROM vote_events e
+                JOIN games g ON g.id = e.game_id
+                WHERE e.voted_at >= ? AND e.shown_at IS NOT NULL
+            )
+        '''
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            stats = {}
+            for key, group_column in (("users", "user_name"), ("batches", "batch_name")):
+                # Median and p90 by rank within each group (ceil(n/2) and ceil(0.9n))
+                cursor.execute(timed + f'''
+                    , ranked AS (
+                        SELECT {group_column} AS name, dwell, page_ready,
+                               ROW_NUMBER() OVER (PARTITION BY {group_column} ORDER BY dwell) AS dwell_rank,
+                               ROW_NUMBER() OVER (PARTITION BY {group_column}
+                                                  ORDER BY page_ready IS NULL, page_ready) AS ready_rank,
+                               COUNT(*) OVER (PARTITION BY {group_column}) AS n,
+                               COUNT(page_ready) OVER (PARTITION BY {group_column}) AS ready_n
+                        FROM timed
+                    )
+                    SELECT name, COUNT(*) AS votes,
+                           3600.0 * COUNT(*) / NULLIF(SUM(MIN(dwell, ?)), 0) AS votes_per_hour,
+                           MAX(CASE WHEN dwell_rank = (n + 1) / 2 THEN dwell END) AS median_dwell,
+                           MAX(CASE WHEN dwell_rank = (9 * n + 9) / 10 THEN dwell END) AS p90_dwell,
+                           AVG(page_ready) AS avg_page_ready,
+                           MAX(CASE WHEN ready_rank = (9 * ready_n + 9) / 10 THEN page_ready END) AS p90_page_ready
+                    FROM ranked
+                    GROUP BY name
+                    ORDER BY votes DESC
+                ''', (since, dwell_cap))
+                columns = [col[0] for col in cursor.description]
+                stats[key] = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+            cursor.execute(timed + '''
+                SELECT CASE WHEN dwell < 2 THEN '< 2 s' WHEN dwell < 5 THEN '2-5 s'
+                            WHEN dwell < 10 THEN '5-10 s' WHEN dwell < 30 THEN '10-30 s'
+                            WHEN dwell < 60 THEN '30-60 s' ELSE '>= 60 s' END AS bucket,
+                       COUNT(*) AS votes
+                FROM timed
+                GROUP BY bucket
+                ORDER BY MIN(dwell)
+            ''', (since,))
+            stats["histogram"] = [{"bucket": bucket, "votes": votes} for bucket, votes in cursor.fetchall()]
+
+            # Does a slow page make people slower?
+            cursor.execute(timed + '''
+                SELECT CASE WHEN page_ready < 1 THEN '< 1 s' WHEN page_ready < 2 THEN '1-2 s'
+                            WHEN page_ready < 5 THEN '2-5 s' ELSE '>= 5 s' END AS bucket,
+                       COUNT(*) AS votes, AVG(MIN(dwell, ?)) AS avg_dwell
+                FROM timed
+                WHERE page_ready IS NOT NULL
+                GROUP BY bucket
+                ORDER BY MIN(page_ready)
+            ''', (since, dwell_cap))
+            stats["by_page_latency"] = [
+                {"bucket": bucket, "votes": votes, "avg_dwell": avg_dwell}
+                for bucket, votes, avg_dwell in cursor.fetchall()
+            ]
+
+            # Team throughput per hour, most recent first
+            cursor.execute('''
+                SELECT strftime('%Y-%m-%d %H:00', voted_at, 'unixepoch', 'localtime') AS hour,
+                       COUNT(*) AS votes, COUNT(DISTINCT user_name) AS users
+                FROM vote_events
+                WHERE voted_at >= ?
+                GROUP BY hour
+                ORDER BY hour DESC
+                LIMIT 48
+            ''', (since,))
+            stats["hourly"] = [{"hour": hour, "votes": votes, "users": users}
+                               for hour, votes, users in cursor.fetchall()]
+            return stats
+
+    def get_developer_names(self):
+        """Return all known developer names, alphabetically"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM developers ORDER BY name")
+            return [row[0] for row in cursor.fetchall()]
+
+    def record_vote(self, game_id, user_name, value, progress=None, timing=None, conn=None):
+        """Record a vote and release the game's queue reservation
+
+        progress is an optional (batch_name, current_index) saved in the same transaction.
+        timing is an optional (shown_at, page_ready_at) pair of unix times from the swipe
+        loop; the vote time itself is taken here.
+        """
+        shown_at, page_ready_at = timing or (None, None)
+        own_connection = conn is None
+        if own_connection:
+            conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            try:
+                # Append to the event log; trg_vote_events_apply updates the current votes
+                cursor.execute('''
+                    INSERT INTO vote_events (game_id, user_name, vote, timestamp,
+                                             shown_at, page_ready_at, voted_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?)
+                ''', (game_id, user_name, bool(value), shown_at, page_ready_at, time.time()))
+                
+                # The game is decided for this user, so its queue reservation is done
+                cursor.execute("DELETE FROM queue_reservations WHERE game_id = ? AND user_name = ?",
+                               (game_id, user_name))
+                
+                if progress:
+                    batch_name, current_index = progress
+                    cursor.execute('''
+                        UPDATE progress 
+                        SET current_index = ?
+                        WHERE user_name = ? AND batch_name = ?
+                    ''', (current_index, user_name, batch_name))
+                    
+                conn.commit()
+                return True
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        finally:
+            if own_connection:
+                conn.close()
+
+    def record_votes(self, user_name, votes, timing=None, conn=None):
+        """Record a page of (game_id, value) votes in one transaction
+
+        Used by grid swiping, where several games are judged at once; timing is the
+        (shown_at, page_ready_at) pair of the whole page. Returns the number of votes.
+        """
+        shown_at, page_ready_at = timing or (None, None)
+        voted_at = time.time()
+        own_connection = conn is None
+        if own_connection:
+            conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            try:
+                cursor.executemany('''
+                    INSERT INTO vote_events (game_id, user_name, vote, timestamp,
+                                             shown_at, page_ready_at, voted_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?)
+                ''', [(game_id, user_name, bool(value), shown_at, page_ready_at, voted_at)
+                      for game_id, value in votes])
+                cursor.executemany("DELETE FROM queue_reservations WHERE game_id = ? AND user_name = ?",
+                                   [(game_id, user_name) for game_id, _ in votes])
+                conn.commit()
+                return len(votes)
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        finally:
+            if own_connection:
+                conn.close()
+
+    def get_export_watermark(self, consumer):
+        """Return the last event sequence number a consumer has exported"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT last_seq FROM export_watermarks WHERE consumer = ?", (consumer,))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+
+    def set_export_watermark(self, consumer, last_seq):
+        """Move a consumer's watermark forward (never backwards)"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                INSERT INTO export_watermarks (consumer, last_seq, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(consumer) DO UPDATE SET
+                    last_seq = MAX(last_seq, excluded.last_seq),
+                    updated_at = excluded.updated_at
+            ''', (consumer, int(last_seq)))
+            conn.commit()
+
+    def fetch_vote_events(self, consumer, user_name=None, yes_only=False, current_only=True):
+        """Read the vote events past a consumer's watermark; returns (rows, high_seq)
+
+        This is a pure range read on the event log. rows are game dicts with seq,
+        user_name, vote and timestamp. With current_only, events superseded by a later
+        vote on the same game are left out. high_seq is the watermark to store once
+        the rows have been handled, via set_export_watermark.
+        """
+        watermark = self.get_export_watermark(consumer)
+        conditions = ["e.seq > ?"]
+        params = [watermark]
+        if user_name:
+            conditions.append("e.user_name = ?")
+            params.append(user_name)
+        where_sql = " AND ".join(conditions)
+        
+        row_conditions = [where_sql]
+        if yes_only:
+            row_conditions.append("e.vote = 1")
+        if current_only:
+            row_conditions.append('''e.seq = (
+                SELECT MAX(e2.seq) FROM vote_events e2
+                WHERE e2.game_id = e.game_id AND e2.user_name = e.user_name
+            )''')
+            
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT MAX(e.seq) FROM vote_events e WHERE {where_sql}", params)
+            high_seq = cursor.fetchone()[0] or watermark
+            
+            cursor.execute(f'''
+                SELECT g.*, e.seq, e.user_name, e.vote, e.timestamp
+                FROM vote_events e
+                JOIN games g ON g.id = e.game_id
+                WHERE {" AND ".join(row_conditions)} AND e.seq <= ?
+                ORDER BY e.seq
+            ''', params + [high_seq])
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()], high_seq
+
+    def fetch_new_yes_votes(self, user_name):
+        """Return (yes votes not yet exported by this user, high_seq) for the yes-vote export"""
+        return self.fetch_vote_events(f"yes_export:{user_name}", user_name=user_name, yes_only=True)
+
+    def get_batch_catalog(self, user_name):
+        """Return (batch_name, game_count, voted_count, yes_count) for every batch"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT b.batch_name, b.game_count,
+                       COALESCE(s.voted_count, 0), COALESCE(s.yes_count, 0)
+                FROM batches b
+                LEFT JOIN batch_user_stats s
+                    ON s.batch_name = b.batch_name AND s.user_name = ?
+                WHERE b.game_count > 0
+                ORDER BY b.batch_name
+            ''', (user_name,))
+            return cursor.fetchall()
+
+    def fetch_vote_columns(self, batch_names=None):
+        """Return the votes on the batches' games (every batch by default) as columns
+
+        Returns (game_ids, user_index, votes, user_names): three parallel lists with one
+        entry per vote, where user_index points into user_names.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if batch_names:
+                cursor.execute(f'''
+                    SELECT v.game_id, v.user_name, v.vote
+                    FROM votes v
+                    JOIN games g ON g.id = v.game_id
+                    WHERE g.batch_name IN ({', '.join('?' for _ in batch_names)})
+                ''', list(batch_names))
+            else:
+                cursor.execute("SELECT game_id, user_name, vote FROM votes")
+            user_codes = {}
+            game_ids, user_index, votes = [], [], []
+            while True:
+                rows = cursor.fetchmany(100000)
+                if not rows:
+                    break
+                for game_id, user_name, vote in rows:
+                    game_ids.append(game_id)
+                    user_index.append(user_codes.setdefault(user_name, len(user_codes)))
+                    votes.append(vote)
+            return game_ids, user_index, votes, list(user_codes)
+
+    def get_game_details(self, batch_names=None):
+        """Return {game_id: (name, developers, release_date, steam_page_url, batch_name)}"""
+        condition, params = "", []
+        if batch_names:
+            condition = f"WHERE batch_name IN ({', '.join('?' for _ in batch_names)})"
+            params = list(batch_names)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT id, name, developers, release_date, steam_page_url, batch_name FROM games {condition}
+            ''', params)
+            return {row[0]: row[1:] for row in cursor}
+
+    def get_decision_rule(self, batch_name):
+        """Return a batch's decision rule and how many of its games are decided, as a dict"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT yes_quorum, no_quorum, majority_of FROM decision_rules WHERE batch_name = ?
+            ''', (batch_name,))
+            yes_quorum, no_quorum, majority_of = cursor.fetchone() or (None, None, None)
+            cursor.execute('''
+                SELECT COALESCE(SUM(decided = 1), 0), COALESCE(SUM(decided = -1), 0)
+                FROM games WHERE batch_name = ? AND decided != 0
+            ''', (batch_name,))
+            accepted, rejected = cursor.fetchone()
+            return {"yes_quorum": yes_quorum, "no_quorum": no_quorum, "majority_of": majority_of,
+                    "accepted": accepted, "rejected": rejected}
+
+    def set_decision_rule(self, batch_name, yes_quorum=None, no_quorum=None, majority_of=None):
+        """Set when the team's votes decide a batch's games; returns (accepted, rejected)
+
+        A game is accepted at yes_quorum yes votes, rejected at no_quorum no votes, and
+        with majority_of (the team size) decided as soon as either side has a majority.
+        Decided games leave every user's unvoted queue. Without any threshold the rule
+        is removed and all of the batch's games are open again.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if yes_quorum or no_quorum or majority_of:
+                cursor.execute('''
+                    INSERT INTO decision_rules (batch_name, yes_quorum, no_quorum, majority_of)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(batch_name) DO UPDATE SET
+                        yes_quorum = excluded.yes_quorum,
+                        no_quorum = excluded.no_quorum,
+                        majority_of = excluded.majority_of
+                ''', (batch_name, yes_quorum or None, no_quorum or None, majority_of or None))
+            else:
+                cursor.execute("DELETE FROM decision_rules WHERE batch_name = ?", (batch_name,))
+            cursor.execute(f"UPDATE games SET decided = {self.DECISION_SQL.format(game='games')} WHERE batch_name = ?",
+                           (batch_name,))
+            conn.commit()
+        rule = self.get_decision_rule(batch_name)
+        return rule["accepted"], rule["rejected"]
+
+    @staticmethod
+    def merged_session_key(batch_names):
+        """The same set of batches is the same merged session, whatever the selection order"""
+        return "\n".join(sorted(set(batch_names)))
+
+    def start_merged_session(self, user_name, batch_names):
+        """Start or resume a session over several batches; returns its state as a dict
+
+        A game listed in more than one of the batches (same store page) is one game of
+        the session. total and voted count those games. The session resumes at the
+        first page still unvoted, as claim_merged_games starts from the lowest id.
+        """
+        batch_names = sorted(set(batch_names))
+        session_key = self.merged_session_key(batch_names)
+        placeholders = ", ".join("?" for _ in batch_names)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR IGNORE INTO merged_progress (user_name, session_key, batch_names)
+                VALUES (?, ?, ?)
+            ''', (user_name, session_key, json.dumps(batch_names)))
+            cursor.execute(f'''
+                SELECT COUNT(DISTINCT g.steam_page_url),
+                       COUNT(DISTINCT CASE WHEN v.game_id IS NOT NULL THEN g.steam_page_url END)
+                FROM games g
+                LEFT JOIN votes v ON v.game_id = g.id AND v.user_name = ?
+                WHERE g.batch_name IN ({placeholders})
+            ''', [user_name] + batch_names)
+            total, voted = cursor.fetchone()
+            conn.commit()
+            return {"session_key": session_key, "batch_names": batch_names,
+                    "total": total, "voted": voted}
+
+    def _select_merged_games(self, cursor, user_name, batch_names, after_id, limit):
+        """Run the merged-session queue query on a cursor and return the games as dicts
+
+        Each store page appears once, as its lowest-id game in the batches. A page is
+        skipped if any of its copies has been voted on by the user, decided by the team,
+        or is under an active reservation lease for the user.
+        """
+        placeholders = ", ".join("?" for _ in batch_names)
+        cursor.execute(f'''
+            SELECT g.* FROM games g
+            WHERE g.id > ? AND g.batch_name IN ({placeholders})
+              AND NOT EXISTS (
+                  SELECT 1 FROM games d
+                  WHERE d.steam_page_url = g.steam_page_url AND d.id < g.id
+                    AND d.batch_name IN ({placeholders})
+              )
+              AND NOT EXISTS (
+                  SELECT 1 FROM games d
+                  WHERE d.steam_page_url = g.steam_page_url AND d.batch_name IN ({placeholders})
+                    AND (d.decided != 0
+                         OR EXISTS (SELECT 1 FROM votes v WHERE v.game_id = d.id AND v.user_name = ?)
+                         OR EXISTS (SELECT 1 FROM queue_reservations r
+                                    WHERE r.game_id = d.id AND r.user_name = ? AND r.lease_expires > ?))
+              )
+            ORDER BY g.id
+            LIMIT ?
+        ''', [after_id] + list(batch_names) * 3 + [user_name, user_name, time.time(), int(limit)])
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def claim_merged_games(self, user_name, session_id, batch_names, after_id=0, limit=20,
+                           lease_seconds=900):
+        """Reserve the next games of a merged session after game id after_id and return them
+
+        Like claim_unvoted_games, but over several batches at once: every copy of a
+        claimed store page in the batches is reserved, so a session over just one of
+        them does not get the page either. Rows are read a page at a time by id, so the
+        batches are never loaded as a whole.
+        """
+        placeholders = ", ".join("?" for _ in batch_names)
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            try:
+                now = time.time()
+                lease_expires = now + lease_seconds
+                cursor.execute("DELETE FROM queue_reservations WHERE lease_expires <= ?", (now,))
+                cursor.execute("UPDATE queue_reservations SET lease_expires = ? WHERE session_id = ?",
+                               (lease_expires, session_id))
+
+                games = self._select_merged_games(cursor, user_name, batch_names, after_id, limit)
+                for game in games:
+                    cursor.execute(f'''
+                        INSERT INTO queue_reservations (game_id, user_name, session_id, lease_expires)
+                        SELECT id, ?, ?, ? FROM games
+                        WHERE steam_page_url = ? AND batch_name IN ({placeholders})
+                        ON CONFLICT(game_id, user_name) DO UPDATE SET
+                            session_id = excluded.session_id,
+                            lease_expires = excluded.lease_expires
+                    ''', [user_name, session_id, lease_expires, game['steam_page_url']]
+                       + list(batch_names))
+                conn.commit()
+                return games
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        finally:
+            conn.close()
+
+    def record_merged_vote(self, game_id, user_name, value, batch_names, timing=None, conn=None):
+        """Record a merged-session vote on every copy of the game in the session's batches
+
+        The vote is saved and the session's reservations of the copies are dropped in one
+        transaction, so per-batch progress and exports see the vote in each batch.
+        """
+        shown_at, page_ready_at = timing or (None, None)
+        placeholders = ", ".join("?" for _ in batch_names)
+        own_connection = conn is None
+        if own_connection:
+            conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            try:
+                cursor.execute(f'''
+                    INSERT INTO vote_events (game_id, user_name, vote, timestamp,
+                                             shown_at, page_ready_at, voted_at)
+                    SELECT d.id, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?
+                    FROM games g
+                    JOIN games d ON d.steam_page_url = g.steam_page_url
+                    WHERE g.id = ? AND d.batch_name IN ({placeholders})
+                    ORDER BY d.id
+                ''', [user_name, bool(value), shown_at, page_ready_at, time.time(), game_id]
+                   + list(batch_names))
+
+                cursor.execute(f'''
+                    DELETE FROM queue_reservations
+                    WHERE user_name = ? AND game_id IN (
+                        SELECT d.id FROM games g
+                        JOIN games d ON d.steam_page_url = g.steam_page_url
+                        WHERE g.id = ? AND d.batch_name IN ({placeholders})
+                    )
+                ''', [user_name, game_id] + list(batch_names))
+
+                cursor.execute('''
+                    UPDATE merged_progress
+                    SET last_game_id = MAX(last_game_id, ?), updated_at = CURRENT_TIMESTAMP
+                    WHERE user_name = ? AND session_key = ?
+                ''', (game_id, user_name, self.merged_session_key(batch_names)))
+                conn.commit()
+                return True
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        finally:
+            if own_connection:
+                conn.close()
+
+class SessionCache:
+    """In-memory copy of what a swipe session reads, writing through to the shared database"""
+    is_remote = False
+    # Reads the session does not cache; anything else not defined here raises, so a
+    # write that would bypass the in-memory copy cannot slip through unnoticed
+    PASSTHROUGH = ("search_games", "get_developer_names", "get_swipe_stats",
+                   "get_batch_catalog", "get_decision_rule", "get_game_details")
+    
+    def __init__(self, db, user_name, game_filter=None):
+        self.db = db
+        self.db_path = db.db_path
+        self.user_name = user_name
+        self.game_filter = game_filter or GameFilter()
+        # Reservations and votes go to the shared file over this one connection; its
+        # PRAGMA data_version only moves when another connection commits
+        self.shared = db.get_connection()
+        # The unvoted-queue queries run here
+        self.memory = sqlite3.connect(":memory:")
+        self.data_version = None
+        self.games_signature = None
+        self.event_seq = 0
+        self.load()
+        
+    def __getattr__(self, name):
+        if name in self.PASSTHROUGH:
+            return getattr(self.db, name)
+        raise AttributeError(f"SessionCache does not provide {name}")
+        
+    def load(self):
+        """(Re)build the in-memory copy of the games and the user's state"""
+        started = time.perf_counter()
+        self.data_version = self.shared.execute("PRAGMA data_version").fetchone()[0]
+        self.games_signature = self.read_games_signature()
+        
+        cursor = self.memory.cursor()
+        for table in ("games", "developers", "game_developers", "votes", "queue_reservations"):
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute("ATTACH DATABASE ? AS shared", (self.db_path,))
+        try:
+            # Only the filter's batches, when it names any
+            batch_condition, params = "", []
+            if self.game_filter.batch_names:
+                batch_condition = f"WHERE batch_name IN ({', '.join('?' for _ in self.game_filter.batch_names)})"
+                params = list(self.game_filter.batch_names)
+            cursor.execute(f"CREATE TABLE games AS SELECT * FROM shared.games {batch_condition}", params)
+            cursor.execute("CREATE TABLE developers AS SELECT * FROM shared.developers")
+            cursor.execute('''
+                CREATE TABLE game_developers AS
+                SELECT gd.* FROM shared.game_developers gd JOIN games g ON g.id = gd.game_id
+            ''')
+            self.memory.commit()
+        finally:
+            cursor.execute("DETACH DATABASE shared")
+            
+        cursor.executescript('''
+            CREATE UNIQUE INDEX idx_games_id ON games(id);
+            CREATE INDEX idx_games_release ON games(release_date_iso, id);
+            CREATE INDEX idx_game_developers_game ON game_developers(game_id, developer_id);
+            CREATE INDEX idx_game_developers_developer ON game_developers(developer_id, game_id);
+            CREATE UNIQUE INDEX idx_developers_id ON developers(id);
+            CREATE TABLE votes (game_id INTEGER, user_name TEXT, vote BOOLEAN, PRIMARY KEY (game_id, user_name));
+            CREATE TABLE queue_reservations (game_id INTEGER, user_name TEXT, session_id TEXT, lease_expires REAL,
+                                             PRIMARY KEY (game_id, user_name));
+        ''')
+        self.sync_user_state()
+        game_count = cursor.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        print(f"Session cache loaded {game_count} games in {(time.perf_counter() - started) * 1000:.0f} ms")
+        
+    def read_games_signature(self):
+        # Cheap change marker for the games table: the highest id and the catalog total,
+        # plus the decision rules, which re-decide whole batches without a vote event
+        return self.shared.execute(
+            "SELECT (SELECT MAX(id) FROM games), (SELECT COALESCE(SUM(game_count), 0) FROM batches), "
+            "(SELECT group_concat(batch_name || ':' || COALESCE(yes_quorum, '') || ':' || "
+            "COALESCE(no_quorum, '') || ':' || COALESCE(majority_of, ''), ',') FROM decision_rules)"
+        ).fetchone()
+        
+    def sync_user_state(self):
+        """Copy the user's votes, the active reservations and which games the team has
+        decided; later changes are applied by sync_changes"""
+        self.event_seq = self.shared.execute("SELECT COALESCE(MAX(seq), 0) FROM vote_events").fetchone()[0]
+        votes = self.shared.execute(
+            "SELECT game_id, user_name, vote FROM votes WHERE user_name = ?", (self.user_name,)
+        ).fetchall()
+        reservations = self.shared.execute(
+            "SELECT game_id, user_name, session_id, lease_expires FROM queue_reservations "
+            "WHERE user_name = ? AND lease_expires > ?", (self.user_name, time.time())
+        ).fetchall()
+        decided = self.shared.execute(
+            "SELECT decided, id FROM games WHERE decided IN (1, -1)"
+        ).fetchall()
+        cursor = self.memory.cursor()
+        cursor.execute("UPDATE games SET decided = 0 WHERE decided != 0")
+        cursor.executemany("UPDATE games SET decided = ? WHERE id = ?", decided)
+        cursor.execute("DELETE FROM votes")
+        cursor.execute("DELETE FROM queue_reservations")
+        cursor.executemany("INSERT INTO votes VALUES (?, ?, ?)", votes)
+        cursor.executemany("INSERT INTO queue_reservations VALUES (?, ?, ?, ?)", reservations)
+        self.memory.commit()
+        
+    def sync_changes(self):
+        """Apply the vote events past the last one seen and re-read the active reservations
+
+        Votes by anyone can decide a game, so the decided flag is re-read for every game
+        in the new events; the user's own events update the votes copy. Reservations have
+        no change log, but only the user's active leases are read.
+        """
+        events = self.shared.execute(
+            "SELECT seq, game_id, user_name, vote FROM vote_events WHERE seq > ? ORDER BY seq",
+            (self.event_seq,)
+        ).fetchall()
+        reservations = self.shared.execute(
+            "SELECT game_id, user_name, session_id, lease_expires FROM queue_reservations "
+            "WHERE user_name = ? AND lease_expires > ?", (self.user_name, time.time())
+        ).fetchall()
+        decided = []
+        if events:
+            self.event_seq = events[-1][0]
+            decided = self.shared.execute(
+                "SELECT decided, id FROM games WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(sorted({game_id for _, game_id, _, _ in events})),)
+            ).fetchall()
+        cursor = self.memory.cursor()
+        cursor.executemany("UPDATE games SET decided = ? WHERE id = ?", decided)
+        cursor.executemany("INSERT OR REPLACE INTO votes VALUES (?, ?, ?)",
+                           [(game_id, user_name, bool(vote)) for _, game_id, user_name, vote in events
+                            if user_name == self.user_name])
+        cursor.execute("DELETE FROM queue_reservations")
+        cursor.executemany("INSERT INTO queue_reservations VALUES (?, ?, ?, ?)", reservations)
+        self.memory.commit()
+        
+    def refresh_if_changed(self):
+        """Catch up when another connection has committed since the last check"""
+        version = self.shared.execute("PRAGMA data_version").fetchone()[0]
+        if version == self.data_version:
+            return False
+        self.data_version = version
+        if self.read_games_signature() != self.games_signature:
+            self.load()
+        else:
+            self.sync_changes()
+        return True
+        
+    def fetch_unvoted_games(self, user_name, count, game_filter=None, after=None):
+        self.refresh_if_changed()
+        return self.db._select_unvoted_games(self.memory.cursor(), user_name, count, game_filter, after)
+        
+    def claim_unvoted_games(self, user_name, session_id, count, game_filter=None, after=None,
+                            lease_seconds=900):
+        """Pick candidates from memory and reserve them in the shared database"""
+        self.refresh_if_changed()
+        games = []
+        for attempt in range(2):
+            candidates = self.db._select_unvoted_games(
+                self.memory.cursor(), user_name, count - len(games), game_filter, after
+            )
+            if not candidates:
+                break
+            reserved = set(self.db.reserve_games(user_name, session_id, [game['id'] for game in candidates],
+                                                 lease_seconds, conn=self.shared))
+            lease_expires = time.time() + lease_seconds
+            self.memory.executemany("INSERT OR REPLACE INTO queue_reservations VALUES (?, ?, ?, ?)",
+                                    [(game_id, user_name, session_id, lease_expires) for game_id in reserved])
+            self.memory.commit()
+            games.extend(game for game in candidates if game['id'] in reserved)
+            if len(reserved) == len(candidates):
+                break
+            # Another session voted on or claimed some candidates, so the copy is stale
+            self.sync_changes()
+        return games
+        
+    def reserve_games(self, user_name, session_id, game_ids, lease_seconds=900):
+        reserved = self.db.reserve_games(user_name, session_id, game_ids, lease_seconds, conn=self.shared)
+        lease_expires = time.time() + lease_seconds
+        self.memory.executemany("INSERT OR REPLACE INTO queue_reservations VALUES (?, ?, ?, ?)",
+                                [(game_id, user_name, session_id, lease_expires) for game_id in reserved])
+        self.memory.commit()
+        return reserved
+        
+    def record_vote(self, game_id, user_name, value, progress=None, timing=None):
+        self.db.record_vote(game_id, user_name, value, progress, timing, conn=self.shared)
+        self.memory.execute("INSERT OR REPLACE INTO votes VALUES (?, ?, ?)", (game_id, user_name, bool(value)))
+        self.memory.execute("DELETE FROM queue_reservations WHERE game_id = ? AND user_name = ?", (game_id, user_name))
+        self.memory.commit()
+        return True
+        
+    def record_votes(self, user_name, votes, timing=None):
+        recorded = self.db.record_votes(user_name, votes, timing, conn=self.shared)
+        self.memory.executemany("INSERT OR REPLACE INTO votes VALUES (?, ?, ?)",
+                                [(game_id, user_name, bool(value)) for game_id, value in votes])
+        self.memory.executemany("DELETE FROM queue_reservations WHERE game_id = ? AND user_name = ?",
+                                [(game_id, user_name) for game_id, _ in votes])
+        self.memory.commit()
+        return recorded
+        
+    def release_reservations(self, session_id):
+        released = self.db.release_reservations(session_id, conn=self.shared)
+        self.memory.execute("DELETE FROM queue_reservations WHERE session_id = ?", (session_id,))
+        self.memory.commit()
+        return released
+        
+    def close(self):
+        self.memory.close()
+        self.shared.close()
+
+class DatabaseMaintenance:
+    """Runs ANALYZE, PRAGMA optimize, incremental vacuum and integrity checks in the background
+
+    Tasks run on their own thread and connection, only after the session has been idle
+    for a while (or when forced), and their last run time is recorded in the shared
+    maintenance_log table so several clients on one file do not repeat the same work.
+    """
+    # Task name -> minimum seconds between runs
+    DEFAULT_INTERVALS = {
+        "optimize": 6 * 3600,
+        "incremental_vacuum": 24 * 3600,
+        "analyze": 7 * 24 * 3600,
+        "quick_check": 7 * 24 * 3600,
+    }
+    VACUUM_PAGES_PER_STEP = 1000
+    VACUUM_MIN_FREE_FRACTION = 0.05
+
+    def __init__(self, db, idle_seconds=120, poll_seconds=30, intervals=None, on_result=None):
+        self.db = db
+        self.idle_seconds = idle_seconds
+        self.poll_seconds = poll_seconds
+        self.intervals = dict(self.DEFAULT_INTERVALS)
+        if intervals:
+            self.intervals.update(intervals)
+        self.on_result = on_result
+        self.last_activity = time.time()
+        self._stop_event = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def note_activity(self):
+        """Called from the swipe loop so maintenance never competes with voting"""
+        self.last_activity = time.time()
+
+    def is_idle(self):
+        return time.time() - self.last_activity >= self.idle_seconds
+
+    def _run(self):
+        while not self._stop_event.wait(self.poll_seconds):
+            if self.is_idle():
+                try:
+                    self.run_due_tasks()
+                except Exception as e:
+                    print(f"Maintenance error: {e}")
+
+    def run_in_background(self, tasks=None, force=True, callback=None):
+        """Run tasks now on a separate thread (used by the maintenance dialog)"""
+        def worker():
+            results = self.run_due_tasks(tasks=tasks, force=force)
+            if callback:
+                callback(results)
+        threading.Thread(target=worker, name="db-maintenance-now", daemon=True).start()
+
+    def run_due_tasks(self, tasks=None, force=False):
+        """Run every task whose interval has elapsed; returns {task: result}"""
+        results = {}
+        if not self._run_lock.acquire(blocking=False):
+            return results
+        try:
+            for task in tasks or list(self.intervals):
+                if self._stop_event.is_set() and not force:
+                    break
+                if not force and not self.is_idle():
+                    break
+                if not self._claim_task(task, force):
+                    continue
+                started = time.time()
+                try:
+                    result = self.run_task(task)
+                except sqlite3.Error as e:
+                    result = f"error: {e}"
+                self._record_result(task, time.time() - started, result)
+                results[task] = result
+                print(f"Maintenance task {task}: {result}")
+                if self.on_result:
+                    self.on_result(task, result)
+        finally:
+            self._run_lock.release()
+        return results
+
+    def _claim_task(self, task, force):
+        """Atomically mark a due task as started so other clients skip it"""
+        conn = self.db.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            cursor.execute("SELECT last_run FROM maintenance_log WHERE task = ?", (task,))
+            row = cursor.fetchone()
+            now = time.time()
+            if not force and row and now - row[0] < self.intervals.get(task, 0):
+                conn.rollback()
+                return False
+            cursor.execute('''
+                INSERT INTO maintenance_log (task, last_run) VALUES (?, ?)
+                ON CONFLICT(task) DO UPDATE SET last_run = excluded.last_run
+            ''', (task, now))
+            conn.commit()
+            return True
+        except sqlite3.OperationalError as e:
+            # Busy database: someone is voting or another client is maintaining it
+            print(f"Skipping maintenance task {task}: {e}")
+            return False
+        finally:
+            conn.close()
+
+    def _record_result(self, task, duration, result):
+        try:
+            with self.db.get_connection() as conn:
+                conn.execute(
+                    "UPDATE maintenance_log SET duration = ?, result = ? WHERE task = ?",
+                    (duration, str(result), task)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Could not record maintenance result for {task}: {e}")
+
+    def run_task(self, task):
+        conn = self.db.get_connection()
+        try:
+            conn.isolation_level = None
+            cursor = conn.cursor()
+            if task == "optimize":
+                cursor.execute("PRAGMA optimize")
+                return "ok"
+            if task == "analyze":
+                cursor.execute("ANALYZE")
+                return "ok"
+            if task == "quick_check":
+                rows = cursor.execute("PRAGMA quick_check").fetchall()
+                return "ok" if rows == [("ok",)] else "; ".join(row[0] for row in rows[:10])
+            if task == "integrity_check":
+                rows = cursor.execute("PRAGMA integrity_check").fetchall()
+                return "ok" if rows == [("ok",)] else "; ".join(row[0] for row in rows[:10])
+            if task == "incremental_vacuum":
+                return self._incremental_vacuum(cursor)
+            raise ValueError(f"Unknown maintenance task: {task}")
+        finally:
+            conn.close()
+
+    def _incremental_vacuum(self, cursor):
+        """Release free pages in small steps so each write lock is held only briefly"""
+        if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return "skipped: auto_vacuum is not INCREMENTAL"
+        page_count = cursor.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+        if not page_count or freelist_count / page_count < self.VACUUM_MIN_FREE_FRACTION:
+            return f"skipped: {freelist_count} free pages"
+            
+        released = 0
+        while freelist_count > 0 and not self._stop_event.is_set():
+            # executescript steps the pragma to completion; execute() would free a single page
+            cursor.executescript(f"PRAGMA incremental_vacuum({self.VACUUM_PAGES_PER_STEP})")
+            remaining = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+            released += freelist_count - remaining
+            if remaining >= freelist_count:
+                break
+            freelist_count = remaining
+            time.sleep(0.05)  # Let voters in between steps
+        return f"released {released} pages"
+
+class VotingServerError(Exception):
+    """Raised when the voting server cannot be reached or rejects a request"""
+
+class VotingServer:
+    """Owns the database through DatabaseManager and serves it as a small HTTP/JSON API
+
+    All database work runs on a single executor thread, so writes from every client are
+    serialized in this one process instead of contending for locks on a shared file.
+    """
+    MAX_BODY_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, db, host="127.0.0.1", port=8765, maintenance=None):
+        self.db = db
+        self.host = host
+        self.port = port
+        self.maintenance = maintenance
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._server = None
+        self.routes = {
+            ("GET", "/health"): self.handle_health,
+            ("GET", "/batches"): self.handle_batches,
+            ("POST", "/import"): self.handle_import,
+            ("GET", "/next-unvoted"): self.handle_next_unvoted,
+            ("POST", "/claim"): self.handle_claim,
+            ("POST", "/reserve"): self.handle_reserve,
+            ("POST", "/release"): self.handle_release,
+            ("POST", "/vote"): self.handle_vote,
+            ("POST", "/votes"): self.handle_votes,
+            ("GET", "/search"): self.handle_search,
+            ("GET", "/stats"): self.handle_stats,
+            ("GET", "/export"): self.handle_export,
+            ("POST", "/export/ack"): self.handle_export_ack,
+        }
+
+    # Route handlers run on the executor thread and return JSON-serializable data
+
+    def handle_health(self, query, body):
+        return {"status": "ok", "database": os.path.basename(self.db.db_path)}
+
+    def handle_batches(self, query, body):
+        return {"batches": [list(row) for row in self.db.get_batch_catalog(query["user"])]}
+
+    def handle_import(self, query, body):
+        imported_count, duplicate_count = self.db.import_games(body["games"], body["batch_name"])
+        return {"imported": imported_count, "duplicates": duplicate_count}
+
+    def handle_next_unvoted(self, query, body):
+        count = min(int(query.get("count", 10)), 500)
+        game_filter = GameFilter.from_dict(json.loads(query["filter"])) if query.get("filter") else None
+        after = json.loads(query["after"]) if query.get("after") else None
+        return {"games": self.db.fetch_unvoted_games(query["user"], count, game_filter, after)}
+
+    def handle_claim(self, query, body):
+        game_filter = GameFilter.from_dict(body["filter"]) if body.get("filter") else None
+        games = self.db.claim_unvoted_games(
+            body["user"], body["session_id"], min(int(body.get("count", 10)), 500),
+            game_filter, body.get("after"), lease_seconds=float(body.get("lease_seconds", 900))
+        )
+        return {"games": games}
+
+    def handle_reserve(self, query, body):
+        game_ids = [int(game_id) for game_id in body["game_ids"]]
+        reserved = self.db.reserve_games(body["user"], body["session_id"], game_ids,
+                                         lease_seconds=float(body.get("lease_seconds", 900)))
+        return {"reserved": reserved}
+
+    def handle_release(self, query, body):
+        return {"released": self.db.release_reservations(body["session_id"])}
+
+    def handle_vote(self, query, body):
+        if self.maintenance:
+            self.maintenance.note_activity()
+        progress = body.get("progress")
+        timing = body.get("timing")
+        recorded = self.db.record_vote(
+            body["game_id"], body["user"], body["vote"],
+            progress=tuple(progress) if progress else None,
+            timing=tuple(timing) if timing else None
+        )
+        return {"recorded": recorded}
+
+    def handle_votes(self, query, body):
+        if self.maintenance:
+            self.maintenance.note_activity()
+        timing = body.get("timing")
+        recorded = self.db.record_votes(
+            body["user"], [(game_id, vote) for game_id, vote in body["votes"]],
+            timing=tuple(timing) if timing else None
+        )
+        return {"recorded": recorded}
+
+    def handle_search(self, query, body):
+        limit = min(int(query.get("limit", 50)), 500)
+        return {"games": self.db.search_games(query.get("q", ""), query["user"], limit)}
+
+    def handle_stats(self, query, body):
+        since = float(query["since"]) if query.get("since") else None
+        return self.db.get_swipe_stats(since)
+
+    def handle_export(self, query, body):
+        votes, high_seq = self.db.fetch_vote_events(
+            query["consumer"], user_name=query.get("user"),
+            yes_only=query.get("yes_only", "1") == "1"
+        )
+        return {"votes": votes, "high_seq": high_seq}
+
+    def handle_export_ack(self, query, body):
+        self.db.set_export_watermark(body["consumer"], body["high_seq"])
+        return {"consumer": body["consumer"], "high_seq": body["high_seq"]}
 
-    def initialize_database(self):
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Create games table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS games (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    developers TEXT,
-                    release_date TEXT,
-                    steam_page_url TEXT NOT NULL,
-                    batch_name TEXT NOT NULL,
-                    UNIQUE(steam_page_url, batch_name)
-                )
-            ''')
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Pick up the real port when started with port 0 (tests on localhost)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"Voting server for {self.db.db_path} listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        if self._server:
+            self._server.close()
+        self.executor.shutdown(wait=True)
+
+    def run(self):
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            print("Voting server stopped")
+        finally:
+            self.close()
+
+    async def _handle_connection(self, reader, writer):
+        status, payload = 500, {"error": "internal error"}
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            method, target, _ = request_line.split(" ", 2)
             
-            # Create votes table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS votes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    game_id INTEGER NOT NULL,
-                    user_name TEXT NOT NULL,
-                    vote BOOLEAN NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    exported BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (game_id) REFERENCES games(id),
-                    UNIQUE(game_id, user_name)
-                )
-            ''')
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+                
+            length = int(headers.get("content-length", 0))
+            if length > self.MAX_BODY_BYTES:
+                raise ValueError("request body too large")
+            raw_body = await reader.readexactly(length) if length else b""
+            body = json.loads(raw_body) if raw_body else {}
+            if not isinstance(body, dict):
+                raise ValueError("request body must be a JSON object")
             
-            # Create progress table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS progress (
-                    user_name TEXT NOT NULL,
-                    batch_name TEXT NOT NULL,
-                    current_index INTEGER NOT NULL DEFAULT 0,
-                    PRIMARY KEY (user_name, batch_name)
-                )
-            ''')
+            url = urllib.parse.urlsplit(target)
+            query = dict(urllib.parse.parse_qsl(url.query))
+            handler = self.routes.get((method, url.path))
+            if handler is None:
+                status, payload = 404, {"error": f"no route for {method} {url.path}"}
+            else:
+                loop = asyncio.get_running_loop()
+                payload = await loop.run_in_executor(self.executor, handler, query, body)
+                status = 200
+        except (KeyError, ValueError, TypeError) as e:
+            status, payload = 400, {"error": f"bad request: {e}"}
+        except sqlite3.OperationalError as e:
+            status, payload = 503, {"error": str(e)}
+        except sqlite3.Error as e:
+            status, payload = 500, {"error": str(e)}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            # Every request gets an answer; the 500 payload is set up above
+            print(f"Error handling request: {e!r}")
             
-            conn.commit()
+        data = json.dumps(payload).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error",
+                  503: "Service Unavailable"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + data
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
 
-    def migrate_database(self):
-        """Perform any needed database migrations for schema updates"""
-        print("Running database migrations...")
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Check if exported column exists in votes table
-            cursor.execute("PRAGMA table_info(votes)")
-            columns = [row[1] for row in cursor.fetchall()]
-            print(f"Current columns in votes table: {columns}")
+class RemoteDatabaseManager:
+    """Client for VotingServer offering the DatabaseManager methods the swipe UI relies on"""
+    is_remote = True
+    IMPORT_CHUNK_SIZE = 5000
+
+    def __init__(self, server_url, timeout=10):
+        self.server_url = server_url.rstrip("/")
+        self.db_path = self.server_url
+        self.timeout = timeout
+
+    def _request(self, method, path, query=None, body=None):
+        url = self.server_url + path
+        if query:
+            url += "?" + urllib.parse.urlencode(query)
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(url, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", str(e))
+            except ValueError:
+                message = str(e)
+            raise VotingServerError(f"{method} {path} failed: {message}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise VotingServerError(f"Could not reach voting server at {self.server_url}: {e}") from e
+
+    def check_connection(self):
+        return self._request("GET", "/health")
+
+    def get_batch_catalog(self, user_name):
+        return [tuple(row) for row in self._request("GET", "/batches", {"user": user_name})["batches"]]
+
+    def import_games(self, rows, batch_name, processes=None):
+        # Parsing happens on the server; processes is accepted for interface compatibility
+        fields = ('name', 'developers', 'release_date', 'steam_page_url')
+        imported_count = duplicate_count = 0
+        chunk = []
+        for row in rows:
+            chunk.append({field: row[field] for field in fields})
+            if len(chunk) >= self.IMPORT_CHUNK_SIZE:
+                result = self._request("POST", "/import", body={"batch_name": batch_name, "games": chunk})
+                imported_count += result["imported"]
+                duplicate_count += result["duplicates"]
+                chunk = []
+        if chunk:
+            result = self._request("POST", "/import", body={"batch_name": batch_name, "games": chunk})
+            imported_count += result["imported"]
+            duplicate_count += result["duplicates"]
+        return imported_count, duplicate_count
+
+    def fetch_unvoted_games(self, user_name, count, game_filter=None, after=None):
+        query = {"user": user_name, "count": count}
+        if game_filter:
+            query["filter"] = json.dumps(game_filter.to_dict())
+        if after:
+            query["after"] = json.dumps({"id": after["id"], "release_date_iso": after.get("release_date_iso")})
+        return self._request("GET", "/next-unvoted", query)["games"]
+
+    def claim_unvoted_games(self, user_name, session_id, count, game_filter=None, after=None,
+                            lease_seconds=900):
+        body = {"user": user_name, "session_id": session_id, "count": count,
+                "filter": game_filter.to_dict() if game_filter else None,
+                "after": {"id": after["id"], "release_date_iso": after.get("release_date_iso")} if after else None,
+                "lease_seconds": lease_seconds}
+        return self._request("POST", "/claim", body=body)["games"]
+
+    def reserve_games(self, user_name, session_id, game_ids, lease_seconds=900):
+        body = {"user": user_name, "session_id": session_id, "game_ids": list(game_ids),
+                "lease_seconds": lease_seconds}
+        return self._request("POST", "/reserve", body=body)["reserved"]
+
+    def release_reservations(self, session_id):
+        return self._request("POST", "/release", body={"session_id": session_id})["released"]
+
+    def record_vote(self, game_id, user_name, value, progress=None, timing=None):
+        body = {"game_id": game_id, "user": user_name, "vote": bool(value),
+                "progress": list(progress) if progress else None,
+                "timing": list(timing) if timing else None}
+        return self._request("POST", "/vote", body=body)["recorded"]
+
+    def record_votes(self, user_name, votes, timing=None):
+        body = {"user": user_name, "votes": [[game_id, bool(value)] for game_id, value in votes],
+                "timing": list(timing) if timing else None}
+        return self._request("POST", "/votes", body=body)["recorded"]
+
+    def search_games(self, text, user_name, limit=50):
+        return self._request("GET", "/search", {"q": text, "user": user_name, "limit": limit})["games"]
+
+    def get_swipe_stats(self, since=None):
+        return self._request("GET", "/stats", {"since": since} if since else None)
+
+    def fetch_vote_events(self, consumer, user_name=None, yes_only=False):
+        query = {"consumer": consumer, "yes_only": "1" if yes_only else "0"}
+        if user_name:
+            query["user"] = user_name
+        result = self._request("GET", "/export", query)
+        return result["votes"], result["high_seq"]
+
+    def fetch_new_yes_votes(self, user_name):
+        return self.fetch_vote_events(f"yes_export:{user_name}", user_name=user_name, yes_only=True)
+
+    def set_export_watermark(self, consumer, last_seq):
+        self._request("POST", "/export/ack", body={"consumer": consumer, "high_seq": last_seq})
+
+class SessionRecorder:
+    """Appends the actions of a swipe session to a JSON Lines trace for later replay
+
+    Every line is {"t": seconds since the session started, "action": ..., ...}.
+    Actions are "swipe" (with the filter), "vote", "shown" (click-to-next-page
+    latency) and "stop".
+    """
+    def __init__(self, trace_path):
+        os.makedirs(os.path.dirname(os.path.abspath(trace_path)), exist_ok=True)
+        self.trace_path = trace_path
+        self.started = time.perf_counter()
+        self.file = open(trace_path, 'w', encoding='utf-8')
+        
+    def record(self, action, **fields):
+        if self.file is None:
+            return
+        event = {"t": round(time.perf_counter() - self.started, 4), "action": action}
+        event.update(fields)
+        self.file.write(json.dumps(event) + "\n")
+        self.file.flush()
+        
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def load_session_trace(trace_path):
+    """Read a trace written by SessionRecorder"""
+    with open(trace_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class StubWebDriver:
+    """Stand-in for a Selenium WebDriver that only simulates page load time
+
+    get() sleeps page_load_ms plus up to jitter_ms, and raises TimeoutException
+    like a real driver when that exceeds the page load timeout.
+    """
+    def __init__(self, page_load_ms=0, jitter_ms=0, seed=None):
+        self.page_load_ms = page_load_ms
+        self.jitter_ms = jitter_ms
+        self.random = random.Random(seed)
+        self.page_load_timeout = None
+        self.current_url = None
+        self.pages_loaded = 0
+        self.closed = False
+        
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeout = seconds
+        
+    @property
+    def window_handles(self):
+        if self.closed:
+            raise WebDriverException("invalid session id")
+        return ["stub"]
+        
+    def get(self, url):
+        if self.closed:
+            raise WebDriverException("invalid session id")
+        delay = (self.page_load_ms + self.random.uniform(0, self.jitter_ms)) / 1000
+        if self.page_load_timeout is not None and delay > self.page_load_timeout:
+            time.sleep(self.page_load_timeout)
+            raise TimeoutException(f"Stub page load of {url} exceeded {self.page_load_timeout}s")
+        time.sleep(delay)
+        self.current_url = url
+        self.pages_loaded += 1
+        
+    def find_element(self, by, value):
+        return (by, value)
+        
+    def maximize_window(self):
+        pass
+        
+    def quit(self):
+        self.current_url = None
+        self.closed = True
+
+class PageViewer:
+    """Shows a game's store page; subclasses decide how
+
+    open() is called for every game shown, prefetch() with the next game in the
+    queue, close() when swiping ends or the viewer is switched. open() returns False
+    when the page could not be shown yet.
+    """
+    name = "none"
+    
+    def open(self, url):
+        pass
+        
+    def prefetch(self, url):
+        pass
+        
+    def close(self):
+        pass
+
+class NullViewer(PageViewer):
+    """Shows nothing; for benchmarks and swiping on name/developer alone"""
+    name = "none"
+
+class BrowserProfile:
+    """Settings that make each Selenium page load cheaper
+
+    page_load_strategy "eager" returns once the DOM is ready, "none" right away,
+    "normal" after every subresource. blocked_assets picks groups from
+    BLOCKED_URL_PATTERNS. profile_dir keeps cache and cookies across sessions
+    (None = a fresh profile each time). skip_age_gate pre-sets Steam's age
+    check cookies.
+    """
+    BLOCKED_URL_PATTERNS = {
+        "video": ["*.webm", "*.mp4", "*.m4s", "*.m3u8", "*.mpd"],
+        "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf"],
+        "trackers": ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+                     "*facebook.net*", "*hotjar.com*"],
+    }
+    AGE_GATE_COOKIES = {"birthtime": "283993201", "lastagecheckage": "1-0-1979",
+                        "wants_mature_content": "1", "mature_content": "1"}
+    
+    def __init__(self, page_load_strategy="eager", blocked_assets=(), profile_dir=None, skip_age_gate=True):
+        if page_load_strategy not in ("normal", "eager", "none"):
+            raise ValueError(f"Unknown page load strategy: {page_load_strategy}")
+        self.page_load_strategy = page_load_strategy
+        self.blocked_assets = [group for group in blocked_assets if group in self.BLOCKED_URL_PATTERNS]
+        self.profile_dir = profile_dir
+        self.skip_age_gate = skip_age_gate
+        
+    @classmethod
+    def from_config(cls, config, browser_name):
+        profile_dir = None
+        if config.get("persistent_browser_profile", True):
+            base_dir = config.get("browser_profile_dir") or os.path.join(
+                os.path.dirname(os.path.abspath(sys.argv[0])), "browser_profile")
+            profile_dir = os.path.join(base_dir, browser_name.lower())
+        return cls(
+            page_load_strategy=config.get("page_load_strategy", "eager"),
+            blocked_assets=config.get("blocked_assets", []),
+            profile_dir=profile_dir,
+            skip_age_gate=config.get("skip_age_gate", True),
+        )
+        
+    def blocked_url_patterns(self):
+        return [pattern for group in self.blocked_assets for pattern in self.BLOCKED_URL_PATTERNS[group]]
+        
+    def chromium_options(self, options, use_profile_dir=True):
+        """Fill in Chrome/Edge options; URL blocking is applied over CDP once the driver runs"""
+        options.page_load_strategy = self.page_load_strategy
+        if self.profile_dir and use_profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            options.add_argument(f"--user-data-dir={os.path.abspath(self.profile_dir)}")
+        if "video" in self.blocked_assets:
+            options.add_argument("--autoplay-policy=user-gesture-required")
+        return options
+        
+    def firefox_options(self, options, use_profile_dir=True):
+        """Fill in Firefox options; Firefox has no URL blocking API, so preferences are used instead"""
+        options.page_load_strategy = self.page_load_strategy
+        if self.profile_dir and use_profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            options.add_argument("-profile")
+            options.add_argument(os.path.abspath(self.profile_dir))
+        if "video" in self.blocked_assets:
+            options.set_preference("media.autoplay.default", 5)
+            options.set_preference("media.mediasource.enabled", False)
+        if "fonts" in self.blocked_assets:
+            options.set_preference("browser.display.use_document_fonts", 0)
+        if "trackers" in self.blocked_assets:
+            options.set_preference("privacy.trackingprotection.enabled", True)
+        return options
+        
+    def apply(self, driver, browser_name):
+        """Apply the settings that need a running driver"""
+        if browser_name in ("Chrome", "Edge"):
+            patterns = self.blocked_url_patterns()
+            if patterns:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            if self.skip_age_gate:
+                for name, value in self.AGE_GATE_COOKIES.items():
+                    driver.execute_cdp_cmd("Network.setCookie", {
+                        "name": name, "value": value, "domain": "store.steampowered.com", "path": "/"})
+        elif self.skip_age_gate:
+            # Cookies can only be added for the current domain; robots.txt is the lightest page there
+            driver.get("https://store.steampowered.com/robots.txt")
+            for name, value in self.AGE_GATE_COOKIES.items():
+                driver.add_cookie({"name": name, "value": value, "path": "/"})
+
+class SeleniumViewer(PageViewer):
+    """Automated Chrome, Firefox or Edge window driven through Selenium"""
+    name = "selenium"
+    
+    def __init__(self, browser_name="Chrome", driver_factory=None, profile=None,
+                 watchdog_interval=None, probe_timeout=2.0):
+        self.browser_name = browser_name
+        self.driver_factory = driver_factory
+        self.profile = profile or BrowserProfile()
+        self.driver = None
+        # With a watchdog_interval the driver is probed between page loads (and by open()
+        # after a failed load); one that is gone or does not answer within probe_timeout
+        # is replaced in the background, so swiping never waits on a dead browser
+        self.watchdog_interval = watchdog_interval
+        self.probe_timeout = probe_timeout
+        self.current_url = None
+        self.restarting = False
+        self.restarts = 0
+        # Held for every sequence of driver commands, so the watchdog never probes mid-load
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.watchdog = None
+        
+    def start(self):
+        if self.driver is not None:
+            return
+        if self.watchdog_interval and self.watchdog is None:
+            self.watchdog = threading.Thread(target=self.watch, name="browser-watchdog", daemon=True)
+            self.watchdog.start()
+        self.driver = self.launch()
+        
+    def launch(self):
+        """Start a new driver with the browser profile applied and return it"""
+        if self.driver_factory:
+            driver = self.driver_factory()
+        else:
+            try:
+                driver = self.create_driver()
+            except WebDriverException as e:
+                if not self.profile.profile_dir:
+                    raise
+                # Chrome/Edge refuse a profile directory that another running instance holds
+                print(f"Could not start {self.browser_name} with profile {self.profile.profile_dir}: {e}")
+                driver = self.create_driver(use_profile_dir=False)
+            try:
+                self.profile.apply(driver, self.browser_name)
+            except WebDriverException as e:
+                print(f"Could not apply fast browser profile: {e}")
+        driver.maximize_window()
+        return driver
+        
+    def create_driver(self, use_profile_dir=True):
+        if self.browser_name == "Chrome":
+            return webdriver.Chrome(options=self.profile.chromium_options(ChromeOptions(), use_profile_dir))
+        if self.browser_name == "Firefox":
+            return webdriver.Firefox(options=self.profile.firefox_options(FirefoxOptions(), use_profile_dir))
+        if self.browser_name == "Edge":
+            return webdriver.Edge(options=self.profile.chromium_options(EdgeOptions(), use_profile_dir))
+        raise ValueError(f"Unsupported browser choice: {self.browser_name}")
+        
+    def open(self, url):
+        self.current_url = url
+        if self.restarting:
+            return False  # The restarted browser shows the latest page once it is up
+        with self.lock:
+            if self.restarting:
+                return False
+            self.start()
+            try:
+                self.load(url)
+            except Exception:
+                # A slow page is fine; a dead or hung browser is replaced in the background
+                if self.watchdog_interval and not self.is_alive():
+                    print(f"{self.browser_name} is not responding, restarting it in the background")
+                    self.begin_restart()
+                raise
+        return True
+                
+    def load(self, url, driver=None):
+        driver = driver or self.driver
+        # Set a page load timeout to prevent hanging
+        driver.set_page_load_timeout(10)
+        driver.get(url)
+        
+        # Wait for the body element to appear (faster than waiting for full page load)
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        )
+        
+    def is_alive(self):
+        """True if the driver lists an open window within probe_timeout seconds"""
+        driver = self.driver
+        if driver is None:
+            return False
+        answers = []
+        
+        def probe():
+            try:
+                answers.append(bool(driver.window_handles))
+            except Exception:
+                answers.append(False)
+        # A hung driver would block the caller, so the probe runs on a throwaway thread
+        probe_thread = threading.Thread(target=probe, daemon=True)
+        probe_thread.start()
+        probe_thread.join(self.probe_timeout)
+        return bool(answers and answers[0])
+        
+    def watch(self):
+        """Watchdog loop: probe the driver every watchdog_interval seconds while idle"""
+        while not self.stop_event.wait(self.watchdog_interval):
+            if not self.lock.acquire(blocking=False):
+                continue  # A page is loading; open() checks failed loads itself
+            try:
+                if self.driver is not None and not self.restarting and not self.is_alive():
+                    print(f"{self.browser_name} is not responding, restarting it in the background")
+                    self.begin_restart()
+            finally:
+                self.lock.release()
+                
+    def begin_restart(self):
+        """Drop the current driver and start a new one on a background thread (hold self.lock)"""
+        old_driver, self.driver = self.driver, None
+        self.restarting = True
+        if old_driver is not None:
+            # quit() can hang on a stuck driver just like any other command
+            threading.Thread(target=self._quit_quietly, args=(old_driver,), daemon=True).start()
+        threading.Thread(target=self._restart, name="browser-restart", daemon=True).start()
+        
+    @staticmethod
+    def _quit_quietly(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error closing unresponsive browser: {e}")
             
-            # Add exported column if it doesn't exist
-            if 'exported' not in columns:
-                try:
-                    # For SQLite 3.20.0 and later:
-                    cursor.execute("""
-                        ALTER TABLE votes ADD COLUMN exported BOOLEAN DEFAULT 0
-                    """)
-                    print("Added 'exported' column to votes table")
-                    
-                    # Initialize all existing votes as not exported
-                    cursor.execute("UPDATE votes SET exported = 0")
-                    print(f"Updated {cursor.rowcount} existing votes to exported=0")
-                    
-                    conn.commit()
-                    
-                    # Verify the column was added
-                    cursor.execute("PRAGMA table_info(votes)")
-                    updated_columns = [row[1] for row in cursor.fetchall()]
-                    print(f"Updated columns in votes table: {updated_columns}")
-                    
-                except sqlite3.OperationalError as e:
-                    print(f"Migration error: {e}")
-                    
-                    # Alternative approach for older SQLite versions
+    def _restart(self):
+        """Launch and load the new driver without self.lock; only the swap takes the lock"""
+        started = time.perf_counter()
+        driver = None
+        try:
+            driver = self.launch()
+            shown = None
+            while not self.stop_event.is_set():
+                # Pages opened during the restart only moved current_url, so show the latest one
+                while self.current_url and shown != self.current_url:
+                    shown = self.current_url
                     try:
-                        print("Trying alternative migration approach...")
-                        
-                        # Create new table with the desired schema
-                        cursor.execute('''
-                            CREATE TABLE votes_new (
-                                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                game_id INTEGER NOT NULL,
-                                user_name TEXT NOT NULL,
-                                vote BOOLEAN NOT NULL,
-                                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                                exported BOOLEAN DEFAULT 0,
-                                FOREIGN KEY (game_id) REFERENCES games(id),
-                                UNIQUE(game_id, user_name)
-                            )
-                        ''')
-                        
-                        # Copy data from old table to new table
-                        cursor.execute('''
-                            INSERT INTO votes_new (id, game_id, user_name, vote, timestamp)
-                            SELECT id, game_id, user_name, vote, timestamp FROM votes
-                        ''')
-                        
-                        # Drop old table and rename new table
-                        cursor.execute('DROP TABLE votes')
-                        cursor.execute('ALTER TABLE votes_new RENAME TO votes')
-                        
-                        print("Successfully migrated votes table using alternative approach")
-                        conn.commit()
-                    except sqlite3.Error as e2:
-                        print(f"Alternative migration failed: {e2}")
-                        conn.rollback()
+                        self.load(shown, driver)
+                    except TimeoutException as e:
+                        print(f"Error loading web page after restart: {e}")
+                with self.lock:
+                    if self.stop_event.is_set():
+                        break  # close() ran during the reload; the finally block quits it
+                    # open() sets current_url before it checks restarting, so a page opened
+                    # after this check is loaded by open() itself
+                    if self.current_url == shown:
+                        self.driver, driver = driver, None
+                        self.restarting = False
+                        break
+            if driver is None:
+                self.restarts += 1
+                print(f"Restarted {self.browser_name} in {time.perf_counter() - started:.1f} s")
+        except Exception as e:
+            # The next open() starts a browser in the foreground instead
+            print(f"Could not restart {self.browser_name}: {e}")
+        finally:
+            if driver is not None:
+                self._quit_quietly(driver)  # Closed while restarting, or the reload failed
+            self.restarting = False
+        
+    def close(self):
+        # Under the lock, so a restart in progress cannot swap its driver in afterwards
+        with self.lock:
+            self.stop_event.set()
+            if self.driver:
+                self.driver.quit()
+                self.driver = None
+
+class SystemBrowserViewer(PageViewer):
+    """The user's own browser, reusing one window/tab where the browser allows it"""
+    name = "system"
+    
+    def __init__(self):
+        self.browser = webbrowser.get()
+        self.opened = False
+        
+    def open(self, url):
+        # new=0 asks for the same window; only the first page may open a new one.
+        # autoraise=False keeps the voting window in front.
+        self.browser.open(url, new=0 if self.opened else 1, autoraise=not self.opened)
+        self.opened = True
+
+class PreviewViewer(PageViewer):
+    """In-app text preview from Steam's appdetails API, cached on disk
+
+    Details are handed to on_preview as display text. prefetch() fetches the
+    next game on a background thread so most games show without waiting.
+    """
+    name = "preview"
+    
+    def __init__(self, on_preview, cache_dir, max_age_days=7, timeout=5, workers=1):
+        self.on_preview = on_preview
+        self.cache_dir = cache_dir
+        self.max_age_seconds = max_age_days * 86400
+        self.timeout = timeout
+        self.details = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        os.makedirs(cache_dir, exist_ok=True)
+        
+    def open(self, url):
+        try:
+            details = self.fetch_details(url)
+        except (OSError, ValueError) as e:
+            print(f"Error fetching store preview for {url}: {e}")
+            details = None
+        self.on_preview(self.format_details(details))
+        
+    def prefetch(self, url):
+        """Fetch a game's details in the background; returns a future of the details"""
+        def worker():
+            try:
+                return self.fetch_details(url)
+            except (OSError, ValueError) as e:
+                print(f"Error prefetching store preview for {url}: {e}")
+                return None
+        return self.executor.submit(worker)
+        
+    def close(self):
+        self.executor.shutdown(wait=False)
+        
+    def fetch_details(self, url):
+        """Return the appdetails data for a store URL (None if the URL has no app id)"""
+        match = STEAM_APP_ID_PATTERN.search(url or "")
+        if not match:
+            return None
+        app_id = match.group(1)
+        with self.lock:
+            if app_id in self.details:
+                return self.details[app_id]
+                
+        cache_path = os.path.join(self.cache_dir, f"{app_id}.json")
+        if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < self.max_age_seconds:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                details = json.load(f)
+        else:
+            query = urllib.parse.urlencode({"appids": app_id, "l": "english"})
+            with urllib.request.urlopen(f"{STEAM_APPDETAILS_URL}?{query}", timeout=self.timeout) as response:
+                entry = json.load(response).get(app_id) or {}
+            # Cache misses too, so unavailable apps are not fetched again
+            details = entry.get("data", {}) if entry.get("success") else {}
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(details, f)
+                
+        with self.lock:
+            self.details[app_id] = details
+        return details
+        
+    @staticmethod
+    def format_details(details):
+        if not details:
+            return "No store preview available for this game."
+        lines = []
+        description = html.unescape(re.sub(r"<[^>]+>", "", details.get("short_description", ""))).strip()
+        if description:
+            lines.append(description)
+        genres = ", ".join(genre.get("description", "") for genre in details.get("genres", []))
+        if genres:
+            lines.append(f"Genres: {genres}")
+        if details.get("is_free"):
+            lines.append("Price: Free")
+        elif details.get("price_overview"):
+            lines.append(f"Price: {details['price_overview'].get('final_formatted', '')}")
+        if details.get("metacritic"):
+            lines.append(f"Metacritic: {details['metacritic'].get('score')}")
+        platforms = [name.capitalize() for name, supported in details.get("platforms", {}).items() if supported]
+        if platforms:
+            lines.append(f"Platforms: {', '.join(platforms)}")
+        return "\n\n".join(lines)
+        
+    @staticmethod
+    def format_tile(details, max_length=140):
+        """Short store summary for a grid tile: genres, price and the start of the description"""
+        if not details:
+            return "No store preview"
+        facts = [genre.get("description", "") for genre in details.get("genres", [])[:2]]
+        if details.get("is_free"):
+            facts.append("Free")
+        elif details.get("price_overview"):
+            facts.append(details['price_overview'].get('final_formatted', ''))
+        description = html.unescape(re.sub(r"<[^>]+>", "", details.get("short_description", ""))).strip()
+        if len(description) > max_length:
+            description = description[:max_length].rsplit(" ", 1)[0] + "..."
+        return "\n".join(part for part in (" | ".join(fact for fact in facts if fact), description) if part)
+
+VIEWER_BACKENDS = [("Selenium browser", "selenium"), ("System browser", "system"),
+                   ("In-app preview", "preview"), ("No page", "none")]
+
+def generate_synthetic_database(db_path, game_count, batch_name="synthetic", seed=0):
+    """Fill a database with generated games for replay and benchmarking"""
+    rng = random.Random(seed)
+    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    studio_count = max(1, game_count // 20)
+    rows = [
+        {
+            'name': f"Synthetic Game {i}",
+            'developers': f"Studio {rng.randrange(studio_count)}",
+            'release_date': f"{rng.randint(1, 28)} {rng.choice(months)}, {rng.randint(2000, 2025)}",
+            'steam_page_url': f"https://store.steampowered.com/app/{1000000 + i}/",
+        }
+        for i in range(game_count)
+    ]
+    db = DatabaseManager(db_path)
+    imported, _ = db.import_games(rows, batch_name)
+    return db, imported
+
+class ScreenManager:
+    """Builds each screen once, stacked in the same grid cell, and switches by raising it"""
+    def __init__(self, container):
+        self.container = container
+        self.builders = {}
+        self.frames = {}
+        self.current = None
+        
+    def register(self, name, builder):
+        self.builders[name] = builder
+        
+    def show(self, name):
+        frame = self.frames.get(name)
+        if frame is None:
+            frame = tk.Frame(self.container, bg='#f0f0f0')
+            frame.grid(row=0, column=0, sticky="nsew")
+            frame.grid_rowconfigure(0, weight=1)
+            frame.grid_columnconfigure(0, weight=1)
+            self.builders[name](frame)
+            self.frames[name] = frame
+        frame.tkraise()
+        self.current = name
+        return frame
 
 class SteamGameVoter:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Steam Tinder")
-        self.root.geometry("500x400")
+        self.root.geometry("500x500")
         self.entries = []
         self.current_index = 0
         self.fieldnames = []
-        self.driver = None
+        self.viewer = None
         self.input_filename = ""
         self.process_completed = False
         self.user_name = getpass.getuser()  # Get current system username
         
-        # Initialize UI elements that might be accessed before creation
-        self.status_label = None
-        self.db_label = None
+        # Swipe state, set up front so the hot path needs no attribute checks
+        self.random_unvoted_mode = False
+        self.current_game = None
+        self.game_queue = []
+        self.game_filter = None
+        self.queue_cursor = None
+        self.session_id = None
+        self.swipe_db = None
+        self.merged_session = None
+        
+        # Grid swiping: the games on the current page, their tiles and the store preview cache
+        self.grid_games = []
+        self.grid_tiles = []
+        self.grid_previewer = None
+        self.grid_var = tk.StringVar()
+        
+        # Text shown by the screens; updating these is all a screen refresh takes
+        self.status_var = tk.StringVar(value="Ready")
+        self.db_var = tk.StringVar()
+        self.entry_var = tk.StringVar()
+        self.progress_var = tk.StringVar()
+        self.mode_var = tk.StringVar()
+        self.preview_var = tk.StringVar()
+        self.mode_label = None
         
         # Load configuration
         self.config = self.load_config()
         
         # Setup variables with values from config
         self.browser_var = tk.StringVar(value=self.config.get("browser", "Chrome"))
+        self.viewer_var = tk.StringVar(value=self.config.get("viewer", "selenium"))
         self.always_on_top_var = tk.BooleanVar(value=self.config.get("always_on_top", False))
         
         # Setup database
         self.db_path = self.config.get("database_path", os.path.join(os.path.dirname(os.path.abspath(__file__)), "steam_tinder.db"))
         self.db = None
+        self.maintenance = None
+        
+        # Optional action trace of swipe sessions (see SessionRecorder)
+        self.recorder = None
+        self.last_page_load_ms = None
+        
+        # When the current game was shown and its page became ready (for dwell statistics)
+        self.shown_at = None
+        self.page_ready_at = None
+        
+        # Screens are built on first use and kept for the lifetime of the window
+        self.root.configure(bg='#f0f0f0')
+        self.root.grid_rowconfigure(0, weight=1)
+        self.root.grid_columnconfigure(0, weight=1)
+        self.screens = ScreenManager(self.root)
+        self.screens.register("menu", self.build_menu_screen)
+        self.screens.register("swipe", self.build_swipe_screen)
+        self.screens.register("grid", self.build_grid_screen)
         
-        # Create initial UI for database/file selection
-        self.create_initial_ui()
+        # Show the initial UI for database/file selection
+        self.show_menu()
         
-        # Connect to database if path exists (after UI is created)
-        if os.path.exists(self.db_path):
+        # Connect to database (or voting server) if configured (after UI is created)
+        if self.config.get("server_url") or os.path.exists(self.db_path):
             self.ensure_db_connection()
 
     def load_config(self):
@@ -214,6 +3702,9 @@ class SteamGameVoter:
             if hasattr(self, 'browser_var'):
                 self.config["browser"] = self.browser_var.get()
                 
+            if hasattr(self, 'viewer_var'):
+                self.config["viewer"] = self.viewer_var.get()
+                
             if hasattr(self, 'always_on_top_var'):
                 self.config["always_on_top"] = self.always_on_top_var.get()
             
@@ -235,8 +3726,8 @@ class SteamGameVoter:
     def __del__(self):
         """Clean up resources when object is destroyed"""
         try:
-            if hasattr(self, 'driver') and self.driver:
-                self.driver.quit()
+            if hasattr(self, 'viewer') and self.viewer:
+                self.viewer.close()
                 
             if hasattr(self, 'db') and self.db:
                 self.save_progress()
@@ -247,12 +3738,20 @@ class SteamGameVoter:
         except Exception as e:
             print(f"Error during cleanup: {e}")
 
-    def create_initial_ui(self):
-        self.root.configure(bg='#f0f0f0')
-        self.root.grid_rowconfigure(0, weight=1)
-        self.root.grid_columnconfigure(0, weight=1)
+    def show_menu(self):
+        """Switch to the main menu"""
+        self.update_db_label()
+        self.screens.show("menu")
+        
+    def show_swipe_screen(self):
+        """Switch to the swipe screen, without a mode banner"""
+        self.screens.show("swipe")
+        self.mode_var.set("")
+        self.mode_label.place_forget()
+        self.preview_var.set("")
 
-        main_frame = tk.Frame(self.root, bg='#f0f0f0')
+    def build_menu_screen(self, screen):
+        main_frame = tk.Frame(screen, bg='#f0f0f0')
         main_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
         
         # Application title
@@ -264,10 +3763,8 @@ class SteamGameVoter:
         db_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
         
         # Show current database
-        db_path_display = os.path.basename(self.db_path) if self.db_path else "No database selected"
-        self.db_label = tk.Label(db_frame, text=f"Current Database: {db_path_display}", 
-                              bg='#f0f0f0', font=('Arial', 10))
-        self.db_label.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 5))
+        db_label = tk.Label(db_frame, textvariable=self.db_var, bg='#f0f0f0', font=('Arial', 10))
+        db_label.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 5))
         
         open_db_button = tk.Button(db_frame, text="Open Database", command=self.select_database,
                                   width=20, bg='#4CAF50', fg='white', font=('Arial', 10))
@@ -278,6 +3775,26 @@ class SteamGameVoter:
                                 width=20, bg='#4CAF50', fg='white', font=('Arial', 10))
         new_db_button.grid(row=1, column=1, padx=5, pady=5)
         
+        server_button = tk.Button(db_frame, text="Connect to Server", command=self.connect_to_server,
+                                  width=20, bg='#4CAF50', fg='white', font=('Arial', 10))
+        server_button.grid(row=2, column=0, padx=5, pady=5)
+        
+        search_button = tk.Button(db_frame, text="Search Games...", command=self.show_search_dialog,
+                                  width=20, bg='#4CAF50', fg='white', font=('Arial', 10))
+        search_button.grid(row=2, column=1, padx=5, pady=5)
+
+        dashboard_button = tk.Button(db_frame, text="Swipe Dashboard", command=self.show_swipe_dashboard,
+                                     width=20, bg='#4CAF50', fg='white', font=('Arial', 10))
+        dashboard_button.grid(row=3, column=0, padx=5, pady=5)
+        
+        grid_button = tk.Button(db_frame, text="Grid Swipe", command=self.swipe_grid,
+                                width=20, bg='#4CAF50', fg='white', font=('Arial', 10))
+        grid_button.grid(row=3, column=1, padx=5, pady=5)
+        
+        merge_pack_button = tk.Button(db_frame, text="Merge Swipe Pack...", command=self.merge_swipe_pack_with_dialog,
+                                      width=20, bg='#4CAF50', fg='white', font=('Arial', 10))
+        merge_pack_button.grid(row=4, column=0, padx=5, pady=5)
+        
         # CSV operations section
         csv_frame = tk.LabelFrame(main_frame, text="CSV Operations", padx=10, pady=10, bg='#f0f0f0')
         csv_frame.grid(row=2, column=0, sticky="ew", pady=(0, 10))
@@ -309,14 +3826,22 @@ class SteamGameVoter:
                               width=25, bg='#F44336', fg='white', font=('Arial', 10))
         wipe_button.grid(row=2, column=1, padx=5, pady=5)
         
+        maintenance_button = tk.Button(csv_frame, text="Database Maintenance", command=self.show_maintenance_dialog,
+                                       width=25, bg='#607D8B', fg='white', font=('Arial', 10))
+        maintenance_button.grid(row=3, column=0, padx=5, pady=5)
+        
+        filtered_button = tk.Button(csv_frame, text="Filtered Swipe...", command=self.select_filtered_swipe,
+                                    width=25, bg='#E91E63', fg='white', font=('Arial', 10))
+        filtered_button.grid(row=3, column=1, padx=5, pady=5)
+        
         # Exit button
         exit_button = tk.Button(main_frame, text="Exit", command=self.close_application,
                                width=10, bg='#f44336', fg='white', font=('Arial', 10))
         exit_button.grid(row=3, column=0, pady=(10, 0))
         
         # Status label
-        self.status_label = tk.Label(main_frame, text="Ready", bg='#f0f0f0', font=('Arial', 10))
-        self.status_label.grid(row=4, column=0, pady=(10, 0))
+        status_label = tk.Label(main_frame, textvariable=self.status_var, bg='#f0f0f0', font=('Arial', 10))
+        status_label.grid(row=4, column=0, pady=(10, 0))
         
         # Always on top
         always_on_top_check = tk.Checkbutton(main_frame, text="Keep this window in foreground", 
@@ -332,10 +3857,25 @@ class SteamGameVoter:
         
         if selected_db:
             self.db_path = selected_db
+            self.config["server_url"] = ""  # Talk to the file directly from now on
             self.db = DatabaseManager(self.db_path)
+            self.start_maintenance()
             self.update_db_label()
-            self.status_label.config(text=f"Connected to database: {os.path.basename(self.db_path)}")
-            messagebox.showinfo("Database Connected", f"Connected to: {os.path.basename(self.db_path)}")
+            self.status_var.set(f"Connected to database: {os.path.basename(self.db_path)}")
+            pack_info = self.db.get_pack_info()
+            if pack_info:
+                try:
+                    # The pack's previews make the in-app and grid previews work offline
+                    self.db.unpack_pack_previews(self.preview_cache_dir())
+                except OSError as e:
+                    print(f"Error unpacking swipe pack previews: {e}")
+                messagebox.showinfo(
+                    "Swipe Pack Opened",
+                    f"Opened the swipe pack of {pack_info['user_name']} ({', '.join(pack_info['batch_names'])}).\n\n"
+                    "Votes are kept in the pack until it is merged back with Merge Swipe Pack."
+                )
+            else:
+                messagebox.showinfo("Database Connected", f"Connected to: {os.path.basename(self.db_path)}")
             # Save the new database path to config
             self.save_config()
             
@@ -349,92 +3889,507 @@ class SteamGameVoter:
         
         if new_db_path:
             self.db_path = new_db_path
+            self.config["server_url"] = ""  # Talk to the file directly from now on
             self.db = DatabaseManager(self.db_path)
+            self.start_maintenance()
             self.update_db_label()
-            self.status_label.config(text=f"Created and connected to: {os.path.basename(self.db_path)}")
+            self.status_var.set(f"Created and connected to: {os.path.basename(self.db_path)}")
             messagebox.showinfo("Database Created", f"Created new database: {os.path.basename(self.db_path)}")
             # Save the new database path to config
             self.save_config()
             
+    def connect_to_server(self):
+        """Use a voting server instead of opening the database file directly"""
+        server_url = simpledialog.askstring(
+            "Voting Server", "Enter the voting server address:",
+            initialvalue=self.config.get("server_url") or "http://127.0.0.1:8765"
+        )
+        if not server_url:
+            return
+            
+        try:
+            remote_db = RemoteDatabaseManager(server_url)
+            remote_db.check_connection()
+        except VotingServerError as e:
+            messagebox.showerror("Server Error", str(e))
+            return
+            
+        if self.maintenance:
+            self.maintenance.stop()
+            self.maintenance = None
+        self.db = remote_db
+        self.config["server_url"] = remote_db.server_url
+        self.update_db_label()
+        self.status_var.set(f"Connected to voting server: {remote_db.server_url}")
+        self.save_config()
+
     def update_db_label(self):
         """Update the database label in the UI"""
-        if hasattr(self, 'db_label') and self.db_label:
-            db_path_display = os.path.basename(self.db_path) if self.db_path else "No database selected"
-            self.db_label.config(text=f"Current Database: {db_path_display}")
+        if self.db is not None and self.db.is_remote:
+            self.db_var.set(f"Current Database: server {self.db.server_url}")
+            return
+        db_path_display = os.path.basename(self.db_path) if self.db_path else "No database selected"
+        self.db_var.set(f"Current Database: {db_path_display}")
 
     def ensure_db_connection(self):
         """Ensure we have a valid database connection"""
         try:
-            if not hasattr(self, 'db') or self.db is None:
-                self.db = DatabaseManager(self.db_path)
+            if self.db is None:
+                server_url = self.config.get("server_url")
+                if server_url:
+                    remote_db = RemoteDatabaseManager(server_url)
+                    remote_db.check_connection()
+                    self.db = remote_db
+                else:
+                    self.db = DatabaseManager(self.db_path)
+                    self.start_maintenance()
                 self.update_db_label()
-                if hasattr(self, 'status_label') and self.status_label:
-                    self.status_label.config(text=f"Connected to database: {os.path.basename(self.db_path)}")
+                target = self.db.server_url if self.db.is_remote else os.path.basename(self.db_path)
+                self.status_var.set(f"Connected to database: {target}")
             return True
         except Exception as e:
             print(f"Database connection error: {e}")
             messagebox.showerror("Database Error", f"Could not connect to database: {e}")
             return False
 
-    def select_batch_from_db(self):
-        """Select an existing batch from the database to start swiping"""
+    def show_info(self, title, message):
+        """Show an informational message (the headless voter prints it instead)"""
+        messagebox.showinfo(title, message)
+        
+    def show_error(self, title, message):
+        """Show an error message (the headless voter prints it instead)"""
+        messagebox.showerror(title, message)
+
+    def require_local_database(self):
+        """Features that need the database file itself are not offered through the voting server"""
+        if self.db is not None and self.db.is_remote:
+            messagebox.showinfo(
+                "Not Available",
+                "This feature needs direct access to the database file and is not available "
+                "while connected to a voting server."
+            )
+            return False
+        return True
+
+    def start_maintenance(self):
+        """(Re)start the background maintenance scheduler for the current database"""
+        if self.maintenance:
+            self.maintenance.stop()
+            self.maintenance = None
+            
+        # The voting server maintains its own database
+        if not self.config.get("maintenance_enabled", True) or self.db.is_remote:
+            return
+            
+        self.maintenance = DatabaseMaintenance(
+            self.db,
+            idle_seconds=self.config.get("maintenance_idle_seconds", 120)
+        )
+        self.maintenance.start()
+
+    def show_maintenance_dialog(self):
+        """Show database size/fragmentation and let the user run maintenance now"""
         if not self.ensure_db_connection():
             messagebox.showerror("Error", "Please connect to a database first.")
             return
+        if not self.require_local_database():
+            return
             
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get all available batches from the database
-            cursor.execute("""
-                SELECT DISTINCT batch_name FROM games
-                ORDER BY batch_name
-            """)
+        maintenance = self.maintenance or DatabaseMaintenance(self.db)
+        
+        window = tk.Toplevel(self.root)
+        window.title("Database Maintenance")
+        window.geometry("480x460")
+        window.transient(self.root)
+        
+        report_text = tk.Text(window, width=60, height=16, font=('Courier', 9))
+        report_text.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+        
+        status_var = tk.StringVar(value="")
+        tk.Label(window, textvariable=status_var, font=('Arial', 10)).pack()
+        
+        def refresh():
+            report = self.db.get_storage_report()
+            lines = [
+                f"File size:       {report['file_size'] / 1048576:.1f} MB",
+                f"Pages:           {report['page_count']} x {report['page_size']} bytes",
+                f"Free pages:      {report['freelist_count']} ({report['fragmentation']:.1%}, "
+                f"{report['free_bytes'] / 1048576:.1f} MB reclaimable)",
+                f"Auto vacuum:     {report['auto_vacuum']}",
+                "",
+            ]
+            if report["tables"]:
+                lines.append("Largest tables/indexes:")
+                for name, size in list(report["tables"].items())[:8]:
+                    lines.append(f"  {name:<32} {size / 1024:>10.0f} KB")
+                lines.append("")
+            snapshots = self.db.list_snapshots(self.config.get("snapshot_dir"))
+            latest = snapshots[0]["created"].strftime('%Y-%m-%d %H:%M') if snapshots else "none"
+            lines.append(f"Snapshots:       {len(snapshots)} (latest: {latest})")
+            lines.append("")
+            lines.append("Last maintenance runs:")
+            for task, info in sorted(report["maintenance"].items()):
+                last_run = datetime.fromtimestamp(info["last_run"]).strftime('%Y-%m-%d %H:%M') if info["last_run"] else "never"
+                lines.append(f"  {task:<20} {last_run}  {info['result'] or ''}")
+            report_text.delete("1.0", tk.END)
+            report_text.insert(tk.END, "\n".join(lines))
+        
+        def run_tasks(tasks=None):
+            results = []
+            status_var.set("Running maintenance in the background...")
+            maintenance.run_in_background(tasks=tasks, callback=results.append)
             
-            batches = cursor.fetchall()
+            def check_done():
+                if not window.winfo_exists():
+                    return
+                if results:
+                    status_var.set("Maintenance finished: " + ", ".join(f"{k}={v}" for k, v in results[0].items()))
+                    refresh()
+                else:
+                    window.after(500, check_done)
+            window.after(500, check_done)
+        
+        def snapshot_now():
+            results = []
+            status_var.set("Creating snapshot in the background...")
+            self.db.create_snapshot_in_background(
+                callback=lambda path, error: results.append((path, error)),
+                snapshot_dir=self.config.get("snapshot_dir"), keep=self.config.get("snapshot_retention", 10)
+            )
             
-            if not batches:
-                messagebox.showinfo("No Batches", "No game batches found in database. Please import a CSV file first.")
+            def check_done():
+                if not window.winfo_exists():
+                    return
+                if results:
+                    path, error = results[0]
+                    status_var.set(f"Snapshot failed: {error}" if error else f"Snapshot saved: {os.path.basename(path)}")
+                    refresh()
+                else:
+                    window.after(500, check_done)
+            window.after(500, check_done)
+        
+        def restore_snapshot():
+            snapshot_path = filedialog.askopenfilename(
+                parent=window, title="Restore Snapshot",
+                initialdir=self.config.get("snapshot_dir") or self.db.default_snapshot_dir(),
+                filetypes=[("SQLite Database", "*.db"), ("All Files", "*.*")]
+            )
+            if not snapshot_path or not messagebox.askyesno(
+                "Restore Snapshot",
+                f"Replace the whole database with {os.path.basename(snapshot_path)}?\n\n"
+                "Votes cast after the snapshot was taken will be lost.",
+                parent=window
+            ):
                 return
-                
-            # Create a simple dialog to select a batch
-            batch_window = tk.Toplevel(self.root)
-            batch_window.title("Select Batch")
-            batch_window.geometry("300x400")
-            batch_window.transient(self.root)
-            batch_window.grab_set()
+            try:
+                self.db.restore_snapshot(snapshot_path)
+                status_var.set(f"Restored {os.path.basename(snapshot_path)}")
+                refresh()
+            except sqlite3.Error as e:
+                messagebox.showerror("Restore Error", f"Could not restore snapshot: {str(e)}", parent=window)
+        
+        def enable_incremental_vacuum():
+            if messagebox.askyesno(
+                "Enable Incremental Vacuum",
+                "This rewrites the whole database file once and blocks other voters while it runs.\n\nContinue?",
+                parent=window
+            ):
+                try:
+                    self.db.enable_incremental_vacuum()
+                    refresh()
+                except sqlite3.Error as e:
+                    messagebox.showerror("Maintenance Error", f"Could not convert database: {str(e)}", parent=window)
+        
+        button_frame = tk.Frame(window)
+        button_frame.pack(pady=10)
+        tk.Button(button_frame, text="Run Maintenance Now", command=run_tasks,
+                  bg='#4CAF50', fg='white', font=('Arial', 10)).grid(row=0, column=0, padx=5, pady=2)
+        tk.Button(button_frame, text="Full Integrity Check", command=lambda: run_tasks(["integrity_check"]),
+                  bg='#2196F3', fg='white', font=('Arial', 10)).grid(row=0, column=1, padx=5, pady=2)
+        tk.Button(button_frame, text="Enable Incremental Vacuum", command=enable_incremental_vacuum,
+                  bg='#FF9800', fg='white', font=('Arial', 10)).grid(row=1, column=0, padx=5, pady=2)
+        tk.Button(button_frame, text="Snapshot Now", command=snapshot_now,
+                  bg='#4CAF50', fg='white', font=('Arial', 10)).grid(row=1, column=1, padx=5, pady=2)
+        tk.Button(button_frame, text="Restore Snapshot...", command=restore_snapshot,
+                  bg='#FF9800', fg='white', font=('Arial', 10)).grid(row=2, column=0, padx=5, pady=2)
+        tk.Button(button_frame, text="Close", command=window.destroy,
+                  bg='#f44336', fg='white', font=('Arial', 10)).grid(row=2, column=1, padx=5, pady=2)
+        
+        refresh()
+
+    def select_batch_from_db(self):
+        """Select an existing batch from the database to start swiping"""
+        if not self.ensure_db_connection():
+            messagebox.showerror("Error", "Please connect to a database first.")
+            return
+        if not self.require_local_database():
+            return
             
-            tk.Label(batch_window, text="Select a batch to swipe:", font=('Arial', 12)).pack(pady=10)
+        # Read batch sizes and this user's progress from the batch catalog
+        batches = self.db.get_batch_catalog(self.user_name)
+        
+        if not batches:
+            messagebox.showinfo("No Batches", "No game batches found in database. Please import a CSV file first.")
+            return
             
-            # Create a listbox with all batches
-            batch_listbox = tk.Listbox(batch_window, width=40, height=15)
-            batch_listbox.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
+        # Create a simple dialog to select a batch
+        batch_window = tk.Toplevel(self.root)
+        batch_window.title("Select Batch")
+        batch_window.geometry("500x520")
+        batch_window.transient(self.root)
+        batch_window.grab_set()
+        
+        tk.Label(batch_window, text="Select a batch to swipe (Ctrl-click to swipe several together):",
+                 font=('Arial', 10)).pack(pady=10)
+        
+        filter_frame = tk.Frame(batch_window)
+        filter_frame.pack(padx=10, fill=tk.X)
+        tk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT)
+        filter_var = tk.StringVar()
+        filter_entry = tk.Entry(filter_frame, textvariable=filter_var)
+        filter_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        filter_entry.focus_set()
+        
+        # Create a listbox with all batches
+        batch_listbox = tk.Listbox(batch_window, width=60, height=15, font=('Courier', 10),
+                                   selectmode=tk.EXTENDED)
+        batch_listbox.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
+        
+        # Batches currently listed, in listbox order
+        shown_batches = []
+        
+        def refresh_list(*_):
+            text = filter_var.get().strip().lower()
+            shown_batches[:] = [batch for batch in batches if text in batch[0].lower()]
+            batch_listbox.delete(0, tk.END)
+            for batch_name, game_count, voted_count, yes_count in shown_batches:
+                percent_done = 100.0 * voted_count / game_count if game_count else 0.0
+                batch_listbox.insert(
+                    tk.END,
+                    f"{batch_name}  ({game_count} games, {percent_done:.0f}% done, {yes_count} yes)"
+                )
+        
+        filter_var.trace_add("write", refresh_list)
+        refresh_list()
             
-            for i, (batch_name,) in enumerate(batches):
-                batch_listbox.insert(tk.END, batch_name)
-                
-            # Add a scrollbar
-            scrollbar = tk.Scrollbar(batch_listbox)
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            batch_listbox.config(yscrollcommand=scrollbar.set)
-            scrollbar.config(command=batch_listbox.yview)
-            
-            def on_select():
-                if batch_listbox.curselection():
-                    selected_index = batch_listbox.curselection()[0]
-                    selected_batch = batches[selected_index][0]
-                    batch_window.destroy()
-                    self.load_batch_from_db(selected_batch)
-                else:
-                    messagebox.showinfo("Selection Required", "Please select a batch.")
+        # Add a scrollbar
+        scrollbar = tk.Scrollbar(batch_listbox)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        batch_listbox.config(yscrollcommand=scrollbar.set)
+        scrollbar.config(command=batch_listbox.yview)
+        
+        def on_select():
+            selected = [shown_batches[index][0] for index in batch_listbox.curselection()]
+            if not selected:
+                messagebox.showinfo("Selection Required", "Please select a batch.")
+                return
+            batch_window.destroy()
+            if len(selected) == 1:
+                self.load_batch_from_db(selected[0])
+            else:
+                self.swipe_merged_batches(selected)
+        
+        def selected_batch_name():
+            if not batch_listbox.curselection():
+                messagebox.showinfo("Selection Required", "Please select a batch.")
+                return None
+            return shown_batches[batch_listbox.curselection()[0]][0]
+        
+        def on_archive():
+            batch_name = selected_batch_name()
+            if batch_name and self.archive_batch_with_dialog(batch_name, purge_after=archive_purge_var.get()):
+                batch_window.destroy()
+        
+        def on_purge():
+            batch_name = selected_batch_name()
+            if batch_name and self.purge_batch_with_confirmation(batch_name):
+                batch_window.destroy()
+        
+        def on_rule():
+            batch_name = selected_batch_name()
+            if batch_name:
+                self.edit_decision_rule(batch_name, parent=batch_window)
+        
+        def on_report():
+            selected = [shown_batches[index][0] for index in batch_listbox.curselection()]
+            if not selected:
+                messagebox.showinfo("Selection Required", "Please select one or more batches.")
+                return
+            self.export_ranking_report(selected)
+        
+        def on_pack():
+            selected = [shown_batches[index][0] for index in batch_listbox.curselection()]
+            if not selected:
+                messagebox.showinfo("Selection Required", "Please select one or more batches.")
+                return
+            self.export_swipe_pack_with_dialog(selected)
+        
+        def on_derive():
+            selected = [shown_batches[index][0] for index in batch_listbox.curselection()]
+            if not selected:
+                messagebox.showinfo("Selection Required", "Please select one or more batches.")
+                return
+            self.derive_batch_dialog(selected, parent=batch_window, on_created=batch_window.destroy)
+        
+        select_frame = tk.Frame(batch_window)
+        select_frame.pack(pady=15)
+        select_button = tk.Button(select_frame, text="Select", command=on_select,
+                                 width=15, bg='#4CAF50', fg='white', font=('Arial', 10))
+        select_button.pack(side=tk.LEFT, padx=5)
+        tk.Button(select_frame, text="Ranking Report", command=on_report,
+                  width=15, bg='#2196F3', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(select_frame, text="Swipe Pack...", command=on_pack,
+                  width=15, bg='#2196F3', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        
+        # Archive / purge controls for clearing out old campaigns
+        manage_frame = tk.Frame(batch_window)
+        manage_frame.pack(pady=5)
+        
+        archive_purge_var = tk.BooleanVar(value=True)
+        tk.Button(manage_frame, text="Archive...", command=on_archive,
+                  width=10, bg='#FF9800', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Checkbutton(manage_frame, text="purge after archiving",
+                       variable=archive_purge_var).pack(side=tk.LEFT, padx=5)
+        tk.Button(manage_frame, text="Purge", command=on_purge,
+                  width=10, bg='#F44336', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(manage_frame, text="Rule...", command=on_rule,
+                  width=10, bg='#9C27B0', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(batch_window, text="Derive Batch...", command=on_derive,
+                  width=15, bg='#9C27B0', fg='white', font=('Arial', 10)).pack(pady=5)
+        
+        cancel_button = tk.Button(batch_window, text="Cancel", command=batch_window.destroy,
+                                 width=15, bg='#f44336', fg='white', font=('Arial', 10))
+        cancel_button.pack(pady=5)
             
-            select_button = tk.Button(batch_window, text="Select", command=on_select,
-                                     width=15, bg='#4CAF50', fg='white', font=('Arial', 10))
-            select_button.pack(pady=15)
+    def edit_decision_rule(self, batch_name, parent=None):
+        """Set when the team's votes retire a batch's games from everyone's queue"""
+        rule = self.db.get_decision_rule(batch_name)
+        
+        rule_window = tk.Toplevel(parent or self.root)
+        rule_window.title("Decision Rule")
+        rule_window.geometry("380x270")
+        rule_window.transient(parent or self.root)
+        rule_window.grab_set()
+        
+        tk.Label(rule_window, text=f"Batch: {batch_name}", font=('Arial', 11, 'bold')).pack(pady=(10, 5))
+        tk.Label(rule_window, text="Leave a field empty to not use it.", font=('Arial', 9)).pack()
+        
+        fields_frame = tk.Frame(rule_window)
+        fields_frame.pack(padx=10, pady=5)
+        entries = {}
+        for row, (key, label) in enumerate([("yes_quorum", "Accept at yes votes:"),
+                                            ("no_quorum", "Reject at no votes:"),
+                                            ("majority_of", "Majority of a team of:")]):
+            tk.Label(fields_frame, text=label).grid(row=row, column=0, sticky="w", pady=2)
+            entry = tk.Entry(fields_frame, width=6)
+            entry.grid(row=row, column=1, padx=5, pady=2)
+            if rule[key]:
+                entry.insert(0, str(rule[key]))
+            entries[key] = entry
+        
+        tk.Label(rule_window, text=f"Decided so far: {rule['accepted']} accepted, {rule['rejected']} rejected",
+                 font=('Arial', 9)).pack(pady=5)
+        
+        def save_rule(clear=False):
+            values = {}
+            for key, entry in entries.items():
+                text = "" if clear else entry.get().strip()
+                if text and (not text.isdigit() or int(text) < 1):
+                    messagebox.showerror("Invalid Number", "Please enter whole numbers of at least 1.",
+                                         parent=rule_window)
+                    return
+                values[key] = int(text) if text else None
+            try:
+                accepted, rejected = self.db.set_decision_rule(batch_name, **values)
+            except sqlite3.Error as e:
+                messagebox.showerror("Error", f"Failed to save the rule: {e}", parent=rule_window)
+                return
+            rule_window.destroy()
+            messagebox.showinfo("Rule Saved",
+                                f"{accepted} accepted and {rejected} rejected games of {batch_name} "
+                                f"are now left out of everyone's queue.")
+        
+        button_frame = tk.Frame(rule_window)
+        button_frame.pack(pady=10)
+        tk.Button(button_frame, text="Save", command=save_rule,
+                  width=10, bg='#4CAF50', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="No Rule", command=lambda: save_rule(clear=True),
+                  width=10, bg='#FF9800', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Cancel", command=rule_window.destroy,
+                  width=10, bg='#f44336', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
             
-            cancel_button = tk.Button(batch_window, text="Cancel", command=batch_window.destroy,
-                                     width=15, bg='#f44336', fg='white', font=('Arial', 10))
-            cancel_button.pack(pady=5)
+    def derive_batch_dialog(self, batch_names, parent=None, on_created=None):
+        """Build a new batch from the selected ones by union, intersection or difference"""
+        derive_window = tk.Toplevel(parent or self.root)
+        derive_window.title("Derive Batch")
+        derive_window.geometry("400x420")
+        derive_window.transient(parent or self.root)
+        derive_window.grab_set()
+        
+        tk.Label(derive_window, text=f"From: {', '.join(batch_names)}", wraplength=380,
+                 font=('Arial', 10, 'bold')).pack(pady=(10, 5), padx=10)
+        
+        operation_var = tk.StringVar(value="union" if len(batch_names) == 1 else "intersection")
+        operation_frame = tk.LabelFrame(derive_window, text="Games", padx=10, pady=5)
+        operation_frame.pack(padx=10, pady=5, fill=tk.X)
+        for text, value in [("In any of them (union)", "union"), ("In all of them (intersection)", "intersection"),
+                            ("In the first but none of the others (difference)", "difference")]:
+            tk.Radiobutton(operation_frame, text=text, variable=operation_var, value=value,
+                           state=tk.NORMAL if value == "union" or len(batch_names) > 1 else tk.DISABLED
+                           ).pack(anchor="w")
+        first_frame = tk.Frame(operation_frame)
+        first_frame.pack(anchor="w")
+        tk.Label(first_frame, text="First batch:").pack(side=tk.LEFT)
+        first_var = tk.StringVar(value=batch_names[0])
+        tk.OptionMenu(first_frame, first_var, *batch_names).pack(side=tk.LEFT, padx=5)
+        
+        vote_var = tk.StringVar(value="")
+        vote_frame = tk.LabelFrame(derive_window, text="Only games", padx=10, pady=5)
+        vote_frame.pack(padx=10, pady=5, fill=tk.X)
+        for text, value in [("Any", ""), ("Voted yes", "yes"), ("Voted no", "no"), ("Not voted on", "unvoted"),
+                            ("Accepted by the team's decision rule", "accepted")]:
+            tk.Radiobutton(vote_frame, text=text, variable=vote_var, value=value).pack(anchor="w")
+        voter_frame = tk.Frame(vote_frame)
+        voter_frame.pack(anchor="w")
+        tk.Label(voter_frame, text="Votes by (empty = anyone):").pack(side=tk.LEFT)
+        voter_entry = tk.Entry(voter_frame, width=15)
+        voter_entry.insert(0, self.user_name)
+        voter_entry.pack(side=tk.LEFT, padx=5)
+        
+        name_frame = tk.Frame(derive_window)
+        name_frame.pack(padx=10, pady=5, anchor="w")
+        tk.Label(name_frame, text="New batch name:").pack(side=tk.LEFT)
+        name_entry = tk.Entry(name_frame, width=30)
+        name_entry.pack(side=tk.LEFT, padx=5)
+        name_entry.focus_set()
+        
+        def on_create():
+            new_batch = name_entry.get().strip()
+            operands = [first_var.get()] + [name for name in batch_names if name != first_var.get()]
+            try:
+                game_count = self.db.derive_batch(new_batch, operation_var.get(), operands,
+                                                  vote_filter=vote_var.get() or None,
+                                                  user_name=voter_entry.get().strip() or None)
+            except ValueError as e:
+                messagebox.showerror("Derive Batch", str(e), parent=derive_window)
+                return
+            except sqlite3.Error as e:
+                print(f"Error deriving batch {new_batch}: {e}")
+                messagebox.showerror("Error", f"Failed to derive the batch: {e}", parent=derive_window)
+                return
+            derive_window.destroy()
+            if on_created:
+                on_created()
+            messagebox.showinfo("Batch Created", f"Created batch '{new_batch}' with {game_count} games.")
+            self.status_var.set(f"Derived batch: {new_batch} ({game_count} games)")
+        
+        button_frame = tk.Frame(derive_window)
+        button_frame.pack(pady=10)
+        tk.Button(button_frame, text="Create", command=on_create,
+                  width=10, bg='#4CAF50', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Cancel", command=derive_window.destroy,
+                  width=10, bg='#f44336', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
             
     def load_batch_from_db(self, batch_name):
         """Load a batch from the database and start swiping"""
@@ -477,8 +4432,9 @@ class SteamGameVoter:
                 
             conn.commit()
             
-            # Create the UI for swiping
-            self.create_ui()
+            # Switch to the swipe screen
+            self.random_unvoted_mode = False
+            self.show_swipe_screen()
             
             # Show message about progress
             if self.current_index > 0:
@@ -492,6 +4448,54 @@ class SteamGameVoter:
                 messagebox.showinfo("Batch Complete", "You've already completed this batch.")
                 self.back_to_main_menu()
 
+    def swipe_merged_batches(self, batch_names):
+        """Swipe several batches as one session, showing each store page only once
+
+        Games are claimed from the database a few at a time (see claim_merged_games),
+        and the next time the same batches are picked together the session picks up at
+        the first store page still unvoted.
+        """
+        if not self.ensure_db_connection():
+            return
+        try:
+            self.merged_session = self.db.start_merged_session(self.user_name, batch_names)
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Failed to start merged session: {e}")
+            return
+
+        self.random_unvoted_mode = True
+        self.entries = []
+        self.current_index = 0
+        self.game_filter = GameFilter().batches(*self.merged_session['batch_names']).ordered("id")
+        self.game_queue = []
+        self.queue_cursor = None
+        self.session_id = f"{self.user_name}-{uuid.uuid4().hex}"
+        self.swipe_db = self.db
+
+        self.preload_unvoted_games(10)
+
+        if not self.game_queue:
+            self.random_unvoted_mode = False
+            self.merged_session = None
+            self.release_reservations()
+            messagebox.showinfo("Batches Complete", "You've already voted on every game in these batches.")
+            return
+
+        self.show_swipe_screen()
+        self.show_mode_label(f"MERGED MODE: {len(batch_names)} batches, "
+                             f"{self.merged_session['total']} unique games")
+        self.start_session_trace()
+        self.load_next_from_queue()
+
+    def import_processes(self, file_path):
+        """Use a process pool to parse large CSV files; small ones are faster inline"""
+        if self.db.is_remote:
+            return None
+        # Roughly PROCESS_POOL_MIN_ROWS rows at ~200 bytes per row
+        if os.path.getsize(file_path) < PROCESS_POOL_MIN_ROWS * 200:
+            return None
+        return min(os.cpu_count() or 1, 8)
+
     def import_additional_dataset(self):
         if not self.ensure_db_connection():
             return
@@ -505,85 +4509,27 @@ class SteamGameVoter:
         if not batch_name:
             return
             
-        imported_count = 0
-        duplicate_count = 0
-        
         with open(file_path, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
-            
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                for row in reader:
-                    try:
-                        cursor.execute('''
-                            INSERT INTO games 
-                            (name, developers, release_date, steam_page_url, batch_name)
-                            VALUES (?, ?, ?, ?, ?)
-                        ''', (
-                            row['name'],
-                            row['developers'],
-                            row['release_date'],
-                            row['steam_page_url'],
-                            batch_name
-                        ))
-                        imported_count += 1
-                    except sqlite3.IntegrityError:
-                        duplicate_count += 1
-                
-                conn.commit()
+            imported_count, duplicate_count = self.db.import_games(
+                reader, batch_name, processes=self.import_processes(file_path)
+            )
         
         messagebox.showinfo("Import Complete", 
                             f"Imported {imported_count} games, skipped {duplicate_count} duplicates.")
-        self.status_label.config(text=f"Imported dataset: {batch_name}")
+        self.status_var.set(f"Imported dataset: {batch_name}")
 
     def export_new_yes_votes(self):
         if not self.ensure_db_connection():
             return
         
-        # Get information about votes to export
-        yes_votes = []
-        vote_ids = []
-        
         try:
-            # Use a fresh connection with autocommit disabled for better transaction control
-            conn = sqlite3.connect(self.db.db_path)
-            cursor = conn.cursor()
-            
-            print("\n=== EXPORT DEBUG INFO ===")
-            
-            # Check if exported column exists
-            cursor.execute("PRAGMA table_info(votes)")
-            columns = [row[1] for row in cursor.fetchall()]
-            print(f"Database columns in votes table: {columns}")
-            
-            # Get all yes votes that haven't been exported yet
-            query = '''
-                SELECT g.*, v.id as vote_id, v.timestamp
-                FROM games g
-                JOIN votes v ON g.id = v.game_id
-                WHERE v.vote = 1 AND v.user_name = ? AND v.exported = 0
-                ORDER BY v.timestamp
-            '''
-            
-            cursor.execute(query, (self.user_name,))
-            yes_votes = cursor.fetchall()
+            # Get all yes votes recorded since this user's last export
+            yes_votes_dicts, high_seq = self.db.fetch_new_yes_votes(self.user_name)
             
-            if not yes_votes:
+            if not yes_votes_dicts:
                 messagebox.showinfo("No Votes", "No 'Yes' votes found to export.")
-                conn.close()
                 return
-                
-            # Prepare data for export
-            columns = [col[0] for col in cursor.description]
-            yes_votes_dicts = [dict(zip(columns, row)) for row in yes_votes]
-            vote_ids = [vote['vote_id'] for vote in yes_votes_dicts]
-            
-            # Show current status of these votes
-            vote_ids_str = ', '.join(str(id) for id in vote_ids)
-            cursor.execute(f"SELECT id, exported FROM votes WHERE id IN ({vote_ids_str})")
-            current_status = cursor.fetchall()
-            print(f"Current status of votes to export: {current_status}")
             
             # Get export filename
             export_path = filedialog.asksaveasfilename(
@@ -593,7 +4539,6 @@ class SteamGameVoter:
             )
             
             if not export_path:
-                conn.close()
                 return
                 
             # Export to CSV
@@ -605,46 +4550,16 @@ class SteamGameVoter:
                 for vote in yes_votes_dicts:
                     writer.writerow({k: vote.get(k, '') for k in export_fields})
             
-            # Mark votes as exported - direct SQL approach
-            print(f"Attempting to mark {len(vote_ids)} votes as exported with IDs: {vote_ids}")
-            
-            for vote_id in vote_ids:
-                try:
-                    cursor.execute("UPDATE votes SET exported = 1 WHERE id = ?", (vote_id,))
-                    print(f"Updated vote ID {vote_id}, rows affected: {cursor.rowcount}")
-                except Exception as e:
-                    print(f"Error updating vote ID {vote_id}: {e}")
-            
-            # Commit changes
-            conn.commit()
-            
-            # Verify updates
-            cursor.execute(f"SELECT id, exported FROM votes WHERE id IN ({vote_ids_str})")
-            updated_status = cursor.fetchall()
-            print(f"Status after update: {updated_status}")
-            
-            # One more update with standalone connection as a backup approach
-            conn2 = sqlite3.connect(self.db.db_path)
-            cursor2 = conn2.cursor()
-            cursor2.execute(f"UPDATE votes SET exported = 1 WHERE id IN ({vote_ids_str})")
-            cursor2.execute(f"SELECT id, exported FROM votes WHERE id IN ({vote_ids_str})")
-            final_status = cursor2.fetchall()
-            print(f"Final status with direct update: {final_status}")
-            conn2.commit()
-            conn2.close()
-            
-            conn.close()
+            # Advance the export watermark only once the file has been written
+            self.db.set_export_watermark(f"yes_export:{self.user_name}", high_seq)
+            print(f"Export watermark for {self.user_name} moved to event {high_seq}")
             
-            messagebox.showinfo("Export Complete", f"Exported {len(yes_votes)} 'Yes' votes to {export_path}")
-            self.status_label.config(text=f"Exported {len(yes_votes)} yes votes")
+            messagebox.showinfo("Export Complete", f"Exported {len(yes_votes_dicts)} 'Yes' votes to {export_path}")
+            self.status_var.set(f"Exported {len(yes_votes_dicts)} yes votes")
             
         except Exception as e:
             print(f"Export error: {e}")
             messagebox.showerror("Export Error", f"An error occurred during export: {str(e)}")
-            try:
-                conn.close()
-            except:
-                pass
 
     def read_file(self, filename):
         self.ensure_db_connection()
@@ -654,24 +4569,11 @@ class SteamGameVoter:
         with open(filename, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
             self.fieldnames = reader.fieldnames
+            self.db.import_games(reader, self.input_filename, processes=self.import_processes(filename))
             
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Insert games into database
-                for row in reader:
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO games 
-                        (name, developers, release_date, steam_page_url, batch_name)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (
-                        row['name'],
-                        row['developers'],
-                        row['release_date'],
-                        row['steam_page_url'],
-                        self.input_filename
-                    ))
-                
                 # Get all games for this batch
                 cursor.execute('''
                     SELECT * FROM games WHERE batch_name = ? 
@@ -694,119 +4596,495 @@ class SteamGameVoter:
         atexit.register(voter.save_progress)
         return voter
 
-    def swipe_unvoted_games(self):
-        """Start swiping on random games that haven't been voted on yet by the current user"""
+    def swipe_unvoted_games(self, game_filter=None, first_game=None):
+        """Start swiping on random games that haven't been voted on yet by the current user
+
+        first_game (e.g. picked in the search dialog) is shown before the queued games.
+        """
         if not self.ensure_db_connection():
-            messagebox.showerror("Error", "Please connect to a database first.")
+            self.show_error("Error", "Please connect to a database first.")
             return
             
         # Switch to using a different approach - get one game at a time
         self.random_unvoted_mode = True
         self.entries = []  # Clear any existing entries
         self.current_index = 0
+        self.start_swipe_session(game_filter)
+        
+        if first_game:
+            # The picked game goes through the same lease as queued games
+            try:
+                reserved = self.swipe_db.reserve_games(
+                    self.user_name, self.session_id, [first_game['id']],
+                    lease_seconds=self.config.get("reservation_lease_seconds", 900)
+                )
+            except (sqlite3.Error, VotingServerError) as e:
+                self.log_swipe_error("reserving the picked game", e)
+                reserved = []
+            if not reserved:
+                self.random_unvoted_mode = False
+                self.release_reservations()
+                self.show_info("Game Not Available",
+                               f"{first_game['name']} was voted on or decided meanwhile, or is open "
+                               "in another of your swipe sessions.")
+                return
         
         # Preload a batch of games to improve performance
         self.preload_unvoted_games(10)  # Preload 10 games
+        if first_game:
+            self.game_queue = [first_game] + [game for game in self.game_queue if game['id'] != first_game['id']]
         
-        if hasattr(self, 'game_queue') and self.game_queue:
-            # Create the UI for swiping just once
-            self.create_ui()
+        if self.game_queue:
+            self.show_swipe_screen()
             # Add a label to show we're in random mode
-            self.random_mode_label = tk.Label(self.root, text="RANDOM MODE: Swiping unvoted games", 
-                                           bg='#E91E63', fg='white', font=('Arial', 10, 'bold'))
-            self.random_mode_label.place(relx=0.5, y=5, anchor="n")
+            if self.game_filter.is_empty() and self.game_filter.order == "random":
+                mode_text = "RANDOM MODE: Swiping unvoted games"
+            else:
+                mode_text = f"FILTERED MODE: {self.game_filter.describe()}"
+            self.show_mode_label(mode_text)
+            self.start_session_trace()
             
             # Get the first game from queue and update UI
             self.load_next_from_queue()
         else:
-            messagebox.showinfo("No Games", "No unvoted games found in the database.")
+            self.random_unvoted_mode = False
+            self.show_info("No Games", "No unvoted games found in the database.")
     
-    def preload_unvoted_games(self, count=5):
-        """Preload a batch of unvoted games to improve performance"""
+    def start_swipe_session(self, game_filter=None):
+        """Reset the unvoted queue and open a reservation session for it"""
+        self.merged_session = None
+        self.game_filter = game_filter or GameFilter()
         self.game_queue = []
+        self.queue_cursor = None
+        self.session_id = f"{self.user_name}-{uuid.uuid4().hex}"
+        self.swipe_db = self.db
+        if self.config.get("session_cache") and not self.db.is_remote:
+            try:
+                # Serve the queue from memory; votes and reservations write through
+                self.swipe_db = SessionCache(self.db, self.user_name, self.game_filter)
+            except sqlite3.Error as e:
+                print(f"Session cache not available, reading from the database: {e}")
+    
+    def swipe_grid(self, game_filter=None):
+        """Judge a page of unvoted games at once, shown as store preview tiles
+
+        Every tile starts as "no" and is toggled to "yes"; Commit Page records the whole
+        page in one transaction. While a page is shown, the next one is already reserved
+        and its previews are fetched in the background.
+        """
+        if not self.ensure_db_connection():
+            self.show_error("Error", "Please connect to a database first.")
+            return
         
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
+        self.random_unvoted_mode = False
+        self.start_swipe_session(game_filter)
+        low, high = GRID_PAGE_SIZES
+        self.grid_page_size = min(max(int(self.config.get("grid_page_size", 8)), low), high)
+        if self.grid_previewer is None:
+            self.grid_previewer = PreviewViewer(lambda text: None, self.preview_cache_dir(), workers=4)
+        
+        self.preload_unvoted_games(self.grid_page_size)
+        if not self.game_queue:
+            self.release_reservations()
+            self.show_info("No Games", "No unvoted games found in the database.")
+            return
+        
+        self.screens.show("grid")
+        columns = 2 if self.grid_page_size <= 4 else 3
+        for index, tile in enumerate(self.grid_tiles):
+            if index < self.grid_page_size:
+                tile["frame"].grid(row=index // columns, column=index % columns, sticky="nsew", padx=3, pady=3)
+            else:
+                tile["frame"].grid_remove()
+        self.start_session_trace()
+        self.show_grid_page()
+    
+    def show_grid_page(self):
+        """Fill the tiles with the next page of queued games, then reserve the page after it"""
+        if len(self.game_queue) < self.grid_page_size:
+            self.preload_unvoted_games(self.grid_page_size)
+        self.grid_games = self.game_queue[:self.grid_page_size]
+        del self.game_queue[:self.grid_page_size]
+        if not self.grid_games:
+            self.show_info("All Done", "You've voted on all available games!")
+            self.back_to_main_menu()
+            return
+        
+        futures = []
+        for index, tile in enumerate(self.grid_tiles[:self.grid_page_size]):
+            if index < len(self.grid_games):
+                game = self.grid_games[index]
+                tile["title"].set(f"{game['name']}\n{game['developers']}\n{game['release_date']}")
+                tile["details"].set("Loading preview...")
+                tile["vote"].set(False)
+                tile["toggle"].config(state=tk.NORMAL)
+                futures.append((tile, self.grid_previewer.prefetch(game['steam_page_url'])))
+            else:
+                tile["title"].set("")
+                tile["details"].set("")
+                tile["vote"].set(False)
+                tile["toggle"].config(state=tk.DISABLED)
+        self.grid_var.set(f"Grid: {len(self.grid_games)} games on this page, {len(self.game_queue)} more queued")
+        self.shown_at = time.time()
+        self.page_ready_at = None
+        self.fill_grid_previews(futures, self.shown_at)
+        
+        # Reserve the next page now, so its previews load while this one is judged
+        if len(self.game_queue) < self.grid_page_size:
+            self.preload_unvoted_games(self.grid_page_size)
+        for game in self.game_queue[:self.grid_page_size]:
+            self.grid_previewer.prefetch(game['steam_page_url'])
+    
+    def fill_grid_previews(self, futures, shown_at):
+        """Show tile previews as their fetches finish (polled from the Tk loop)"""
+        if shown_at != self.shown_at or self.screens.current != "grid":
+            return  # The page was committed or left in the meantime
+        pending = []
+        for tile, future in futures:
+            if future.done():
+                tile["details"].set(PreviewViewer.format_tile(future.result()))
+            else:
+                pending.append((tile, future))
+        if pending:
+            self.root.after(100, self.fill_grid_previews, pending, shown_at)
+        else:
+            self.page_ready_at = time.time()
+    
+    def commit_grid_page(self):
+        """Record the votes of every tile on the page in one transaction and show the next page"""
+        if self.maintenance:
+            self.maintenance.note_activity()
+        votes = [(game['id'], tile["vote"].get()) for game, tile in zip(self.grid_games, self.grid_tiles)]
+        try:
+            self.swipe_db.record_votes(self.user_name, votes, timing=(self.shown_at, self.page_ready_at))
+        except (sqlite3.Error, VotingServerError) as e:
+            # The page stays up (and reserved), so it can be committed again
+            self.log_swipe_error("recording grid votes", e)
+            self.show_error("Vote Error", f"Error recording votes: {str(e)}")
+            return
+        print(f"Recorded {len(votes)} grid votes")
+        if self.recorder:
+            for game_id, value in votes:
+                self.recorder.record("vote", game_id=game_id, value=bool(value))
+        self.show_grid_page()
+    
+    def show_mode_label(self, mode_text):
+        """Show the swipe mode banner at the top of the window"""
+        self.mode_var.set(mode_text)
+        self.mode_label.place(relx=0.5, y=5, anchor="n")
+    
+    def start_session_trace(self):
+        """Start recording this swipe session if session_trace_dir is configured"""
+        self.stop_session_trace()
+        trace_dir = self.config.get("session_trace_dir")
+        if not trace_dir:
+            return
+        try:
+            trace_path = os.path.join(trace_dir, f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+            self.recorder = SessionRecorder(trace_path)
+            self.recorder.record("swipe", user_name=self.user_name, filter=self.game_filter.to_dict())
+            print(f"Recording session trace to {trace_path}")
+        except OSError as e:
+            print(f"Could not start session trace: {e}")
+            self.recorder = None
+    
+    def stop_session_trace(self):
+        """Finish the current session trace, if any"""
+        if self.recorder:
+            self.recorder.record("stop")
+            self.recorder.close()
+            self.recorder = None
+    
+    def show_search_dialog(self):
+        """Search-as-you-type over game names and developers, with this user's vote status"""
+        if not self.ensure_db_connection():
+            messagebox.showerror("Error", "Please connect to a database first.")
+            return
             
+        search_window = tk.Toplevel(self.root)
+        search_window.title("Search Games")
+        search_window.geometry("560x460")
+        search_window.transient(self.root)
+        
+        query_var = tk.StringVar()
+        query_entry = tk.Entry(search_window, textvariable=query_var, width=50, font=('Arial', 12))
+        query_entry.pack(padx=10, pady=10, fill=tk.X)
+        query_entry.focus_set()
+        
+        result_label = tk.Label(search_window, text="Type part of a game or developer name", font=('Arial', 9))
+        result_label.pack(padx=10, anchor="w")
+        
+        result_listbox = tk.Listbox(search_window, height=16, font=('Courier', 10))
+        result_listbox.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
+        
+        results = []
+        pending = [None]
+        vote_text = {None: "   ", 0: "NO ", 1: "YES"}
+        
+        def run_search():
+            pending[0] = None
+            started = time.perf_counter()
             try:
-                # Get multiple random games at once - now with more aggressive locking to prevent conflicts
-                cursor.execute(f'''
-                    SELECT g.* FROM games g
-                    WHERE NOT EXISTS (
-                        SELECT 1 FROM votes v 
-                        WHERE v.game_id = g.id AND v.user_name = ?
-                    )
-                    ORDER BY RANDOM()
-                    LIMIT {count}
-                ''', (self.user_name,))
-                
-                columns = [col[0] for col in cursor.description]
-                games = cursor.fetchall()
-                
-                if not games:
-                    return False
-                    
-                # Convert to list of dictionaries
-                self.game_queue = [dict(zip(columns, game)) for game in games]
-                print(f"Preloaded {len(self.game_queue)} unvoted games")
-                return True
-                
-            except Exception as e:
-                print(f"Error preloading games: {e}")
+                games = self.db.search_games(query_var.get(), self.user_name)
+            except (sqlite3.Error, VotingServerError) as e:
+                result_label.config(text=f"Search failed: {e}")
+                return
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            results[:] = games
+            result_listbox.delete(0, tk.END)
+            for game in games:
+                result_listbox.insert(
+                    tk.END, f"{vote_text.get(game['vote'], '   ')}  {game['name']} - {game['developers']} [{game['batch_name']}]"
+                )
+            result_label.config(text=f"{len(games)} games ({elapsed_ms:.1f} ms)")
+        
+        def schedule_search(*_):
+            # Wait for a short pause in typing instead of querying on every key
+            if pending[0]:
+                search_window.after_cancel(pending[0])
+            pending[0] = search_window.after(150, run_search)
+        
+        def on_jump(*_):
+            if not result_listbox.curselection():
+                messagebox.showinfo("Selection Required", "Please select a game.", parent=search_window)
+                return
+            game = results[result_listbox.curselection()[0]]
+            if game['vote'] is not None:
+                messagebox.showinfo("Already Voted",
+                                    f"You already voted {'yes' if game['vote'] else 'no'} on {game['name']}.",
+                                    parent=search_window)
+                return
+            if game.get('decided'):
+                messagebox.showinfo("Already Decided",
+                                    f"The team has already {'accepted' if game['decided'] > 0 else 'rejected'} "
+                                    f"{game['name']}.", parent=search_window)
+                return
+            search_window.destroy()
+            self.swipe_unvoted_games(first_game=game)
+        
+        query_var.trace_add("write", schedule_search)
+        result_listbox.bind("<Double-Button-1>", on_jump)
+        query_entry.bind("<Return>", lambda _: run_search())
+        
+        button_frame = tk.Frame(search_window)
+        button_frame.pack(pady=10)
+        tk.Button(button_frame, text="Swipe This Game", command=on_jump,
+                  width=15, bg='#E91E63', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Close", command=search_window.destroy,
+                  width=15, bg='#f44336', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+
+    def show_swipe_dashboard(self):
+        """Votes per hour, dwell times and page-ready latency per user and batch"""
+        if not self.ensure_db_connection():
+            messagebox.showerror("Error", "Please connect to a database first.")
+            return
+
+        dashboard_window = tk.Toplevel(self.root)
+        dashboard_window.title("Swipe Dashboard")
+        dashboard_window.geometry("760x560")
+        dashboard_window.transient(self.root)
+
+        periods = [("Last 24 hours", 86400), ("Last 7 days", 7 * 86400),
+                   ("Last 30 days", 30 * 86400), ("All time", None)]
+        period_var = tk.StringVar(value=periods[1][0])
+
+        top_frame = tk.Frame(dashboard_window)
+        top_frame.pack(padx=10, pady=(10, 0), fill=tk.X)
+        for label, _ in periods:
+            tk.Radiobutton(top_frame, text=label, variable=period_var, value=label,
+                           command=lambda: refresh()).pack(side=tk.LEFT)
+
+        report_text = tk.Text(dashboard_window, font=('Courier', 10), wrap=tk.NONE)
+        report_text.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+        def seconds(value):
+            return "-" if value is None else f"{value:.1f}"
+
+        def per_hour(value):
+            return "-" if value is None else f"{value:.0f}"
+
+        def group_lines(title, rows):
+            lines = [title, f"{'':24} {'votes':>6} {'votes/h':>8} {'median':>7} {'p90':>7} {'page avg':>9} {'page p90':>9}"]
+            for row in rows:
+                lines.append(
+                    f"{str(row['name'])[:24]:24} {row['votes']:>6} {per_hour(row['votes_per_hour']):>8} "
+                    f"{seconds(row['median_dwell']):>7} {seconds(row['p90_dwell']):>7} "
+                    f"{seconds(row['avg_page_ready']):>9} {seconds(row['p90_page_ready']):>9}"
+                )
+            return lines + [""]
+
+        def refresh():
+            window = dict(periods)[period_var.get()]
+            since = time.time() - window if window else None
+            try:
+                stats = self.db.get_swipe_stats(since)
+            except (sqlite3.Error, VotingServerError) as e:
+                messagebox.showerror("Error", f"Failed to load statistics: {e}", parent=dashboard_window)
+                return
+
+            lines = ["Dwell and page times in seconds; only votes made since timing was recorded count.", ""]
+            lines += group_lines("Per user", stats["users"])
+            lines += group_lines("Per batch", stats["batches"])
+
+            lines.append("Dwell time distribution")
+            total = sum(row["votes"] for row in stats["histogram"]) or 1
+            for row in stats["histogram"]:
+                bar = "#" * round(40 * row["votes"] / total)
+                lines.append(f"{row['bucket']:>9} {row['votes']:>6}  {bar}")
+            lines.append("")
+
+            lines.append("Average dwell by page-ready time")
+            for row in stats["by_page_latency"]:
+                lines.append(f"{row['bucket']:>9} {row['votes']:>6} votes  {seconds(row['avg_dwell']):>6} s")
+            lines.append("")
+
+            lines.append("Team throughput per hour")
+            for row in stats["hourly"]:
+                lines.append(f"{row['hour']}  {row['votes']:>6} votes  {row['users']:>3} users")
+
+            report_text.config(state=tk.NORMAL)
+            report_text.delete("1.0", tk.END)
+            report_text.insert(tk.END, "\n".join(lines))
+            report_text.config(state=tk.DISABLED)
+
+        button_frame = tk.Frame(dashboard_window)
+        button_frame.pack(pady=(0, 10))
+        tk.Button(button_frame, text="Refresh", command=refresh,
+                  width=15, bg='#2196F3', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Close", command=dashboard_window.destroy,
+                  width=15, bg='#f44336', fg='white', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+
+        refresh()
+
+    def select_filtered_swipe(self):
+        """Build a filtered swipe queue (batches, release years, developers, order)"""
+        if not self.ensure_db_connection():
+            messagebox.showerror("Error", "Please connect to a database first.")
+            return
+            
+        batches = self.db.get_batch_catalog(self.user_name)
+        
+        filter_window = tk.Toplevel(self.root)
+        filter_window.title("Filtered Swipe")
+        filter_window.geometry("380x550")
+        filter_window.transient(self.root)
+        filter_window.grab_set()
+        
+        tk.Label(filter_window, text="Only games in batches (none selected = all):",
+                 font=('Arial', 10)).pack(pady=(10, 0), padx=10, anchor="w")
+        batch_listbox = tk.Listbox(filter_window, selectmode=tk.MULTIPLE, height=8, exportselection=False)
+        batch_listbox.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
+        for batch_name, game_count, voted_count, _ in batches:
+            batch_listbox.insert(tk.END, f"{batch_name} ({game_count - voted_count} unvoted)")
+        
+        year_frame = tk.Frame(filter_window)
+        year_frame.pack(padx=10, pady=5, anchor="w")
+        tk.Label(year_frame, text="Released from year:").pack(side=tk.LEFT)
+        year_from_entry = tk.Entry(year_frame, width=6)
+        year_from_entry.pack(side=tk.LEFT, padx=5)
+        tk.Label(year_frame, text="to:").pack(side=tk.LEFT)
+        year_to_entry = tk.Entry(year_frame, width=6)
+        year_to_entry.pack(side=tk.LEFT, padx=5)
+        
+        tk.Label(filter_window, text="Only these developers (comma separated, optional):",
+                 font=('Arial', 10)).pack(padx=10, anchor="w")
+        developer_entry = tk.Entry(filter_window, width=45)
+        developer_entry.pack(padx=10, pady=5, anchor="w")
+        
+        skip_rejected_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(filter_window, text="Skip developers I have only voted no on",
+                       variable=skip_rejected_var).pack(padx=10, anchor="w")
+        
+        include_decided_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(filter_window, text="Include games the team has already decided",
+                       variable=include_decided_var).pack(padx=10, anchor="w")
+        
+        order_var = tk.StringVar(value="random")
+        order_frame = tk.Frame(filter_window)
+        order_frame.pack(padx=10, pady=5, anchor="w")
+        tk.Label(order_frame, text="Order:").pack(side=tk.LEFT)
+        for text, value in [("Random", "random"), ("Import order", "id"), ("Release date", "release")]:
+            tk.Radiobutton(order_frame, text=text, variable=order_var, value=value).pack(side=tk.LEFT)
+        
+        def on_start(grid=False):
+            try:
+                game_filter = GameFilter().released_between(year_from_entry.get().strip(),
+                                                            year_to_entry.get().strip())
+            except ValueError:
+                messagebox.showerror("Invalid Year", "Please enter release years as numbers.", parent=filter_window)
+                return
+            game_filter.batches(*[batches[i][0] for i in batch_listbox.curselection()])
+            developer_names = [name.strip() for name in developer_entry.get().split(",") if name.strip()]
+            game_filter.by_developers(*developer_names)
+            game_filter.excluding_rejected_developers(skip_rejected_var.get())
+            game_filter.including_decided(include_decided_var.get())
+            game_filter.ordered(order_var.get())
+            filter_window.destroy()
+            if grid:
+                self.swipe_grid(game_filter)
+            else:
+                self.swipe_unvoted_games(game_filter)
+        
+        tk.Button(filter_window, text="Start Swiping", command=on_start,
+                  width=15, bg='#4CAF50', fg='white', font=('Arial', 10)).pack(pady=(10, 0))
+        tk.Button(filter_window, text="Grid Swipe", command=lambda: on_start(grid=True),
+                  width=15, bg='#4CAF50', fg='white', font=('Arial', 10)).pack(pady=10)
+        tk.Button(filter_window, text="Cancel", command=filter_window.destroy,
+                  width=15, bg='#f44336', fg='white', font=('Arial', 10)).pack(pady=(0, 10))
+
+    def preload_unvoted_games(self, count=5):
+        """Preload a batch of unvoted games (matching the current filter) onto the queue"""
+        game_filter = self.game_filter or GameFilter()
+        
+        try:
+            if self.merged_session:
+                games = self.swipe_db.claim_merged_games(
+                    self.user_name, self.session_id, self.merged_session['batch_names'],
+                    after_id=self.queue_cursor['id'] if self.queue_cursor else 0, limit=count,
+                    lease_seconds=self.config.get("reservation_lease_seconds", 900)
+                )
+            else:
+                # Claim multiple games at once; ordered queues continue after the last queued game
+                games = self.swipe_db.claim_unvoted_games(
+                    self.user_name, self.session_id, count, game_filter,
+                    after=self.queue_cursor,
+                    lease_seconds=self.config.get("reservation_lease_seconds", 900)
+                )
+
+            if not games:
                 return False
+
+            if game_filter.order != "random":
+                self.queue_cursor = games[-1]
+            queued_ids = {game['id'] for game in self.game_queue}
+            self.game_queue.extend(game for game in games if game['id'] not in queued_ids)
+            print(f"Preloaded {len(games)} unvoted games")
+            return True
+            
+        except Exception as e:
+            self.log_swipe_error("preloading games", e)
+            return False
     
     def load_next_from_queue(self):
         """Load the next game from the preloaded queue"""
         # If queue is empty or nearly empty, preload more games
-        if not hasattr(self, 'game_queue') or len(self.game_queue) < 2:
+        if len(self.game_queue) < 2:
             # Preload more games if we're running low
             self.preload_unvoted_games(10)
             
         if self.game_queue:
-            # Double-check that the first game in queue hasn't been voted on
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                skipped = 0
-                
-                while self.game_queue:
-                    candidate_game = self.game_queue[0]
-                    
-                    # Check if this game is still unvoted
-                    cursor.execute('''
-                        SELECT 1 FROM votes 
-                        WHERE game_id = ? AND user_name = ?
-                    ''', (candidate_game['id'], self.user_name))
-                    
-                    if cursor.fetchone():
-                        # This game has been voted on already, remove it from queue
-                        self.game_queue.pop(0)
-                        skipped += 1
-                        print(f"Skipped already voted game: {candidate_game['name']}")
-                    else:
-                        # Game is still unvoted, we can use it
-                        break
-                
-                if skipped > 0:
-                    print(f"Skipped {skipped} games that were already voted on")
-                    # Replenish the queue if we skipped games
-                    self.preload_unvoted_games(skipped)
-            
-            if self.game_queue:
-                # Get the next game from the queue
-                self.current_game = self.game_queue.pop(0)
-                self.entries = [self.current_game]  # For compatibility
-                
-                # Update UI with the new game
-                self.update_ui_fast()
-                return True
-            else:
-                # No more unvoted games
-                messagebox.showinfo("All Done", "You've voted on all available games!")
-                self.back_to_main_menu()
-                return False
+            # Queued games are reserved for this session, so no other session can vote on them
+            self.current_game = self.game_queue.pop(0)
+            self.entries = [self.current_game]  # For compatibility
+            
+            # Update UI with the new game
+            self.update_ui_fast()
+            if self.game_queue and self.viewer:
+                self.viewer.prefetch(self.game_queue[0]['steam_page_url'])
+            return True
         else:
             # No more unvoted games
-            messagebox.showinfo("All Done", "You've voted on all available games!")
+            self.show_info("All Done", "You've voted on all available games!")
             self.back_to_main_menu()
             return False
             
@@ -815,48 +5093,43 @@ class SteamGameVoter:
         return self.load_next_from_queue()
     
     def update_ui_fast(self):
-        """Update UI without recreating everything - much faster"""
-        if not hasattr(self, 'entry_label') or not self.entry_label:
-            return self.update_ui()
-            
-        entry = self.current_game if hasattr(self, 'current_game') else self.entries[self.current_index]
-        
-        # Update only the text content, don't recreate widgets
-        self.entry_label.config(
-            text=f"Game: {entry['name']}\nDeveloper: {entry['developers']}\nRelease Date: {entry['release_date']}"
-        )
-        
-        if hasattr(self, 'random_unvoted_mode') and self.random_unvoted_mode:
-            self.progress_label.config(text=f"Random Mode: {len(self.game_queue)} games queued")
+        """Show the current game; only the bound variables change"""
+        if self.merged_session:
+            entry = self.current_game
+            self.progress_var.set(f"Merged: {self.merged_session['voted']}/{self.merged_session['total']} voted")
+        elif self.random_unvoted_mode:
+            entry = self.current_game
+            self.progress_var.set(f"Random Mode: {len(self.game_queue)} games queued")
         else:
-            self.progress_label.config(text=f"Progress: {self.current_index + 1}/{len(self.entries)}")
+            entry = self.entries[self.current_index]
+            self.progress_var.set(f"Progress: {self.current_index + 1}/{len(self.entries)}")
+        self.entry_var.set(
+            f"Game: {entry['name']}\nDeveloper: {entry['developers']}\nRelease Date: {entry['release_date']}"
+        )
         
         # Load web page
         self.root.update()  # Update UI immediately before loading web page
+        self.shown_at = time.time()
         self.open_webpage(entry['steam_page_url'])
             
     def vote(self, value):
+        if self.maintenance:
+            self.maintenance.note_activity()
+            
         # In standard mode
-        if not hasattr(self, 'random_unvoted_mode') or not self.random_unvoted_mode:
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Record the vote
-                current_game = self.entries[self.current_index]
-                cursor.execute('''
-                    INSERT OR REPLACE INTO votes (game_id, user_name, vote, timestamp, exported)
-                    VALUES (?, ?, ?, CURRENT_TIMESTAMP, 0)
-                ''', (current_game['id'], self.user_name, value))
-                
-                # Update progress
-                self.current_index += 1
-                cursor.execute('''
-                    UPDATE progress 
-                    SET current_index = ?
-                    WHERE user_name = ? AND batch_name = ?
-                ''', (self.current_index, self.user_name, self.input_filename))
-                
-                conn.commit()
+        if not self.random_unvoted_mode:
+            # Record the vote and the new progress in one transaction
+            current_game = self.entries[self.current_index]
+            try:
+                self.db.record_vote(current_game['id'], self.user_name, value,
+                                    progress=(self.input_filename, self.current_index + 1),
+                                    timing=(self.shown_at, self.page_ready_at))
+            except (sqlite3.Error, VotingServerError) as e:
+                # Nothing was saved, so the game stays on screen to vote on again
+                self.log_swipe_error("recording vote", e)
+                self.show_error("Vote Error", f"Error recording vote: {str(e)}\nPlease vote again.")
+                return
+            self.current_index += 1
 
             if self.current_index < len(self.entries):
                 self.update_ui_fast()  # Use fast UI update
@@ -867,90 +5140,55 @@ class SteamGameVoter:
         else:
             # In random unvoted mode
             current_game = self.current_game
+            started = time.perf_counter()
             
-            with self.db.get_connection() as conn:
-                conn.isolation_level = 'EXCLUSIVE'  # Use transaction isolation for safety
-                cursor = conn.cursor()
-                
-                try:
-                    # Begin transaction
-                    cursor.execute('BEGIN EXCLUSIVE TRANSACTION')
-                    
-                    # First check if this game has already been voted on by another user or process
-                    cursor.execute('''
-                        SELECT id FROM votes 
-                        WHERE game_id = ? AND user_name = ?
-                    ''', (current_game['id'], self.user_name))
-                    
-                    existing_vote = cursor.fetchone()
-                    
-                    if existing_vote:
-                        # This game has already been voted on since we loaded it
-                        print(f"Game {current_game['name']} was already voted on! Skipping...")
-                        messagebox.showinfo("Already Voted", 
-                                          f"Game '{current_game['name']}' was already voted on by another session. Skipping to next game.")
-                    else:
-                        # Record the vote if not already voted
-                        cursor.execute('''
-                            INSERT INTO votes (game_id, user_name, vote, timestamp, exported)
-                            VALUES (?, ?, ?, CURRENT_TIMESTAMP, 0)
-                        ''', (current_game['id'], self.user_name, value))
-                        print(f"Recorded vote for game {current_game['name']}")
-                    
-                    # Commit transaction
-                    conn.commit()
-                except sqlite3.Error as e:
-                    # If anything goes wrong, roll back
-                    conn.rollback()
-                    print(f"Database error when voting: {e}")
-                    messagebox.showerror("Vote Error", 
-                                       f"Error recording vote: {str(e)}\nSkipping to next game.")
+            try:
+                if self.merged_session:
+                    self.db.record_merged_vote(current_game['id'], self.user_name, value,
+                                               self.merged_session['batch_names'],
+                                               timing=(self.shown_at, self.page_ready_at))
+                    self.merged_session['voted'] += 1
+                else:
+                    # The game was reserved for this session when it was queued
+                    self.swipe_db.record_vote(current_game['id'], self.user_name, value,
+                                              timing=(self.shown_at, self.page_ready_at))
+                print(f"Recorded vote for game {current_game['name']}")
+            except (sqlite3.Error, VotingServerError) as e:
+                self.log_swipe_error("recording vote", e)
+                self.show_error("Vote Error", 
+                                f"Error recording vote: {str(e)}\nSkipping to next game.")
+            
+            if self.recorder:
+                self.recorder.record("vote", game_id=current_game['id'], value=bool(value))
             
             # Get the next game from preloaded queue
-            self.load_next_from_queue()
+            if self.load_next_from_queue() and self.recorder:
+                # Time from the click until the next game page is ready
+                self.recorder.record("shown", game_id=self.current_game['id'],
+                                     latency_ms=round((time.perf_counter() - started) * 1000, 2),
+                                     page_load_ms=self.last_page_load_ms)
             
+    def log_swipe_error(self, action, error):
+        """Report an error the swipe loop recovers from on its own"""
+        print(f"Error {action}: {error}")
+
     def update_ui(self):
-        """Full UI update (slower but more comprehensive)"""
-        if hasattr(self, 'update_ui_fast') and hasattr(self, 'entry_label') and self.entry_label:
-            return self.update_ui_fast()
-            
-        if not hasattr(self, 'random_unvoted_mode') or not self.random_unvoted_mode:
-            entry = self.entries[self.current_index]
-            self.entry_label.config(
-                text=f"Game: {entry['name']}\nDeveloper: {entry['developers']}\nRelease Date: {entry['release_date']}"
-            )
-            self.progress_label.config(text=f"Progress: {self.current_index + 1}/{len(self.entries)}")
-            self.open_webpage(entry['steam_page_url'])
-        else:
-            # Random mode - just show the current game
-            entry = self.current_game
-            self.entry_label.config(
-                text=f"Game: {entry['name']}\nDeveloper: {entry['developers']}\nRelease Date: {entry['release_date']}"
-            )
-            
-            # Show how many games are queued
-            queue_count = len(self.game_queue) if hasattr(self, 'game_queue') else 0
-            self.progress_label.config(text=f"Random Mode: {queue_count} games queued")
-            
-            self.open_webpage(entry['steam_page_url'])
+        """Show the current game (the swipe screen is persistent, so this is update_ui_fast)"""
+        return self.update_ui_fast()
             
     def open_webpage(self, url):
-        """Load a web page in the browser"""
-        if self.driver is None:
-            self.initialize_browser()
-            
+        """Show a game's page with the configured viewer backend"""
+        started = time.perf_counter()
+        self.page_ready_at = None
         try:
-            # Set a page load timeout to prevent hanging
-            self.driver.set_page_load_timeout(10)
-            self.driver.get(url)
-            
-            # Wait for the body element to appear (faster than waiting for full page load)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            if self.viewer is None:
+                self.viewer = self.create_viewer()
+            if self.viewer.open(url) is not False:
+                self.page_ready_at = time.time()
         except Exception as e:
             print(f"Error loading web page: {e}")
             # Don't show error dialog as it would interrupt flow
+        self.last_page_load_ms = round((time.perf_counter() - started) * 1000, 2)
 
     def save_progress(self):
         """Save current progress to database"""
@@ -990,6 +5228,33 @@ class SteamGameVoter:
                 return True
         return False
 
+    def export_ranking_report(self, batch_names):
+        """Write the team's ranked shortlist for the batches to the data folder"""
+        try:
+            games, users, summary = build_ranking_report(*self.db.fetch_vote_columns(batch_names))
+        except ImportError:
+            messagebox.showerror("NumPy Required", "Ranking reports need NumPy (pip install numpy).")
+            return
+        if not summary["votes"]:
+            messagebox.showinfo("No Votes", "Nobody has voted on these batches yet.")
+            return
+            
+        data_folder = Path('data')
+        data_folder.mkdir(exist_ok=True)
+        report_path = data_folder / f"{'_'.join(batch_names)[:80]}_ranking.csv"
+        written = write_ranking_report(report_path, games, self.db.get_game_details(batch_names))
+        
+        user_lines = "\n".join(
+            f"{name}: {votes} votes, {yes_rate:.0%} yes"
+            + ("" if math.isnan(agreement) else f", agrees with the team {agreement:.0%}")
+            for name, votes, yes_rate, agreement in zip(users["user_name"], users["votes"],
+                                                        users["yes_rate"], users["agreement"])
+        )
+        messagebox.showinfo(
+            "Ranking Report Saved",
+            f"Ranked {written} games from {summary['votes']} votes into {report_path.absolute()}\n\n{user_lines}"
+        )
+
     def export_results(self):
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
@@ -1040,47 +5305,70 @@ class SteamGameVoter:
                 f"Results have been saved to '{yes_filename}' and '{no_filename}' in {data_folder.absolute()}"
             )
 
-    def initialize_browser(self):
-        if self.driver is None:
-            browser_choice = self.browser_var.get()
-            if browser_choice == "Chrome":
-                options = ChromeOptions()
-                self.driver = webdriver.Chrome(options=options)
-            elif browser_choice == "Firefox":
-                options = FirefoxOptions()
-                self.driver = webdriver.Firefox(options=options)
-            elif browser_choice == "Edge":
-                options = EdgeOptions()
-                self.driver = webdriver.Edge(options=options)
-            else:
-                raise ValueError(f"Unsupported browser choice: {browser_choice}")
-            
-            self.driver.maximize_window()
+    def create_viewer(self):
+        """Build the page viewer backend selected in the UI / config"""
+        backend = self.viewer_var.get()
+        if backend == "selenium":
+            browser_name = self.browser_var.get()
+            return SeleniumViewer(browser_name, profile=BrowserProfile.from_config(self.config, browser_name),
+                                  watchdog_interval=self.config.get("browser_watchdog_seconds", 2.0),
+                                  probe_timeout=self.config.get("browser_probe_timeout", 2.0))
+        if backend == "system":
+            return SystemBrowserViewer()
+        if backend == "preview":
+            return PreviewViewer(self.show_preview, self.preview_cache_dir())
+        return NullViewer()
     
-    def change_browser(self):
-        if self.driver:
-            self.driver.quit()
-        self.driver = None
-        self.update_ui()  # This will cause the new browser to be initialized
+    def preview_cache_dir(self):
+        """Directory of the cached Steam appdetails used by the in-app and grid previews"""
+        return self.config.get("preview_cache_dir") or os.path.join(
+            os.path.dirname(os.path.abspath(sys.argv[0])), "preview_cache")
+    
+    def show_preview(self, text):
+        """Show store details from the in-app preview viewer"""
+        self.preview_var.set(text)
+    
+    def change_viewer(self):
+        """Switch browser or viewer backend and show the current game with it"""
+        if self.viewer:
+            self.viewer.close()
+        self.viewer = None
+        self.show_preview("")
+        self.save_config()
+        self.update_ui()  # This will cause the new viewer to be created
+
+    def release_reservations(self):
+        """Hand back games still reserved by this swipe session"""
+        session_id = self.session_id
+        if not session_id or self.swipe_db is None:
+            return
+        try:
+            self.swipe_db.release_reservations(session_id)
+        except (sqlite3.Error, VotingServerError) as e:
+            # Leases expire on their own, so this is not fatal
+            print(f"Error releasing reservations: {e}")
+        if self.swipe_db is not self.db:
+            self.swipe_db.close()
+        self.swipe_db = None
+        self.session_id = None
+        self.game_queue = []
 
     def close_application(self):
-        if self.driver:
-            self.driver.quit()
+        self.stop_session_trace()
+        self.release_reservations()
+        if self.maintenance:
+            self.maintenance.stop()
+        if self.viewer:
+            self.viewer.close()
+        if self.grid_previewer:
+            self.grid_previewer.close()
         # Save config before closing
         self.save_config()
         self.root.quit()
         self.root.destroy()
 
-    def create_ui(self):
-        # Clear the root window first
-        for widget in self.root.winfo_children():
-            widget.destroy()
-            
-        self.root.configure(bg='#f0f0f0')
-        self.root.grid_rowconfigure(0, weight=1)
-        self.root.grid_columnconfigure(0, weight=1)
-
-        main_frame = tk.Frame(self.root, bg='#f0f0f0')
+    def build_swipe_screen(self, screen):
+        main_frame = tk.Frame(screen, bg='#f0f0f0')
         main_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
         main_frame.grid_rowconfigure(0, weight=1)
         main_frame.grid_columnconfigure(0, weight=1)
@@ -1089,11 +5377,17 @@ class SteamGameVoter:
         info_frame = tk.Frame(main_frame, bg='white', bd=2, relief=tk.RAISED)
         info_frame.grid(row=0, column=0, sticky="nsew", pady=(0, 10))
 
-        self.entry_label = tk.Label(info_frame, text="", wraplength=340, justify="center", bg='white', font=('Arial', 12))
-        self.entry_label.pack(pady=10, expand=True)
+        entry_label = tk.Label(info_frame, textvariable=self.entry_var, wraplength=340, justify="center",
+                               bg='white', font=('Arial', 12))
+        entry_label.pack(pady=10, expand=True)
+        
+        # Store details, filled in by the in-app preview viewer
+        preview_label = tk.Label(info_frame, textvariable=self.preview_var, wraplength=440, justify="left",
+                                 bg='white', font=('Arial', 9))
+        preview_label.pack(padx=10, pady=(0, 10), fill=tk.X)
 
-        self.progress_label = tk.Label(main_frame, text="", bg='#f0f0f0', font=('Arial', 10))
-        self.progress_label.grid(row=1, column=0, sticky="ew")
+        progress_label = tk.Label(main_frame, textvariable=self.progress_var, bg='#f0f0f0', font=('Arial', 10))
+        progress_label.grid(row=1, column=0, sticky="ew")
 
         # Button frame
         button_frame = tk.Frame(main_frame, bg='#f0f0f0')
@@ -1126,24 +5420,75 @@ class SteamGameVoter:
         browsers = [("Chrome", "Chrome"), ("Firefox", "Firefox"), ("Edge", "Edge")]
         for text, value in browsers:
             tk.Radiobutton(browser_frame, text=text, variable=self.browser_var, value=value, 
-                           command=self.change_browser, bg='#f0f0f0', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+                           command=self.change_viewer, bg='#f0f0f0', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        
+        # Viewer backend frame (the browser choice above applies to the Selenium viewer)
+        viewer_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        viewer_frame.grid(row=6, column=0, sticky="ew", pady=(5, 0))
+        
+        tk.Label(viewer_frame, text="Show page in:", bg='#f0f0f0', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        for text, value in VIEWER_BACKENDS:
+            tk.Radiobutton(viewer_frame, text=text, variable=self.viewer_var, value=value,
+                           command=self.change_viewer, bg='#f0f0f0', font=('Arial', 9)).pack(side=tk.LEFT)
         
         # Always on top checkbutton
         always_on_top_check = tk.Checkbutton(main_frame, text="Keep this window in foreground", variable=self.always_on_top_var,
                                              command=self.toggle_always_on_top, bg='#f0f0f0', font=('Arial', 10))
         always_on_top_check.grid(row=5, column=0, sticky="w", pady=(10, 0))
+        
+        # Mode banner, placed over the top of the screen by show_mode_label
+        self.mode_label = tk.Label(screen, textvariable=self.mode_var,
+                                   bg='#E91E63', fg='white', font=('Arial', 10, 'bold'))
+
+    def build_grid_screen(self, screen):
+        main_frame = tk.Frame(screen, bg='#f0f0f0')
+        main_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+        main_frame.grid_rowconfigure(0, weight=1)
+        main_frame.grid_columnconfigure(0, weight=1)
+        
+        # Tiles for the largest page; swipe_grid lays out as many as the page size
+        tile_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        tile_frame.grid(row=0, column=0, sticky="nsew")
+        for column in range(3):
+            tile_frame.grid_columnconfigure(column, weight=1, uniform="tile")
+        self.grid_tiles = []
+        for index in range(GRID_PAGE_SIZES[1]):
+            frame = tk.Frame(tile_frame, bg='white', bd=2, relief=tk.RAISED)
+            tile = {"frame": frame, "title": tk.StringVar(), "details": tk.StringVar(),
+                    "vote": tk.BooleanVar(value=False)}
+            tk.Label(frame, textvariable=tile["title"], wraplength=150, justify="left",
+                     bg='white', font=('Arial', 9, 'bold')).pack(padx=4, pady=(4, 0), anchor="w")
+            tk.Label(frame, textvariable=tile["details"], wraplength=150, justify="left",
+                     bg='white', fg='#555555', font=('Arial', 8)).pack(padx=4, anchor="w", fill=tk.X, expand=True)
+            tile["toggle"] = tk.Checkbutton(frame, text="Yes", variable=tile["vote"], indicatoron=False,
+                                            selectcolor='#4CAF50', bg='#ffcdd2', width=6, font=('Arial', 9))
+            tile["toggle"].pack(pady=4)
+            self.grid_tiles.append(tile)
+        
+        grid_label = tk.Label(main_frame, textvariable=self.grid_var, bg='#f0f0f0', font=('Arial', 10))
+        grid_label.grid(row=1, column=0, sticky="ew", pady=(5, 0))
+        
+        commit_button = tk.Button(main_frame, text="Commit Page", command=self.commit_grid_page,
+                                  width=15, bg='#4CAF50', fg='white', font=('Arial', 10))
+        commit_button.grid(row=2, column=0, sticky="ew", pady=5)
+        
+        back_button = tk.Button(main_frame, text="Back to Main Menu", command=self.back_to_main_menu,
+                                width=15, bg='#2196F3', fg='white', font=('Arial', 10))
+        back_button.grid(row=3, column=0, sticky="ew", pady=(0, 10))
 
     def back_to_main_menu(self):
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+        if self.viewer:
+            self.viewer.close()
+            self.viewer = None
             
-        # Reset random mode flag if it exists
-        if hasattr(self, 'random_unvoted_mode'):
-            self.random_unvoted_mode = False
+        self.random_unvoted_mode = False
+        self.merged_session = None
+        self.grid_games = []
+        self.stop_session_trace()
+        self.release_reservations()
         
         self.save_progress()
-        self.create_initial_ui()
+        self.show_menu()
 
     def toggle_always_on_top(self):
         self.root.attributes('-topmost', self.always_on_top_var.get())
@@ -1153,12 +5498,15 @@ class SteamGameVoter:
     def select_file(self):
         if not self.ensure_db_connection():
             return
+        if not self.require_local_database():
+            return
             
         file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
         if file_path:
             self.read_file(file_path)
             if self.entries:
-                self.create_ui()
+                self.random_unvoted_mode = False
+                self.show_swipe_screen()
                 if not self.load_progress():
                     self.current_index = 0
                 self.update_ui()
@@ -1172,11 +5520,13 @@ class SteamGameVoter:
         if not self.ensure_db_connection():
             messagebox.showerror("Error", "Please connect to a database first.")
             return
+        if not self.require_local_database():
+            return
             
         # Create a confirmation dialog
         confirm_window = tk.Toplevel(self.root)
         confirm_window.title("Confirm Complete Wipe")
-        confirm_window.geometry("450x300")
+        confirm_window.geometry("450x340")
         confirm_window.transient(self.root)
         confirm_window.grab_set()
         
@@ -1202,7 +5552,15 @@ class SteamGameVoter:
             variable=confirm_var,
             bg='#ffebee'
         )
-        confirm_check.pack(pady=(0, 20))
+        confirm_check.pack(pady=(0, 5))
+        
+        snapshot_var = tk.BooleanVar(value=self.config.get("snapshot_before_wipe", True))
+        tk.Checkbutton(
+            warning_frame,
+            text="Take a snapshot first (can be restored from Database Maintenance)",
+            variable=snapshot_var,
+            bg='#ffebee'
+        ).pack(pady=(0, 15))
         
         # Buttons frame
         button_frame = tk.Frame(warning_frame, bg='#ffebee')
@@ -1214,7 +5572,7 @@ class SteamGameVoter:
         def on_confirm():
             if confirm_var.get():
                 confirm_window.destroy()
-                self.wipe_database()
+                self.wipe_database(take_snapshot=snapshot_var.get())
             else:
                 messagebox.showinfo("Confirmation Required", "Please check the confirmation box to proceed.")
         
@@ -1238,49 +5596,159 @@ class SteamGameVoter:
         )
         wipe_button.pack(side=tk.RIGHT, padx=10)
         
-    def wipe_database(self):
-        """Completely wipe votes and games from the database"""
+    def wipe_database(self, take_snapshot=None):
+        """Completely wipe votes and games from the database, after a snapshot if configured"""
+        if take_snapshot is None:
+            take_snapshot = self.config.get("snapshot_before_wipe", True)
+        snapshot_note = ""
+        if take_snapshot:
+            try:
+                self.status_var.set("Creating snapshot before wipe...")
+                self.root.update_idletasks()
+                snapshot_path = self.db.create_snapshot(self.config.get("snapshot_dir"),
+                                                        keep=self.config.get("snapshot_retention", 10))
+                snapshot_note = f"\n\nA snapshot was saved first: {os.path.basename(snapshot_path)}"
+            except (sqlite3.Error, OSError) as e:
+                print(f"Snapshot before wipe failed: {e}")
+                if not messagebox.askyesno("Snapshot Failed",
+                                           f"Could not snapshot the database: {str(e)}\n\nWipe anyway?"):
+                    return
         try:
-            with self.db.get_connection() as conn:
-                conn.isolation_level = 'EXCLUSIVE'  # Use transaction isolation
-                cursor = conn.cursor()
-                
-                try:
-                    # Begin transaction
-                    cursor.execute('BEGIN EXCLUSIVE TRANSACTION')
-                    
-                    # Get counts before wiping
-                    cursor.execute("SELECT COUNT(*) FROM votes")
-                    vote_count = cursor.fetchone()[0]
-                    
-                    cursor.execute("SELECT COUNT(*) FROM games")
-                    game_count = cursor.fetchone()[0]
-                    
-                    # Delete everything
-                    cursor.execute("DELETE FROM votes")
-                    cursor.execute("DELETE FROM games")
-                    cursor.execute("DELETE FROM progress")
-                    
-                    # Commit the transaction
-                    conn.commit()
-                    
-                    messagebox.showinfo(
-                        "Database Wiped", 
-                        f"Successfully wiped the database:\n• Deleted {vote_count} votes\n• Deleted {game_count} games\n• Reset all progress\n\nThe database is now empty and ready for new games."
-                    )
-                    self.status_label.config(text=f"Wiped database: {vote_count} votes, {game_count} games")
-                    print(f"Wiped database: {vote_count} votes, {game_count} games")
-                    
-                except sqlite3.Error as e:
-                    # If anything goes wrong, roll back
-                    conn.rollback()
-                    print(f"Database error during wipe: {e}")
-                    messagebox.showerror("Wipe Error", f"Error wiping database: {str(e)}")
-                    
+            vote_count, game_count = self.db.reset_database()
+            
+            messagebox.showinfo(
+                "Database Wiped", 
+                f"Successfully wiped the database:\n• Deleted {vote_count} votes\n• Deleted {game_count} games\n• Reset all progress\n\nThe database is now empty and ready for new games.{snapshot_note}"
+            )
+            self.status_var.set(f"Wiped database: {vote_count} votes, {game_count} games")
+            print(f"Wiped database: {vote_count} votes, {game_count} games")
+            
+        except sqlite3.OperationalError as e:
+            if not is_lock_error(str(e)):
+                print(f"Database error during wipe: {e}")
+                messagebox.showerror("Wipe Error", f"Error wiping database: {str(e)}")
+                return
+            print(f"Database busy during wipe: {e}")
+            messagebox.showerror(
+                "Database Busy",
+                "Another session is writing to the database, so it was not wiped and nothing "
+                f"was changed.\n\nTry again when the other sessions are idle.{snapshot_note}"
+            )
+        except sqlite3.Error as e:
+            print(f"Database error during wipe: {e}")
+            messagebox.showerror("Wipe Error", f"Error wiping database: {str(e)}")
         except Exception as e:
             print(f"Error wiping database: {e}")
             messagebox.showerror("Error", f"Failed to wipe database: {str(e)}")
             
+    def archive_batch_with_dialog(self, batch_name, purge_after=False):
+        """Ask for an archive file and copy a batch into it, optionally purging it afterwards"""
+        archive_path = filedialog.asksaveasfilename(
+            title=f"Archive Batch '{batch_name}'",
+            defaultextension=".db",
+            filetypes=[("SQLite Database", "*.db"), ("All Files", "*.*")],
+            initialfile=f"{batch_name}_archive_{datetime.now().strftime('%Y%m%d')}.db",
+            confirmoverwrite=False
+        )
+        if not archive_path:
+            return False
+            
+        try:
+            vote_count, game_count = self.db.archive_batch(batch_name, archive_path)
+            if purge_after:
+                self.db.purge_batch(batch_name)
+            action = "Archived and purged" if purge_after else "Archived"
+            messagebox.showinfo(
+                "Batch Archived",
+                f"{action} '{batch_name}' ({game_count} games, {vote_count} votes) to {os.path.basename(archive_path)}"
+            )
+            self.status_var.set(f"{action} batch: {batch_name}")
+            return True
+        except sqlite3.Error as e:
+            print(f"Error archiving batch {batch_name}: {e}")
+            messagebox.showerror("Archive Error", f"Error archiving batch: {str(e)}")
+            return False
+            
+    def export_swipe_pack_with_dialog(self, batch_names):
+        """Ask for a pack file and export the batches with this user's votes for offline swiping"""
+        pack_path = filedialog.asksaveasfilename(
+            title="Export Swipe Pack",
+            defaultextension=".db",
+            filetypes=[("SQLite Database", "*.db"), ("All Files", "*.*")],
+            initialfile=f"{'_'.join(batch_names)[:60]}_pack_{self.user_name}.db"
+        )
+        if not pack_path:
+            return False
+            
+        try:
+            if os.path.exists(pack_path):
+                os.remove(pack_path)  # Overwriting was confirmed in the file dialog
+            game_count, vote_count, preview_count = self.db.export_swipe_pack(
+                pack_path, batch_names, self.user_name, preview_cache_dir=self.preview_cache_dir()
+            )
+        except (sqlite3.Error, OSError, ValueError) as e:
+            print(f"Error exporting swipe pack: {e}")
+            messagebox.showerror("Export Error", f"Error exporting swipe pack: {str(e)}")
+            return False
+        messagebox.showinfo(
+            "Swipe Pack Exported",
+            f"Exported {game_count} games, {vote_count} of your votes and {preview_count} store previews "
+            f"to {os.path.basename(pack_path)}.\n\nOpen the pack with Open Database to swipe offline, "
+            "then merge it back with Merge Swipe Pack."
+        )
+        self.status_var.set(f"Exported swipe pack: {os.path.basename(pack_path)}")
+        return True
+        
+    def merge_swipe_pack_with_dialog(self):
+        """Merge the votes cast in an offline swipe pack into the current database"""
+        if not self.ensure_db_connection():
+            messagebox.showerror("Error", "Please connect to a database first.")
+            return
+        if not self.require_local_database():
+            return
+            
+        pack_path = filedialog.askopenfilename(
+            title="Merge Swipe Pack",
+            filetypes=[("SQLite Database", "*.db"), ("All Files", "*.*")]
+        )
+        if not pack_path:
+            return
+        if os.path.abspath(pack_path) == os.path.abspath(self.db_path):
+            messagebox.showerror("Merge Error", "Open the main database first, then merge the pack into it.")
+            return
+            
+        try:
+            result = self.db.merge_swipe_pack(pack_path)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error merging swipe pack: {e}")
+            messagebox.showerror("Merge Error", f"Error merging swipe pack: {str(e)}")
+            return
+        messagebox.showinfo(
+            "Swipe Pack Merged",
+            f"Merged {result['merged']} votes from {os.path.basename(pack_path)}.\n"
+            f"{result['unchanged']} votes were unchanged or older than the ones in the database, "
+            f"{result['unmatched']} were for games no longer in the database."
+        )
+        self.status_var.set(f"Merged {result['merged']} votes from swipe pack")
+            
+    def purge_batch_with_confirmation(self, batch_name):
+        """Delete a single batch after confirmation"""
+        if not messagebox.askyesno(
+            "Purge Batch",
+            f"Delete batch '{batch_name}' with all its votes and progress?\n\nThis action cannot be undone."
+        ):
+            return False
+            
+        try:
+            vote_count, game_count = self.db.purge_batch(batch_name)
+            messagebox.showinfo("Batch Purged", f"Deleted {game_count} games and {vote_count} votes from '{batch_name}'")
+            self.status_var.set(f"Purged batch: {batch_name}")
+            return True
+        except sqlite3.Error as e:
+            print(f"Error purging batch {batch_name}: {e}")
+            messagebox.showerror("Purge Error", f"Error purging batch: {str(e)}")
+            return False
+            
     def export_and_wipe(self):
         """Export votes and then wipe the database"""
         # First export all votes
@@ -1290,11 +5758,615 @@ class SteamGameVoter:
         if messagebox.askyesno("Wipe Database", "Export complete. Do you want to completely wipe the database now (delete all votes AND games)?"):
             self.wipe_votes_with_confirmation()
 
+class HeadlessVariable:
+    """Tk-free stand-in for the StringVars the screens are bound to"""
+    def __init__(self, value=""):
+        self.value = value
+        
+    def get(self):
+        return self.value
+        
+    def set(self, value):
+        self.value = value
+
+class HeadlessWidget:
+    """Tk-free stand-in for the window the swipe loop updates"""
+    def update(self):
+        pass
+        
+    def quit(self):
+        pass
+        
+    def destroy(self):
+        pass
+
+class HeadlessVoter(SteamGameVoter):
+    """Drives the SteamGameVoter swipe loop without Tk, against a StubWebDriver
+
+    Dialogs are printed and collected in self.messages instead of shown, and
+    errors the swipe loop recovers from are collected in self.errors.
+    viewer_backend "none" leaves out the page viewer altogether.
+    """
+    def __init__(self, db, user_name="replay", page_load_ms=0, jitter_ms=0, seed=None, viewer_backend="selenium"):
+        self.root = HeadlessWidget()
+        self.entries = []
+        self.current_index = 0
+        self.fieldnames = []
+        self.input_filename = ""
+        self.process_completed = False
+        self.user_name = user_name
+        self.random_unvoted_mode = False
+        self.current_game = None
+        self.game_queue = []
+        self.game_filter = None
+        self.queue_cursor = None
+        self.session_id = None
+        self.swipe_db = None
+        self.merged_session = None
+        self.grid_games = []
+        self.grid_previewer = None
+        self.status_var = HeadlessVariable("Ready")
+        self.db_var = HeadlessVariable()
+        self.entry_var = HeadlessVariable()
+        self.progress_var = HeadlessVariable()
+        self.mode_var = HeadlessVariable()
+        self.preview_var = HeadlessVariable()
+        self.grid_var = HeadlessVariable()
+        self.config = DEFAULT_CONFIG.copy()
+        self.db_path = getattr(db, 'db_path', None)
+        self.db = db
+        self.maintenance = None
+        self.recorder = None
+        self.last_page_load_ms = None
+        self.shown_at = None
+        self.page_ready_at = None
+        self.messages = []
+        self.errors = []
+        self.viewer_backend = viewer_backend
+        self.driver_options = (page_load_ms, jitter_ms, seed)
+        self.viewer = None
+        
+    def create_viewer(self):
+        if self.viewer_backend == "none":
+            return NullViewer()
+        return SeleniumViewer(driver_factory=lambda: StubWebDriver(*self.driver_options))
+            
+    def show_menu(self):
+        pass
+        
+    def show_swipe_screen(self):
+        self.mode_var.set("")
+        
+    def show_mode_label(self, mode_text):
+        self.mode_var.set(mode_text)
+        self.messages.append(("Mode", mode_text))
+        
+    def show_info(self, title, message):
+        print(f"{title}: {message}")
+        self.messages.append((title, message))
+        
+    def show_error(self, title, message):
+        print(f"{title}: {message}")
+        self.messages.append((title, message))
+        
+    def log_swipe_error(self, action, error):
+        print(f"Error {action}: {error}")
+        self.errors.append((action, str(error)))
+        
+    def save_config(self):
+        pass
+
+def replay_session(events, voter, think_time_scale=0.0):
+    """Replay a session trace against a voter; returns click-to-next-page latencies in ms
+
+    Votes are replayed by position, not by game id, so a trace can be replayed
+    against any database. With think_time_scale > 0 the recorded pauses between
+    actions are kept (scaled), otherwise actions run back to back.
+    """
+    latencies = []
+    previous_t = None
+    for event in events:
+        if think_time_scale and previous_t is not None:
+            time.sleep(max(0.0, (event.get("t", previous_t) - previous_t) * think_time_scale))
+        previous_t = event.get("t", previous_t)
+        
+        action = event.get("action")
+        if action == "swipe":
+            voter.swipe_unvoted_games(GameFilter.from_dict(event.get("filter") or {}))
+        elif action == "vote":
+            if not voter.random_unvoted_mode:
+                continue  # Out of games, or the trace voted before swiping
+            started = time.perf_counter()
+            voter.vote(event.get("value", True))
+            latencies.append((time.perf_counter() - started) * 1000)
+        elif action == "stop" and voter.random_unvoted_mode:
+            voter.back_to_main_menu()
+    return latencies
+
+def latency_summary(latencies):
+    """Count, mean and nearest-rank percentiles of a list of latencies in ms"""
+    if not latencies:
+        return {"count": 0}
+    ordered = sorted(latencies)
+    def percentile(p):
+        return round(ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))], 2)
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 2),
+        "p50": percentile(50),
+        "p95": percentile(95),
+        "p99": percentile(99),
+        "max": round(ordered[-1], 2),
+    }
+
+def run_load_worker(db_path, worker_index, options):
+    """One load-test voter process; returns its vote latencies (ms) and swipe errors
+
+    Runs the real swipe loop (preload, vote, load next) through a HeadlessVoter as
+    user "<user_prefix><worker_index>", at options["rate"] votes per second
+    (0 = as fast as possible), from options["start_at"] for options["duration"] seconds.
+    """
+    db = DatabaseManager(db_path, timeout=options["timeout"])
+    voter = HeadlessVoter(db, user_name=f"{options['user_prefix']}{worker_index}",
+                          page_load_ms=options["page_load_ms"], jitter_ms=options["jitter_ms"],
+                          seed=worker_index, viewer_backend=options["viewer"])
+    voter.config["session_cache"] = options["session_cache"]
+    rng = random.Random(worker_index)
+    interval = 1.0 / options["rate"] if options["rate"] else 0.0
+    latencies = []
+    requeues = 0
+    
+    time.sleep(max(0.0, options["start_at"] - time.time()))
+    deadline = time.perf_counter() + options["duration"]
+    next_vote = time.perf_counter()
+    # The swipe loop prints every vote; keep the workers' output readable
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        voter.swipe_unvoted_games()
+        while time.perf_counter() < deadline:
+            if not voter.random_unvoted_mode:
+                # The queue ran dry: out of games, or refilling it failed on a lock
+                requeues += 1
+                error_count = len(voter.errors)
+                voter.swipe_unvoted_games()
+                if not voter.random_unvoted_mode:
+                    if len(voter.errors) == error_count:
+                        break  # Voted on every game
+                    continue
+            if interval:
+                time.sleep(max(0.0, next_vote - time.perf_counter()))
+                next_vote += interval
+            started = time.perf_counter()
+            voter.vote(rng.random() < 0.3)
+            latencies.append((time.perf_counter() - started) * 1000)
+        voter.close_application()
+    return {"worker": worker_index, "latencies": latencies, "errors": voter.errors, "requeues": requeues}
+
+def is_lock_error(message):
+    """True for SQLite's 'database is locked' / 'database table is locked' errors"""
+    return "is locked" in message
+
+def build_ranking_report(game_ids, user_index, votes, user_names, min_votes=1, confidence=0.95):
+    """Rank games from columnar vote data (one entry per vote) with NumPy
+
+    Returns (games, users, summary); games and users are dicts of equal-length arrays.
+    """
+    import numpy as np  # Only needed for reports
+    
+    game_ids = np.asarray(game_ids, dtype=np.int64)
+    user_index = np.asarray(user_index, dtype=np.int64)
+    votes = np.asarray(votes, dtype=np.float64)
+    unique_games, game_index = np.unique(game_ids, return_inverse=True)
+    game_count, user_count = len(unique_games), len(user_names)
+    
+    n = np.bincount(game_index, minlength=game_count).astype(np.float64)
+    yes = np.bincount(game_index, weights=votes, minlength=game_count)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = yes / n
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        z2 = z * z
+        # Lower bound of the Wilson score interval, so 3 of 3 yes votes do not outrank 40 of 45
+        wilson_lower = (rate + z2 / (2 * n) - z * np.sqrt(rate * (1 - rate) / n + z2 / (4 * n * n))) / (1 + z2 / n)
+        
+        user_votes = np.bincount(user_index, minlength=user_count).astype(np.float64)
+        user_rate = np.bincount(user_index, weights=votes, minlength=user_count) / user_votes
+        team_rate = votes.mean() if len(votes) else 0.0
+        # Yes rate with each voter's bias (their own yes rate minus the team's) taken out
+        adjusted_rate = np.clip(
+            np.bincount(game_index, weights=votes - user_rate[user_index], minlength=game_count) / n + team_rate,
+            0.0, 1.0
+        )
+        
+        # Pairs of voters that agree, out of all pairs (Fleiss' per-item agreement)
+        pairs = n * (n - 1)
+        agreement = np.where(pairs > 0, (yes * (yes - 1) + (n - yes) * (n - yes - 1)) / pairs, np.nan)
+        # Fleiss' kappa over the games with at least two votes
+        rated = pairs > 0
+        expected = team_rate ** 2 + (1 - team_rate) ** 2
+        observed = agreement[rated].mean() if rated.any() else np.nan
+        team_kappa = (observed - expected) / (1 - expected) if expected < 1 else np.nan
+        
+        # Does each vote side with the majority of the other voters on the game? (ties left out)
+        others_yes = yes[game_index] - votes
+        others_majority = np.sign(2 * others_yes - (n[game_index] - 1))
+        compared = others_majority != 0
+        agrees = compared & ((others_majority > 0) == (votes > 0.5))
+        user_compared = np.bincount(user_index, weights=compared, minlength=user_count)
+        user_agreement = np.bincount(user_index, weights=agrees, minlength=user_count) / user_compared
+        
+    keep = np.flatnonzero(n >= min_votes)
+    # Best first by wilson_lower, then adjusted_rate
+    order = keep[np.lexsort((-adjusted_rate[keep], -wilson_lower[keep]))]
+    games = {
+        "game_id": unique_games[order],
+        "votes": n[order].astype(np.int64),
+        "yes": yes[order].astype(np.int64),
+        "yes_rate": rate[order],
+        "wilson_lower": wilson_lower[order],
+        "adjusted_rate": adjusted_rate[order],
+        "agreement": agreement[order],
+    }
+    users = {
+        "user_name": np.asarray(user_names, dtype=object),
+        "votes": user_votes.astype(np.int64),
+        "yes_rate": user_rate,
+        "agreement": user_agreement,
+    }
+    summary = {
+        "votes": int(len(votes)),
+        "games": int(game_count),
+        "ranked_games": int(len(order)),
+        "users": int(user_count),
+        "team_yes_rate": round(float(team_rate), 4),
+        "team_kappa": None if np.isnan(team_kappa) else round(float(team_kappa), 4),
+    }
+    return games, users, summary
+
+def write_ranking_report(path, games, details, top=None):
+    """Write ranked games (from build_ranking_report) with their details to a CSV file"""
+    count = len(games["game_id"]) if top is None else min(top, len(games["game_id"]))
+    columns = {key: values[:count].tolist() for key, values in games.items()}
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["rank", "name", "developers", "release_date", "steam_page_url", "batch_name",
+                         "votes", "yes", "yes_rate", "wilson_lower", "adjusted_rate", "agreement"])
+        for rank in range(count):
+            game_id = columns["game_id"][rank]
+            writer.writerow(
+                [rank + 1, *details.get(game_id, ("", "", "", "", ""))]
+                + [columns["votes"][rank], columns["yes"][rank]]
+                + ["" if math.isnan(value) else round(value, 4)  # NaN: fewer than two votes
+                   for value in (columns["yes_rate"][rank], columns["wilson_lower"][rank],
+                                 columns["adjusted_rate"][rank], columns["agreement"][rank])]
+            )
+    return count
+
+def run_server(args):
+    """Run the local voting server in front of a database file"""
+    db = DatabaseManager(args.db)
+    maintenance = DatabaseMaintenance(db)
+    maintenance.start()
+    server = VotingServer(db, host=args.host, port=args.port, maintenance=maintenance)
+    try:
+        server.run()
+    finally:
+        maintenance.stop()
+
+def run_export_votes(args):
+    """Export vote events past a consumer's watermark to CSV, then advance the watermark"""
+    db = DatabaseManager(args.db)
+    rows, high_seq = db.fetch_vote_events(args.consumer, user_name=args.user, yes_only=not args.all_votes)
+    
+    export_fields = ['seq', 'user_name', 'vote', 'timestamp', 'name', 'developers',
+                     'release_date', 'steam_page_url', 'batch_name']
+    with open(args.output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=export_fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: row.get(k, '') for k in export_fields})
+            
+    db.set_export_watermark(args.consumer, high_seq)
+    print(f"Exported {len(rows)} vote events for consumer '{args.consumer}' to {args.output} (watermark {high_seq})")
+
+def run_snapshot(args):
+    """Take an online snapshot of a database, e.g. from a scheduled job"""
+    db = DatabaseManager(args.db)
+    snapshot_path = db.create_snapshot(args.dir, keep=args.keep)
+    print(f"Snapshot written to {snapshot_path}")
+
+def run_replay(args):
+    """Replay a recorded (or synthetic) swipe session headlessly and report latencies"""
+    if args.trace:
+        events = load_session_trace(args.trace)
+    else:
+        events = [{"t": 0.0, "action": "swipe", "filter": {}}]
+        events += [{"t": 0.0, "action": "vote", "value": i % 3 == 0} for i in range(args.votes)]
+        events.append({"t": 0.0, "action": "stop"})
+        
+    temp_dir = None
+    if args.db:
+        db = DatabaseManager(args.db)
+    else:
+        temp_dir = tempfile.mkdtemp(prefix="steam_tinder_replay_")
+        db, imported = generate_synthetic_database(os.path.join(temp_dir, "replay.db"), args.synthetic)
+        print(f"Generated synthetic database with {imported} games in {temp_dir}")
+        
+    voter = HeadlessVoter(db, user_name=args.user, page_load_ms=args.page_load_ms,
+                          jitter_ms=args.jitter_ms, seed=args.seed, viewer_backend=args.viewer)
+    voter.config["session_cache"] = args.session_cache
+    started = time.perf_counter()
+    latencies = replay_session(events, voter, think_time_scale=args.think_time)
+    elapsed = time.perf_counter() - started
+    voter.close_application()
+    
+    summary = {
+        "trace": args.trace or f"synthetic ({args.votes} votes)",
+        "elapsed_seconds": round(elapsed, 3),
+        "replayed": latency_summary(latencies),
+        "recorded": latency_summary([e["latency_ms"] for e in events
+                                     if e.get("action") == "shown" and e.get("latency_ms") is not None]),
+    }
+    print(json.dumps(summary, indent=4))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=4)
+    if temp_dir and not args.keep_db:
+        for name in os.listdir(temp_dir):
+            os.remove(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+        
+    # Non-zero exit status lets a CI job fail on latency regressions
+    if args.max_p95_ms is not None and summary["replayed"].get("p95", 0) > args.max_p95_ms:
+        print(f"p95 latency {summary['replayed']['p95']} ms exceeds the limit of {args.max_p95_ms} ms")
+        sys.exit(1)
+
+def run_loadtest(args):
+    """Run N concurrent voter processes against one database and report how it copes"""
+    temp_dir = None
+    db_path = args.db
+    if not db_path:
+        temp_dir = tempfile.mkdtemp(prefix="steam_tinder_loadtest_")
+        db_path = os.path.join(temp_dir, "loadtest.db")
+        _, imported = generate_synthetic_database(db_path, args.synthetic)
+        print(f"Generated synthetic database with {imported} games in {temp_dir}")
+    db = DatabaseManager(db_path, journal_mode=args.journal_mode)
+    with db.get_connection() as conn:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        first_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM vote_events").fetchone()[0]
+    
+    options = {
+        "rate": args.rate, "duration": args.duration, "timeout": args.timeout,
+        "user_prefix": args.user_prefix, "page_load_ms": args.page_load_ms, "jitter_ms": args.jitter_ms,
+        "viewer": args.viewer, "session_cache": args.session_cache,
+        # Start together once every worker process is up
+        "start_at": time.time() + 1.0 + 0.2 * args.workers,
+    }
+    print(f"Starting {args.workers} voters for {args.duration} s "
+          f"({args.rate or 'max'} votes/s each, journal_mode={journal_mode}, timeout={args.timeout} s)")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(run_load_worker, db_path, index, options) for index in range(args.workers)]
+        results = [future.result() for future in futures]
+    
+    with db.get_connection() as conn:
+        recorded = conn.execute("SELECT COUNT(*) FROM vote_events WHERE seq > ?", (first_seq,)).fetchone()[0]
+    
+    latencies = [latency for result in results for latency in result["latencies"]]
+    errors = [error for result in results for _, error in result["errors"]]
+    lock_errors = sum(1 for error in errors if is_lock_error(error))
+    summary = {
+        "workers": args.workers,
+        "rate_per_worker": args.rate,
+        "duration_seconds": args.duration,
+        "journal_mode": journal_mode,
+        "timeout_seconds": args.timeout,
+        "session_cache": args.session_cache,
+        "attempted_votes": len(latencies),
+        "recorded_votes": recorded,
+        "throughput_per_second": round(recorded / args.duration, 2),
+        "latency_ms": latency_summary(latencies),
+        "lock_errors": lock_errors,
+        "other_errors": len(errors) - lock_errors,
+        "per_worker": [
+            {"worker": result["worker"], "votes": len(result["latencies"]),
+             "p99_ms": latency_summary(result["latencies"]).get("p99"),
+             "lock_errors": sum(1 for _, error in result["errors"] if is_lock_error(error)),
+             "requeues": result["requeues"]}
+            for result in results
+        ],
+    }
+    print(json.dumps(summary, indent=4))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=4)
+    if temp_dir and not args.keep_db:
+        for name in os.listdir(temp_dir):
+            os.remove(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+
+def run_ingest(args):
+    """Stream a Steam catalog dump through filters straight into a batch"""
+    db = DatabaseManager(args.db)
+    stats = {}
+    rows = filter_catalog_games(
+        iter_catalog_records(args.input, args.records_path),
+        types=args.type, year_from=args.year_from, year_to=args.year_to, tags=args.tag, stats=stats
+    )
+    if args.limit:
+        rows = itertools.islice(rows, args.limit)
+    started = time.perf_counter()
+    imported, duplicates = db.import_games(rows, args.batch, processes=args.processes)
+    print(f"Read {stats['read']} records, {stats['kept']} passed the filters: imported {imported} games "
+          f"into batch '{args.batch}' ({duplicates} already there) in {time.perf_counter() - started:.1f} s")
+
+def run_report(args):
+    """Write a ranked shortlist of a campaign's games to CSV"""
+    db = DatabaseManager(args.db)
+    started = time.perf_counter()
+    game_ids, user_index, votes, user_names = db.fetch_vote_columns(args.batch)
+    loaded = time.perf_counter()
+    games, users, summary = build_ranking_report(game_ids, user_index, votes, user_names,
+                                                 min_votes=args.min_votes, confidence=args.confidence)
+    scored = time.perf_counter()
+    written = write_ranking_report(args.output, games, db.get_game_details(args.batch), top=args.top)
+    
+    print(f"{'User':24} {'votes':>7} {'yes rate':>9} {'agreement':>10}")
+    for name, vote_count, yes_rate, agreement in zip(users["user_name"], users["votes"],
+                                                     users["yes_rate"], users["agreement"]):
+        print(f"{str(name)[:24]:24} {vote_count:>7} {yes_rate:>9.2f} "
+              f"{'-' if math.isnan(agreement) else f'{agreement:.2f}':>10}")
+    print(json.dumps(summary))
+    print(f"Wrote {written} ranked games to {args.output} (loaded {loaded - started:.2f} s, "
+          f"scored {scored - loaded:.2f} s, written {time.perf_counter() - scored:.2f} s)")
+
+def run_export_pack(args):
+    """Export batches and a user's votes to a swipe pack for offline swiping"""
+    db = DatabaseManager(args.db)
+    game_count, vote_count, preview_count = db.export_swipe_pack(
+        args.output, args.batch, args.user, preview_cache_dir=args.preview_cache
+    )
+    print(f"Wrote {game_count} games, {vote_count} votes and {preview_count} previews to {args.output}")
+
+def run_merge_pack(args):
+    """Merge the votes cast in swipe packs back into the database"""
+    db = DatabaseManager(args.db)
+    for pack_path in args.input:
+        result = db.merge_swipe_pack(pack_path)
+        print(f"{pack_path}: merged {result['merged']}, unchanged {result['unchanged']}, "
+              f"unmatched {result['unmatched']}")
+
+def run_batch_op(args):
+    """Derive a new batch from a set operation on existing batches"""
+    db = DatabaseManager(args.db)
+    started = time.perf_counter()
+    game_count = db.derive_batch(args.into, args.op, args.batch, vote_filter=args.votes, user_name=args.user)
+    print(f"Created batch {args.into} with {game_count} games in {time.perf_counter() - started:.2f} s")
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Steam Tinder - swipe through Steam games with your team")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    serve_parser = subparsers.add_parser("serve", help="Run the local voting server (HTTP/JSON API)")
+    serve_parser.add_argument("--db", default=DEFAULT_CONFIG["database_path"], help="SQLite database file")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    serve_parser.set_defaults(func=run_server)
+    
+    export_parser = subparsers.add_parser("export-votes", help="Incrementally export votes for a downstream consumer")
+    export_parser.add_argument("--db", default=DEFAULT_CONFIG["database_path"], help="SQLite database file")
+    export_parser.add_argument("--consumer", required=True, help="Name of the consumer whose watermark is used")
+    export_parser.add_argument("--user", help="Only export votes from this user")
+    export_parser.add_argument("--all-votes", action="store_true", help="Export no votes as well as yes votes")
+    export_parser.add_argument("--output", required=True, help="CSV file to write")
+    export_parser.set_defaults(func=run_export_votes)
+    
+    snapshot_parser = subparsers.add_parser("snapshot", help="Take an online snapshot of the database")
+    snapshot_parser.add_argument("--db", default=DEFAULT_CONFIG["database_path"], help="SQLite database file")
+    snapshot_parser.add_argument("--dir", help="Snapshot directory (default: 'snapshots' next to the database)")
+    snapshot_parser.add_argument("--keep", type=int, default=10, help="Number of snapshots to retain")
+    snapshot_parser.set_defaults(func=run_snapshot)
+    
+    pack_parser = subparsers.add_parser("export-pack", help="Export batches to a swipe pack for offline swiping")
+    pack_parser.add_argument("--db", default=DEFAULT_CONFIG["database_path"], help="SQLite database file")
+    pack_parser.add_argument("--batch", action="append", required=True, help="Batch to include (repeatable)")
+    pack_parser.add_argument("--user", default=getpass.getuser(), help="User whose votes are included")
+    pack_parser.add_argument("--output", required=True, help="Pack file to create")
+    pack_parser.add_argument("--preview-cache", help="Include the cached store previews from this directory")
+    pack_parser.set_defaults(func=run_export_pack)
+    
+    merge_parser = subparsers.add_parser("merge-pack", help="Merge the votes cast in swipe packs into the database")
+    merge_parser.add_argument("--db", default=DEFAULT_CONFIG["database_path"], help="SQLite database file")
+    merge_parser.add_argument("--input", action="append", required=True, help="Swipe pack file (repeatable)")
+    merge_parser.set_defaults(func=run_merge_pack)
+    
+    batch_op_parser = subparsers.add_parser("batch-op", help="Derive a batch by union, intersection or difference")
+    batch_op_parser.add_argument("--db", default=DEFAULT_CONFIG["database_path"], help="SQLite database file")
+    batch_op_parser.add_argument("--op", choices=DatabaseManager.BATCH_OPERATIONS, default="union",
+                                 help="Set operation; difference keeps games of the first batch not in the others")
+    batch_op_parser.add_argument("--batch", action="append", required=True, help="Operand batch (repeatable, in order)")
+    batch_op_parser.add_argument("--votes", choices=DatabaseManager.VOTE_FILTERS,
+                                 help="Only games voted yes, voted no, not voted on, or accepted by the team")
+    batch_op_parser.add_argument("--user", help="Only count votes by this user for --votes (default: anyone)")
+    batch_op_parser.add_argument("--into", required=True, help="Name of the new batch")
+    batch_op_parser.set_defaults(func=run_batch_op)
+    
+    report_parser = subparsers.add_parser("report", help="Rank games by the team's votes and write a shortlist CSV")
+    report_parser.add_argument("--db", default=DEFAULT_CONFIG["database_path"], help="SQLite database file")
+    report_parser.add_argument("--batch", action="append", help="Only games in this batch (repeatable; default all)")
+    report_parser.add_argument("--output", required=True, help="CSV file to write")
+    report_parser.add_argument("--min-votes", type=int, default=1, help="Leave out games with fewer votes")
+    report_parser.add_argument("--confidence", type=float, default=0.95,
+                               help="Confidence level of the Wilson lower bound")
+    report_parser.add_argument("--top", type=int, help="Only write the best this many games")
+    report_parser.set_defaults(func=run_report)
+    
+    ingest_parser = subparsers.add_parser("ingest", help="Stream a Steam catalog dump (JSON / JSON Lines) into a batch")
+    ingest_parser.add_argument("--db", default=DEFAULT_CONFIG["database_path"], help="SQLite database file")
+    ingest_parser.add_argument("--input", required=True, help="Catalog dump (.json, .jsonl or .ndjson, optionally .gz)")
+    ingest_parser.add_argument("--batch", required=True, help="Batch to import the games into")
+    ingest_parser.add_argument("--records-path", default="",
+                               help="Dotted key path to the app records in a JSON document, e.g. applist.apps")
+    ingest_parser.add_argument("--type", action="append", help="Only apps of this type, e.g. game (repeatable)")
+    ingest_parser.add_argument("--year-from", type=int, help="Only games released in or after this year")
+    ingest_parser.add_argument("--year-to", type=int, help="Only games released in or before this year")
+    ingest_parser.add_argument("--tag", action="append",
+                               help="Only games with this tag, genre or category (repeatable, any of)")
+    ingest_parser.add_argument("--limit", type=int, help="Stop after this many games")
+    ingest_parser.add_argument("--processes", type=int, help="Parse release dates and developers in this many processes")
+    ingest_parser.set_defaults(func=run_ingest)
+    
+    replay_parser = subparsers.add_parser("replay", help="Replay a recorded swipe session headlessly and report latencies")
+    replay_parser.add_argument("--trace", help="Session trace (JSON Lines) recorded via session_trace_dir")
+    replay_parser.add_argument("--votes", type=int, default=200, help="Without --trace, replay this many synthetic votes")
+    replay_parser.add_argument("--db", help="Database to replay against (default: a generated synthetic database)")
+    replay_parser.add_argument("--synthetic", type=int, default=5000, help="Number of games in the synthetic database")
+    replay_parser.add_argument("--keep-db", action="store_true", help="Keep the generated synthetic database")
+    replay_parser.add_argument("--user", default="replay", help="User name to vote as")
+    replay_parser.add_argument("--page-load-ms", type=float, default=0, help="Simulated page load time")
+    replay_parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra page load time, up to this much")
+    replay_parser.add_argument("--seed", type=int, help="Seed for the simulated jitter")
+    replay_parser.add_argument("--viewer", choices=["selenium", "none"], default="selenium",
+                               help="Replay through the stub Selenium viewer, or without a page viewer")
+    replay_parser.add_argument("--session-cache", action="store_true",
+                               help="Serve the swipe queue from an in-memory session cache")
+    replay_parser.add_argument("--think-time", type=float, default=0.0,
+                               help="Scale for the recorded pauses between actions (0 = back to back)")
+    replay_parser.add_argument("--max-p95-ms", type=float, help="Exit with status 1 if the p95 latency is higher")
+    replay_parser.add_argument("--output", help="Also write the summary to this JSON file")
+    replay_parser.set_defaults(func=run_replay)
+    
+    loadtest_parser = subparsers.add_parser("loadtest", help="Run concurrent voter processes against one database")
+    loadtest_parser.add_argument("--db", help="Database to load (default: a generated synthetic database)")
+    loadtest_parser.add_argument("--synthetic", type=int, default=20000, help="Number of games in the synthetic database")
+    loadtest_parser.add_argument("--keep-db", action="store_true", help="Keep the generated synthetic database")
+    loadtest_parser.add_argument("--workers", type=int, default=4, help="Number of voter processes")
+    loadtest_parser.add_argument("--rate", type=float, default=2.0,
+                                 help="Votes per second per voter (0 = as fast as possible)")
+    loadtest_parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    loadtest_parser.add_argument("--timeout", type=float, default=5.0,
+                                 help="Seconds a connection waits on a locked database")
+    loadtest_parser.add_argument("--journal-mode", choices=["delete", "truncate", "wal"],
+                                 help="Set the database's journal mode first (default: leave as is)")
+    loadtest_parser.add_argument("--user-prefix", default="load", help="Voters are named <prefix><n>")
+    loadtest_parser.add_argument("--page-load-ms", type=float, default=0, help="Simulated page load time")
+    loadtest_parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra page load time, up to this much")
+    loadtest_parser.add_argument("--viewer", choices=["selenium", "none"], default="none",
+                                 help="Load pages in the stub Selenium viewer, or use no page viewer")
+    loadtest_parser.add_argument("--session-cache", action="store_true",
+                                 help="Serve each voter's queue from an in-memory session cache")
+    loadtest_parser.add_argument("--output", help="Also write the summary to this JSON file")
+    loadtest_parser.set_defaults(func=run_loadtest)
+    
+    return parser
+
 # Main program
 if __name__ == "__main__":
-    try:
-        voter = SteamGameVoter.initialize_voter()
-        voter.root.mainloop()
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        # This will trigger the atexit function to save progress
\ No newline at end of file
+    multiprocessing.freeze_support()  # Process pools in a frozen executable
+    args = build_arg_parser().parse_args()
+    if args.command:
+        args.func(args)
+    else:
+        try:
+            voter = SteamGameVoter.initialize_voter()
+            voter.root.mainloop()
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            # This will trigger the atexit function to save progress
\ No newline at end of file
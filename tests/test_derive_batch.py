@@ -0,0 +1,104 @@
+"""Batches derived from set operations on other batches"""
+import pytest
+
+import SteamTinder
+
+
+def make_games(numbers):
+    return [{"name": f"Game {i}", "developers": f"Studio {i % 3}, Label {i % 2}", "release_date": "12 Nov, 2020",
+             "steam_page_url": f"https://store.steampowered.com/app/{1000 + i}/"}
+            for i in numbers]
+
+
+def batch_games(db, batch_name):
+    """{game number: game id} of a batch"""
+    with db.get_connection() as conn:
+        return {int(url.rstrip("/").rsplit("/", 1)[1]) - 1000: game_id for game_id, url in conn.execute(
+            "SELECT id, steam_page_url FROM games WHERE batch_name = ?", (batch_name,))}
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = SteamTinder.DatabaseManager(str(tmp_path / "derive.db"))
+    db.import_games(make_games(range(0, 6)), "a")
+    db.import_games(make_games(range(3, 9)), "b")
+    db.import_games(make_games(range(5, 11)), "c")
+    return db
+
+
+@pytest.mark.parametrize("operation, batch_names, expected", [
+    ("union", ["a", "b"], set(range(0, 9))),
+    ("union", ["a", "b", "c"], set(range(0, 11))),
+    ("intersection", ["a", "b"], {3, 4, 5}),
+    ("intersection", ["a", "b", "c"], {5}),
+    ("difference", ["a", "b"], {0, 1, 2}),
+    ("difference", ["c", "a", "b"], {9, 10}),
+])
+def test_set_operations(db, operation, batch_names, expected):
+    assert db.derive_batch("new", operation, batch_names) == len(expected)
+    assert set(batch_games(db, "new")) == expected
+    assert ("new", len(expected), 0, 0) in db.get_batch_catalog("alice")
+
+
+@pytest.fixture
+def voted_db(db):
+    a, b = batch_games(db, "a"), batch_games(db, "b")
+    db.record_vote(b[3], "alice", True)
+    db.record_vote(a[4], "bob", False)
+    db.record_vote(a[0], "alice", True)
+    db.record_vote(b[8], "alice", True)
+    return db
+
+
+@pytest.mark.parametrize("operation, vote_filter, user_name, expected", [
+    ("intersection", "yes", None, {3}),
+    ("intersection", "yes", "alice", {3}),
+    ("intersection", "yes", "bob", set()),
+    ("intersection", "no", None, {4}),
+    ("intersection", "no", "alice", set()),
+    ("intersection", "unvoted", None, {5}),
+    ("intersection", "unvoted", "alice", {4, 5}),
+    ("union", "yes", "alice", {0, 3, 8}),
+    # Only the first batch's copies count for a difference
+    ("difference", "yes", None, {0}),
+    ("difference", "unvoted", None, {1, 2}),
+])
+def test_vote_filters(voted_db, operation, vote_filter, user_name, expected):
+    assert voted_db.derive_batch("new", operation, ["a", "b"], vote_filter=vote_filter,
+                                 user_name=user_name) == len(expected)
+    assert set(batch_games(voted_db, "new")) == expected
+
+
+def test_accepted_filter_uses_the_team_decision(voted_db):
+    voted_db.set_decision_rule("b", yes_quorum=1)
+    assert voted_db.derive_batch("new", "intersection", ["a", "b"], vote_filter="accepted") == 1
+    assert set(batch_games(voted_db, "new")) == {3}
+
+
+def test_derived_games_start_unvoted_with_their_developer_links(voted_db):
+    voted_db.derive_batch("new", "union", ["a", "b"])
+    source, derived = batch_games(voted_db, "b"), batch_games(voted_db, "new")
+    with voted_db.get_connection() as conn:
+        def developer_ids(game_id):
+            return sorted(row[0] for row in conn.execute(
+                "SELECT developer_id FROM game_developers WHERE game_id = ?", (game_id,)))
+        for number in (3, 8):
+            assert len(developer_ids(derived[number])) == 2
+            assert developer_ids(derived[number]) == developer_ids(source[number])
+        assert conn.execute("SELECT COUNT(*) FROM votes WHERE game_id IN (SELECT id FROM games "
+                            "WHERE batch_name = 'new')").fetchone()[0] == 0
+
+
+@pytest.mark.parametrize("new_batch, operation, batch_names, vote_filter", [
+    ("c", "union", ["a", "b"], None),          # existing batch
+    ("new", "union", ["a", "missing"], None),  # unknown batch
+    ("a", "union", ["a", "b"], None),          # operand as the target
+    ("new", "xor", ["a", "b"], None),
+    ("new", "intersection", ["a"], None),
+    ("new", "union", ["a", "b"], "maybe"),
+])
+def test_invalid_derivations_are_rejected(db, new_batch, operation, batch_names, vote_filter):
+    before = db.get_batch_catalog("alice")
+    with pytest.raises(ValueError):
+        db.derive_batch(new_batch, operation, batch_names, vote_filter=vote_filter)
+    assert db.get_batch_catalog("alice") == before
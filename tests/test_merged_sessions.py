@@ -0,0 +1,74 @@
+"""Swiping several batches as one session"""
+import pytest
+
+import SteamTinder
+
+
+def make_games(numbers):
+    return [{"name": f"Game {i}", "developers": "Studio", "release_date": "12 Nov, 2020",
+             "steam_page_url": f"https://store.steampowered.com/app/{1000 + i}/"}
+            for i in numbers]
+
+
+def numbers(games):
+    return [int(game["steam_page_url"].rstrip("/").rsplit("/", 1)[1]) - 1000 for game in games]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = SteamTinder.DatabaseManager(str(tmp_path / "merged.db"))
+    db.import_games(make_games(range(0, 4)), "a")
+    db.import_games(make_games(range(2, 6)), "b")
+    return db
+
+
+def claim_all(db, session_id, batch_names, step=2):
+    games, after_id = [], 0
+    while True:
+        claimed = db.claim_merged_games("alice", session_id, batch_names, after_id=after_id, limit=step)
+        if not claimed:
+            return games
+        games += claimed
+        after_id = claimed[-1]["id"]
+
+
+def test_shared_store_pages_are_swiped_once(db):
+    session = db.start_merged_session("alice", ["b", "a"])
+    assert (session["batch_names"], session["total"], session["voted"]) == (["a", "b"], 6, 0)
+
+    games = claim_all(db, "alice-1", session["batch_names"])
+    assert numbers(games) == [0, 1, 2, 3, 4, 5]
+
+    # A vote lands on the copy in every batch
+    db.record_merged_vote(games[2]["id"], "alice", True, session["batch_names"])
+    assert sorted(db.get_batch_catalog("alice")) == [("a", 4, 1, 1), ("b", 4, 1, 1)]
+    assert db.start_merged_session("alice", ["a", "b"])["voted"] == 1
+
+
+def test_claimed_pages_are_held_in_every_batch(db):
+    db.claim_merged_games("alice", "alice-1", ["a", "b"], limit=3)
+    # Another merged session and a single-batch session both skip pages 0-2
+    assert numbers(claim_all(db, "alice-2", ["a", "b"])) == [3, 4, 5]
+    db.release_reservations("alice-2")
+    assert numbers(db.claim_unvoted_games("alice", "alice-3", 10,
+                                          SteamTinder.GameFilter().batches("b").ordered("id"))) == [3, 4, 5]
+
+
+def test_resumed_session_starts_at_the_first_unvoted_page(db):
+    games = db.claim_merged_games("alice", "alice-1", ["a", "b"], limit=6)
+    # Page 1's vote was never recorded, pages after it were
+    for game in games[2:4]:
+        db.record_merged_vote(game["id"], "alice", True, ["a", "b"])
+    db.release_reservations("alice-1")
+
+    assert numbers(db.claim_merged_games("alice", "alice-2", ["a", "b"], limit=3)) == [0, 1, 4]
+
+
+def test_pages_decided_in_any_batch_are_skipped(db):
+    db.set_decision_rule("b", yes_quorum=1)
+    with db.get_connection() as conn:
+        # The copy of page 2 in batch b, not the lowest-id copy in a
+        game_id = conn.execute("SELECT id FROM games WHERE batch_name = 'b' "
+                               "AND steam_page_url LIKE '%/1002/'").fetchone()[0]
+    db.record_vote(game_id, "bob", True)
+    assert numbers(claim_all(db, "alice-1", ["a", "b"])) == [0, 1, 3, 4, 5]
@@ -0,0 +1,49 @@
+"""SeleniumViewer restarts, driven by StubWebDriver instead of a real browser"""
+import time
+
+import SteamTinder
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def test_close_during_restart_quits_the_new_browser():
+    drivers = []
+
+    def factory():
+        driver = SteamTinder.StubWebDriver(page_load_ms=1500 if drivers else 0)
+        drivers.append(driver)
+        return driver
+
+    viewer = SteamTinder.SeleniumViewer(driver_factory=factory, watchdog_interval=0.1, probe_timeout=0.3)
+    viewer.open("https://store.steampowered.com/app/1/")
+    drivers[0].quit()
+    assert wait_for(lambda: len(drivers) == 2)
+    viewer.close()
+
+    assert wait_for(lambda: not viewer.restarting)
+    assert viewer.driver is None
+    assert all(driver.closed for driver in drivers)
+
+
+def test_pages_opened_while_restarting_have_no_ready_time():
+    drivers = []
+
+    def factory():
+        driver = SteamTinder.StubWebDriver(page_load_ms=500 if drivers else 0)
+        drivers.append(driver)
+        return driver
+
+    viewer = SteamTinder.SeleniumViewer(driver_factory=factory, watchdog_interval=0.1, probe_timeout=0.3)
+    assert viewer.open("https://store.steampowered.com/app/1/") is True
+    drivers[0].quit()
+    assert wait_for(lambda: viewer.restarting)
+    assert viewer.open("https://store.steampowered.com/app/2/") is False
+
+    assert wait_for(lambda: viewer.restarts == 1)
+    assert drivers[-1].current_url == "https://store.steampowered.com/app/2/"
+    viewer.close()
@@ -0,0 +1,70 @@
+"""SessionCache keeping its in-memory copy in step with other connections"""
+import pytest
+
+import SteamTinder
+
+
+def make_games(count, start=0):
+    return [{"name": f"Game {i}", "developers": "Studio", "release_date": "12 Nov, 2020",
+             "steam_page_url": f"https://store.steampowered.com/app/{1000 + i}/"}
+            for i in range(start, start + count)]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = SteamTinder.DatabaseManager(str(tmp_path / "shared.db"))
+    db.import_games(make_games(6), "week1")
+    return db
+
+
+@pytest.fixture
+def ids(db):
+    with db.get_connection() as conn:
+        return [row[0] for row in conn.execute("SELECT id FROM games ORDER BY id")]
+
+
+@pytest.fixture
+def cache(db):
+    cache = SteamTinder.SessionCache(db, "alice", SteamTinder.GameFilter().batches("week1"))
+    yield cache
+    cache.close()
+
+
+def claim_ids(cache, session_id, count=10):
+    return [game["id"] for game in cache.claim_unvoted_games(
+        "alice", session_id, count, SteamTinder.GameFilter().batches("week1").ordered("id"))]
+
+
+def test_votes_from_other_connections_are_seen_before_the_next_claim(db, ids, cache):
+    assert claim_ids(cache, "alice-1", 2) == ids[:2]
+
+    # Another window of the same user votes on the next game
+    db.record_vote(ids[2], "alice", True)
+    # fetch_unvoted_games reads only the copy, so a stale copy would still list it
+    assert ids[2] not in [game["id"] for game in cache.fetch_unvoted_games("alice", 10)]
+    assert claim_ids(cache, "alice-1", 2) == ids[3:5]
+
+
+def test_team_decisions_are_seen_without_a_reload(db, ids, cache):
+    db.set_decision_rule("week1", yes_quorum=2)
+    cache.fetch_unvoted_games("alice", 1)  # The rule change rebuilds the copy
+    loads = []
+    cache.load = lambda: loads.append(True)
+
+    db.record_vote(ids[0], "bob", True)
+    db.record_vote(ids[0], "carol", True)
+    assert ids[0] not in [game["id"] for game in cache.fetch_unvoted_games("alice", 10)]
+    assert loads == []
+    assert cache.event_seq == 2
+
+
+def test_leases_held_by_other_sessions_are_seen(db, ids, cache):
+    db.reserve_games("alice", "alice-2", ids[:3])
+    assert sorted(game["id"] for game in cache.fetch_unvoted_games("alice", 10)) == ids[3:]
+    assert claim_ids(cache, "alice-1") == ids[3:]
+
+
+def test_only_listed_reads_pass_through(cache):
+    assert cache.search_games("Game", "alice")
+    with pytest.raises(AttributeError):
+        cache.purge_batch
@@ -0,0 +1,45 @@
+"""The SteamGameVoter swipe loop, run headless through HeadlessVoter"""
+import sqlite3
+
+import SteamTinder
+
+
+def make_games(count):
+    return [{"name": f"Game {i}", "developers": "Studio", "release_date": "12 Nov, 2020",
+             "steam_page_url": f"https://store.steampowered.com/app/{1000 + i}/"}
+            for i in range(count)]
+
+
+def start_standard_session(tmp_path):
+    db = SteamTinder.DatabaseManager(str(tmp_path / "swipe.db"))
+    db.import_games(make_games(3), "week1")
+    voter = SteamTinder.HeadlessVoter(db, user_name="alice", viewer_backend="none")
+    voter.input_filename = "week1"
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO progress (user_name, batch_name, current_index) VALUES ('alice', 'week1', 0)")
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(games)")]
+        voter.entries = [dict(zip(columns, row)) for row in conn.execute("SELECT * FROM games ORDER BY id")]
+    return db, voter
+
+
+def test_standard_vote_records_the_vote_and_progress(tmp_path):
+    db, voter = start_standard_session(tmp_path)
+    voter.vote(True)
+
+    assert voter.current_index == 1
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT game_id, vote FROM votes").fetchall() == [(voter.entries[0]["id"], 1)]
+        assert conn.execute("SELECT current_index FROM progress").fetchone() == (1,)
+
+
+def test_failed_standard_vote_keeps_the_game_on_screen(tmp_path):
+    db, voter = start_standard_session(tmp_path)
+
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+    db.record_vote = locked
+    voter.vote(True)
+
+    assert voter.current_index == 0
+    assert voter.errors == [("recording vote", "database is locked")]
+    assert voter.messages[-1][0] == "Vote Error"
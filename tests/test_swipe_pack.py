@@ -0,0 +1,127 @@
+"""Exporting swipe packs and merging the votes cast in them back"""
+import pytest
+
+import SteamTinder
+
+
+def make_games(count, start=0):
+    return [{"name": f"Game {i}", "developers": f"Studio {i % 3}", "release_date": "12 Nov, 2020",
+             "steam_page_url": f"https://store.steampowered.com/app/{1000 + i}/"}
+            for i in range(start, start + count)]
+
+
+def game_ids(db, batch_name):
+    with db.get_connection() as conn:
+        return {url: game_id for game_id, url in conn.execute(
+            "SELECT id, steam_page_url FROM games WHERE batch_name = ?", (batch_name,))}
+
+
+def url(i):
+    return f"https://store.steampowered.com/app/{1000 + i}/"
+
+
+def add_vote_event(db, game_id, user_name, vote, timestamp):
+    """A vote with a chosen timestamp; record_vote always stamps the current time"""
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO vote_events (game_id, user_name, vote, timestamp) VALUES (?, ?, ?, ?)",
+                     (game_id, user_name, vote, timestamp))
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = SteamTinder.DatabaseManager(str(tmp_path / "team.db"))
+    db.import_games(make_games(5), "week1")
+    return db
+
+
+@pytest.fixture
+def pack(db, tmp_path):
+    pack_path = str(tmp_path / "alice.pack")
+    db.export_swipe_pack(pack_path, ["week1"], "alice")
+    return SteamTinder.DatabaseManager(pack_path)
+
+
+def test_export_copies_games_and_only_the_users_votes(db, tmp_path):
+    ids = game_ids(db, "week1")
+    db.record_vote(ids[url(0)], "alice", True)
+    db.record_vote(ids[url(1)], "bob", False)
+
+    pack_path = str(tmp_path / "alice.pack")
+    assert db.export_swipe_pack(pack_path, ["week1"], "alice") == (5, 1, 0)
+    pack = SteamTinder.DatabaseManager(pack_path)
+    assert pack.get_pack_info()["user_name"] == "alice"
+    assert pack.get_batch_catalog("alice") == [("week1", 5, 1, 1)]
+    with pytest.raises(ValueError):
+        db.export_swipe_pack(pack_path, ["week1"], "alice")
+
+
+def test_votes_cast_in_the_pack_are_merged_once(db, pack, tmp_path):
+    pack_ids = game_ids(pack, "week1")
+    pack.record_vote(pack_ids[url(0)], "alice", True)
+    pack.record_vote(pack_ids[url(1)], "alice", False)
+
+    pack_path = str(tmp_path / "alice.pack")
+    assert db.merge_swipe_pack(pack_path) == {"merged": 2, "unchanged": 0, "unmatched": 0}
+    ids = game_ids(db, "week1")
+    with db.get_connection() as conn:
+        assert sorted(conn.execute("SELECT game_id, vote FROM votes WHERE user_name = 'alice'")) == \
+            sorted([(ids[url(0)], 1), (ids[url(1)], 0)])
+        event_count = conn.execute("SELECT COUNT(*) FROM vote_events").fetchone()[0]
+
+    # Merging the same pack again adds nothing
+    assert db.merge_swipe_pack(pack_path) == {"merged": 0, "unchanged": 2, "unmatched": 0}
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM vote_events").fetchone()[0] == event_count
+    assert pack.get_pack_info()["merged_at"] is not None
+
+
+def test_the_later_vote_wins(db, pack, tmp_path):
+    ids, pack_ids = game_ids(db, "week1"), game_ids(pack, "week1")
+    # Game 0: voted yes in the pack, then no at home later
+    add_vote_event(pack, pack_ids[url(0)], "alice", True, "2024-01-01 10:00:00")
+    add_vote_event(db, ids[url(0)], "alice", False, "2024-01-02 10:00:00")
+    # Game 1: voted no at home, then yes in the pack later
+    add_vote_event(db, ids[url(1)], "alice", False, "2024-01-01 10:00:00")
+    add_vote_event(pack, pack_ids[url(1)], "alice", True, "2024-01-02 10:00:00")
+
+    assert db.merge_swipe_pack(str(tmp_path / "alice.pack")) == {"merged": 1, "unchanged": 1, "unmatched": 0}
+    with db.get_connection() as conn:
+        votes = dict(conn.execute("SELECT game_id, vote FROM votes WHERE user_name = 'alice'"))
+    assert votes == {ids[url(0)]: 0, ids[url(1)]: 1}
+
+
+def test_votes_on_games_purged_locally_are_unmatched(db, pack, tmp_path):
+    db.import_games(make_games(2, start=10), "week2")
+    pack_ids = game_ids(pack, "week1")
+    pack.record_vote(pack_ids[url(0)], "alice", True)
+    db.purge_batch("week1")
+
+    assert db.merge_swipe_pack(str(tmp_path / "alice.pack")) == {"merged": 0, "unchanged": 0, "unmatched": 1}
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM votes").fetchone()[0] == 0
+
+
+def test_merged_votes_update_team_tallies_and_decisions(db, tmp_path):
+    db.set_decision_rule("week1", yes_quorum=2)
+    ids = game_ids(db, "week1")
+    db.record_vote(ids[url(0)], "bob", True)
+
+    pack_path = str(tmp_path / "alice.pack")
+    db.export_swipe_pack(pack_path, ["week1"], "alice")
+    pack = SteamTinder.DatabaseManager(pack_path)
+    pack_ids = game_ids(pack, "week1")
+    with pack.get_connection() as conn:
+        # The pack carries the team's tallies and rules, not just alice's votes
+        assert conn.execute("SELECT yes_votes, decided FROM games WHERE id = ?",
+                            (pack_ids[url(0)],)).fetchone() == (1, 0)
+    pack.record_vote(pack_ids[url(0)], "alice", True)
+    pack.record_vote(pack_ids[url(1)], "alice", True)
+
+    db.merge_swipe_pack(pack_path)
+    with db.get_connection() as conn:
+        tallies = {game_id: (yes, no, decided) for game_id, yes, no, decided in conn.execute(
+            "SELECT id, yes_votes, no_votes, decided FROM games WHERE batch_name = 'week1'")}
+    assert tallies[ids[url(0)]] == (2, 0, 1)
+    assert tallies[ids[url(1)]] == (1, 0, 0)
+    assert db.get_batch_catalog("alice") == [("week1", 5, 2, 2)]
+    assert db.get_decision_rule("week1")["accepted"] == 1
@@ -0,0 +1,98 @@
+"""Counters and decisions kept up to date by triggers as votes come and go"""
+import pytest
+
+import SteamTinder
+
+
+def make_games(count, start=0):
+    return [{"name": f"Game {i}", "developers": "Studio", "release_date": "12 Nov, 2020",
+             "steam_page_url": f"https://store.steampowered.com/app/{1000 + i}/"}
+            for i in range(start, start + count)]
+
+
+def game_state(db, game_id):
+    with db.get_connection() as conn:
+        return conn.execute("SELECT yes_votes, no_votes, decided FROM games WHERE id = ?", (game_id,)).fetchone()
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = SteamTinder.DatabaseManager(str(tmp_path / "team.db"))
+    db.import_games(make_games(4), "week1")
+    db.import_games(make_games(2, start=10), "week2")
+    return db
+
+
+@pytest.fixture
+def ids(db):
+    with db.get_connection() as conn:
+        return [row[0] for row in conn.execute("SELECT id FROM games WHERE batch_name = 'week1' ORDER BY id")]
+
+
+def test_votes_and_revotes_update_the_catalog(db, ids):
+    db.record_vote(ids[0], "alice", True)
+    db.record_vote(ids[1], "alice", False)
+    db.record_vote(ids[0], "bob", True)
+    assert db.get_batch_catalog("alice") == [("week1", 4, 2, 1), ("week2", 2, 0, 0)]
+    assert db.get_batch_catalog("bob") == [("week1", 4, 1, 1), ("week2", 2, 0, 0)]
+    assert game_state(db, ids[0]) == (2, 0, 0)
+
+    # Changing a vote moves the counts, it does not add to them
+    db.record_vote(ids[0], "alice", False)
+    db.record_vote(ids[1], "alice", True)
+    assert db.get_batch_catalog("alice") == [("week1", 4, 2, 1), ("week2", 2, 0, 0)]
+    assert game_state(db, ids[0]) == (1, 1, 0)
+    assert game_state(db, ids[1]) == (1, 0, 0)
+
+
+def test_purge_removes_the_batch_from_the_catalog(db, ids):
+    db.record_vote(ids[0], "alice", True)
+    db.purge_batch("week1")
+    assert db.get_batch_catalog("alice") == [("week2", 2, 0, 0)]
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM batch_user_stats WHERE batch_name = 'week1'").fetchone()[0] == 0
+
+
+def test_decisions_follow_votes_and_rules(db, ids):
+    # Without a rule nothing is ever decided
+    db.record_vote(ids[0], "alice", True)
+    db.record_vote(ids[0], "bob", True)
+    db.record_vote(ids[1], "alice", False)
+    assert game_state(db, ids[0])[2] == 0
+
+    # A new rule decides the games already voted on
+    assert db.set_decision_rule("week1", yes_quorum=2, no_quorum=1) == (1, 1)
+    assert game_state(db, ids[0])[2] == 1
+    assert game_state(db, ids[1])[2] == -1
+
+    # Further votes decide, and a changed vote can undecide
+    db.record_vote(ids[2], "carol", False)
+    assert game_state(db, ids[2])[2] == -1
+    db.record_vote(ids[0], "bob", False)
+    assert game_state(db, ids[0])[2] == -1
+
+    # Majority of a team of four is three votes
+    db.set_decision_rule("week1", majority_of=4)
+    assert [game_state(db, game_id)[2] for game_id in ids] == [0, 0, 0, 0]
+    assert db.get_decision_rule("week1")["majority_of"] == 4
+
+    # Removing the rule leaves every game open again, and other batches untouched
+    db.set_decision_rule("week1")
+    assert db.get_decision_rule("week1") == {"yes_quorum": None, "no_quorum": None, "majority_of": None,
+                                             "accepted": 0, "rejected": 0}
+
+
+def test_decided_games_leave_other_users_queues(db, ids):
+    db.set_decision_rule("week1", yes_quorum=2)
+    batch = SteamTinder.GameFilter().batches("week1")
+    assert {game["id"] for game in db.fetch_unvoted_games("carol", 10, batch)} == set(ids)
+
+    db.record_vote(ids[0], "alice", True)
+    db.record_vote(ids[0], "bob", True)
+    claimed = db.claim_unvoted_games("carol", "carol-1", 10, batch)
+    assert {game["id"] for game in claimed} == set(ids[1:])
+
+    # Unless the decided games are asked for
+    db.release_reservations("carol-1")
+    with_decided = SteamTinder.GameFilter().batches("week1").including_decided(True)
+    assert ids[0] in {game["id"] for game in db.claim_unvoted_games("carol", "carol-2", 10, with_decided)}
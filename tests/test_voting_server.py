@@ -0,0 +1,100 @@
+"""Round trips through VotingServer and RemoteDatabaseManager on localhost"""
+import asyncio
+import threading
+
+import pytest
+
+import SteamTinder
+
+
+def make_games(count, start=0):
+    return [{"name": f"Game {i}", "developers": f"Studio {i % 3}", "release_date": "12 Nov, 2020",
+             "steam_page_url": f"https://store.steampowered.com/app/{1000 + i}/"}
+            for i in range(start, start + count)]
+
+
+@pytest.fixture
+def server(tmp_path):
+    """A VotingServer on a free localhost port, run on its own event loop thread"""
+    db = SteamTinder.DatabaseManager(str(tmp_path / "server.db"))
+    voting_server = SteamTinder.VotingServer(db, port=0)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(voting_server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    yield voting_server
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    voting_server.close()
+    loop.close()
+
+
+@pytest.fixture
+def client(server):
+    return SteamTinder.RemoteDatabaseManager(f"http://127.0.0.1:{server.port}", timeout=5)
+
+
+def test_import_reports_duplicates(client):
+    assert client.import_games(make_games(10), "week1") == (10, 0)
+    assert client.import_games(make_games(10, start=5), "week1") == (5, 5)
+    assert client.get_batch_catalog("alice") == [("week1", 15, 0, 0)]
+
+
+def test_claimed_games_are_not_handed_to_another_session(client):
+    client.import_games(make_games(6), "week1")
+    first = client.claim_unvoted_games("alice", "session-1", 4)
+    second = client.claim_unvoted_games("alice", "session-2", 4)
+    assert len(first) == 4
+    assert len(second) == 2
+    assert not {game["id"] for game in first} & {game["id"] for game in second}
+
+    assert client.release_reservations("session-1") == 4
+    assert len(client.claim_unvoted_games("alice", "session-3", 10)) == 4
+
+
+def test_votes_are_recorded_and_exported_once(client, server):
+    client.import_games(make_games(5), "week1")
+    games = client.claim_unvoted_games("alice", "session-1", 5)
+    assert client.record_vote(games[0]["id"], "alice", True, timing=(1.0, 2.0))
+    assert client.record_votes("alice", [(games[1]["id"], False), (games[2]["id"], True)]) == 2
+    assert server.db.get_batch_catalog("alice") == [("week1", 5, 3, 2)]
+
+    votes, high_seq = client.fetch_new_yes_votes("alice")
+    assert sorted(vote["name"] for vote in votes) == sorted([games[0]["name"], games[2]["name"]])
+    client.set_export_watermark("yes_export:alice", high_seq)
+    assert client.fetch_new_yes_votes("alice")[0] == []
+
+    # Voted games no longer come back in the queue once the leases are given back
+    assert client.release_reservations("session-1") == 2
+    remaining = client.fetch_unvoted_games("alice", 10)
+    assert {game["id"] for game in remaining} == {games[3]["id"], games[4]["id"]}
+
+
+def test_body_that_is_not_an_object_is_rejected(client):
+    with pytest.raises(SteamTinder.VotingServerError, match="bad request"):
+        client._request("POST", "/claim", body=[])
+
+
+def test_unexpected_errors_are_answered_with_500(client, server):
+    def broken(query, body):
+        raise RuntimeError("boom")
+    server.routes[("GET", "/health")] = broken
+    with pytest.raises(SteamTinder.VotingServerError, match="internal error"):
+        client.check_connection()
+
+
+def test_reserve_skips_games_held_or_voted_elsewhere(client):
+    client.import_games(make_games(3), "week1")
+    games = client.claim_unvoted_games("alice", "session-1", 1)
+    held = games[0]["id"]
+    voted, free = [game["id"] for game in client.fetch_unvoted_games("alice", 10)][:2]
+    client.record_vote(voted, "alice", False)
+    assert client.reserve_games("alice", "session-2", [held, voted, free]) == [free]